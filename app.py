@@ -1,24 +1,51 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, send_file, Response, stream_with_context
 from flask_cors import CORS
 from barcode import Code128
 from barcode.writer import ImageWriter
-import win32ui
-from win32con import FW_NORMAL, FW_BOLD, DEFAULT_CHARSET
-from PIL import Image, ImageWin
+try:
+    import win32ui
+    from win32con import FW_NORMAL, FW_BOLD, DEFAULT_CHARSET
+except ImportError:
+    # pywin32 is Windows only; without it only the fake printer backend can print
+    win32ui = None
+    FW_NORMAL, FW_BOLD, DEFAULT_CHARSET = 400, 700, 1
+from PIL import Image, ImageWin, ImageDraw, ImageFont
 import os
-from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfbase.ttfonts import TTFont, TTFontFace
 from reportlab.pdfbase import pdfmetrics
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import Table, TableStyle, SimpleDocTemplate, Paragraph, Spacer
+from reportlab.platypus import Table, LongTable, TableStyle, SimpleDocTemplate, Paragraph, Spacer, Flowable
 import subprocess
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
 from reportlab.pdfgen import canvas
 import textwrap
+import getpass
 from datetime import datetime
-from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.enums import TA_CENTER, TA_RIGHT
 import tempfile
+import json
+import re
+import shutil
+import functools
+import gzip
+import hashlib
+import heapq
+import itertools
+import pickle
+import sqlite3
+import time
+import uuid
+import io
+import threading
+import argparse
+import cProfile
+import pstats
+from contextlib import contextmanager
+from collections import OrderedDict, deque
+from weakref import WeakKeyDictionary
+import reportlab
 
 import logging
 import traceback
@@ -29,11 +56,6 @@ logging.basicConfig(
     format='%(asctime)s %(levelname)s %(message)s'
 )
 
-pdfmetrics.registerFont(TTFont('Calibri', 'C:/Windows/Fonts/calibri.ttf')) 
-pdfmetrics.registerFont(TTFont("Calibri-Bold", 'C:/Windows/Fonts/calibrib.ttf'))
-pdfmetrics.registerFont(TTFont("Calibri-Italic", 'C:/Windows/Fonts/calibrii.ttf'))
-pdfmetrics.registerFont(TTFont("Book Antiqua", r"C:\Windows\Fonts\ANTQUAI.TTF"))
-
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 LOGO_PATH = os.path.join(BASE_DIR, "assets", "uprising_logo.png")
 
@@ -43,15 +65,969 @@ CORS(app)
 ROLL_PRINTER = "ZDesigner GX430t"
 SHEET_PRINTER = "RICOH P 501"
 ROLLO_PRINTER = "Rollo Printer (Copy 1)"
-CURRENT_USER = os.getlogin()
+try:
+    CURRENT_USER = os.getlogin()
+except OSError:
+    CURRENT_USER = getpass.getuser()  # no login terminal, e.g. run as a service
 SUMATRA_PATH = r"C:\Users\seedy\AppData\Local\SumatraPDF\SumatraPDF.exe"
 
+# PRINT_SERVICE_PRINTER_BACKEND=fake renders every job as usual but sends it
+# nowhere: printer DCs draw nothing and PDFs skip SumatraPDF. Each page
+# instead holds its printer for FAKE_PAGE_SECONDS x PRINT_SERVICE_FAKE_TIME_SCALE
+# (0 for no delay), so load tests see realistic printer queues
+PRINTER_BACKEND = os.environ.get("PRINT_SERVICE_PRINTER_BACKEND", "windows")
+FAKE_TIME_SCALE = float(os.environ.get("PRINT_SERVICE_FAKE_TIME_SCALE", 1.0))
+FAKE_PAGE_SECONDS = {
+    ROLL_PRINTER: 1.5,
+    SHEET_PRINTER: 2.0,
+    ROLLO_PRINTER: 2.0,
+}
+
+# Avery 5960 sheets on SHEET_PRINTER: 3 columns x 10 rows = 30 labels
+SHEET_ROWS = 10
+SHEET_COLS = 3
+
+# Print job journal: every /print-range and /print-orders job and the items
+# it has finished, so a job cut short by a crash can be resumed
+JOURNAL_PATH = os.environ.get("PRINT_SERVICE_JOURNAL", os.path.join(BASE_DIR, "print_journal.db"))
+JOURNAL_COMMIT_EVERY = 10       # finished items buffered per commit...
+JOURNAL_COMMIT_SECONDS = 1.0    # ...or at most this long between commits
+
+# Raster cache (opt in with PRINT_SERVICE_RASTER_CACHE=1): front/back roll
+# labels are rendered to a bitmap once per distinct content and DPI, then
+# reprinted from the bitmap instead of GDI text
+RASTER_CACHE_ENABLED = os.environ.get("PRINT_SERVICE_RASTER_CACHE", "0") == "1"
+RASTER_CACHE_DIR = os.environ.get("PRINT_SERVICE_RASTER_CACHE_DIR", os.path.join(BASE_DIR, "raster_cache"))
+RASTER_CACHE_MEMORY_BYTES = 32 * 1024 * 1024
+RASTER_CACHE_DISK_BYTES = 256 * 1024 * 1024
+ROLL_LABEL_SIZE = (2.625, 1.0)  # inches
+
+# Scratch files (PDFs handed to SumatraPDF, streamed order spools, paged pull
+# lists) live under SPOOL_DIR, one subdirectory per owning job; point it at a
+# RAM disk to keep them off slow storage. Files older than SPOOL_TTL_SECONDS
+# that no running job owns are swept at startup and every SPOOL_SWEEP_SECONDS
+SPOOL_DIR = os.environ.get("PRINT_SERVICE_SPOOL_DIR", os.path.join(tempfile.gettempdir(), "print_service_spool"))
+SPOOL_TTL_SECONDS = int(os.environ.get("PRINT_SERVICE_SPOOL_TTL", 24 * 3600))
+SPOOL_SWEEP_SECONDS = 15 * 60
+
+# Output directories that are kept, and for how many days (0 keeps files forever)
+FILE_RETENTION_DAYS = {
+    'packing_slips': 7,      # slips opened for viewing, ndefe's copies
+    'store_pick_lists': 7,   # ndefe's copies
+    'store_invoices': int(os.environ.get("PRINT_SERVICE_INVOICE_RETENTION_DAYS", 0)),  # forever unless configured
+}
+
+# Label previews (/preview/<label_type>): rendered PNGs kept in an LRU cache
+PREVIEW_CACHE_SIZE = int(os.environ.get("PRINT_SERVICE_PREVIEW_CACHE", 256))
+PREVIEW_MAX_DPI = 600
+
+# TrueType fonts for PDFs and label previews. Point PRINT_SERVICE_FONT_DIR at
+# a bundled copy of these files to run off Windows. Parsed fonts are cached in
+# FONT_CACHE_DIR keyed by file hash, so startup skips parsing them again
+FONT_DIR = os.environ.get("PRINT_SERVICE_FONT_DIR", "C:/Windows/Fonts")
+FONT_CACHE_DIR = os.environ.get("PRINT_SERVICE_FONT_CACHE_DIR", os.path.join(BASE_DIR, "font_cache"))
+PDF_FONT_FILES = {
+    'Calibri': 'calibri.ttf',
+    'Calibri-Bold': 'calibrib.ttf',
+    'Calibri-Italic': 'calibrii.ttf',
+    'Book Antiqua': 'ANTQUAI.TTF',
+}
+
+# Rendered packing slips, pick lists, invoices and pull lists, kept for
+# reprints and for /pdf/<kind>/<key> views (oldest dropped past this size)
+PDF_CACHE_BYTES = int(os.environ.get("PRINT_SERVICE_PDF_CACHE_MB", 64)) * 1024 * 1024
+
+# Requests from this machine sent with an X-Profile: 1 header run under
+# cProfile; the newest PROFILE_KEEP profiles are kept in PROFILE_DIR
+PROFILE_DIR = os.environ.get("PRINT_SERVICE_PROFILE_DIR", os.path.join(BASE_DIR, "profiles"))
+PROFILE_KEEP = int(os.environ.get("PRINT_SERVICE_PROFILE_KEEP", 50))
+PROFILE_NAME_PATTERN = re.compile(r"[A-Za-z0-9_]+\.\d{8}-\d{6}-\d{6}\.prof")
+LOCAL_ADDRESSES = {'127.0.0.1', '::1', 'localhost'}
+
+# Trace spans (request, render, printer wait and spool stages) are appended to
+# TRACE_FILE as OTLP/JSON, one export request per line per trace, for loading
+# into an OpenTelemetry viewer. Set PRINT_SERVICE_TRACE_FILE= to turn it off.
+# The file is moved to TRACE_FILE.1 once it passes TRACE_FILE_MAX_BYTES
+TRACE_FILE = os.environ.get("PRINT_SERVICE_TRACE_FILE", os.path.join(BASE_DIR, "traces", "spans.jsonl"))
+TRACE_FILE_MAX_BYTES = int(os.environ.get("PRINT_SERVICE_TRACE_FILE_MB", 50)) * 1024 * 1024
+TRACE_SERVICE_NAME = "print_service"
+TRACEPARENT_PATTERN = re.compile(r"00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}")
+
+# Production server settings (python app.py); --dev runs the Werkzeug debug server
+SERVER_HOST = os.environ.get("PRINT_SERVICE_HOST", "127.0.0.1")
+SERVER_PORT = int(os.environ.get("PRINT_SERVICE_PORT", 5000))
+SERVER_THREADS = int(os.environ.get("PRINT_SERVICE_THREADS", 8))
+
+# One lock per printer device, created on first use
+PRINTER_LOCKS = {}
+PRINTER_LOCKS_GUARD = threading.Lock()
+
+# Priority classes for the printer locks (lower goes first). A request's
+# class comes from its endpoint, or from an X-Print-Priority header.
+PRINT_PRIORITIES = {'interactive': 0, 'fulfilment': 1, 'bulk': 2}
+DEFAULT_PRINT_PRIORITY = 'interactive'
+ENDPOINT_PRIORITIES = {
+    'print_orders': 'fulfilment',
+    'print_orders_stream': 'fulfilment',
+    'generate_packing_slip': 'fulfilment',
+    'print_pick_list': 'fulfilment',
+    'print_store_order_invoice': 'fulfilment',
+    'print_address_labels': 'fulfilment',
+    'print_batch': 'fulfilment',
+    'print_sheet_pack': 'fulfilment',
+    'print_auto': 'fulfilment',
+    'print_range': 'bulk',
+    'resume_job': 'bulk',
+    'print_sheet_front': 'bulk',
+    'print_sheet_back': 'bulk',
+    'print_items_to_pull': 'bulk',
+    'print_envelope_table': 'bulk',
+}
+PRINT_WAIT_SAMPLES = 500  # recent queue waits kept per class for percentiles
+
+# Endpoints that take dry_run (JSON field or ?dry_run=1): the request is
+# validated, routed and laid out on counting DCs instead of printers, and
+# the response carries an estimate of labels, sheets and printer time
+DRY_RUN_ENDPOINTS = {
+    'print_germ_label', 'print_single_front_label', 'print_single_back_label',
+    'print_sheet_front', 'print_sheet_back', 'print_sheet_pack', 'print_auto',
+    'resume_job', 'print_orders', 'print_orders_stream', 'print_items_to_pull',
+    'generate_packing_slip', 'reprocess_order', 'print_range', 'print_envelope_table',
+    'print_address_labels', 'print_stock_seed_label', 'print_pick_list',
+    'print_store_order_invoice', 'print_mix_label', 'print_batch',
+}
+
+# Throughput model for /print-auto and dry runs: rated seconds per roll label
+# copy, per sheet and per shipping label. Measured print times (moving average)
+# only ever raise these, since the spooler hands control back before the
+# printer has finished the page
+PRINT_RATED_SECONDS = {
+    'roll_label': float(os.environ.get('PRINT_SERVICE_ROLL_LABEL_SECONDS', 1.5)),
+    'sheet': float(os.environ.get('PRINT_SERVICE_SHEET_SECONDS', 12.0)),
+    'shipping_label': float(os.environ.get('PRINT_SERVICE_SHIPPING_LABEL_SECONDS', 2.0)),
+}
+PRINTER_COST_KINDS = {
+    ROLL_PRINTER: 'roll_label',
+    SHEET_PRINTER: 'sheet',
+    ROLLO_PRINTER: 'shipping_label',
+}
+PRINT_COST_ALPHA = 0.2
+
+# Coalescing of /print-single-front and /print-single-back: requests for the
+# same printer that arrive within PRINT_SERVICE_COALESCE_MS of the first one
+# (or until COALESCE_MAX_JOBS are waiting) print as one spooler document.
+# 0 turns it off and prints each request on its own
+COALESCE_WINDOW_SECONDS = float(os.environ.get("PRINT_SERVICE_COALESCE_MS", 0)) / 1000
+COALESCE_MAX_JOBS = int(os.environ.get("PRINT_SERVICE_COALESCE_MAX_JOBS", 20))
+
+# Items to pull table layout (points)
+PULL_SPOOL_DIR = os.path.join(SPOOL_DIR, "pull_lists")
+PULL_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]{1,64}")
+PULL_HEADERS = ['Variety Name', 'Crop', 'SKU Suffix', 'Qty']
+PULL_COL_WIDTHS = [3*inch, 1.5*inch, 1*inch, 0.7*inch]
+PULL_PAGE_MARGIN = inch
+PULL_TITLE_SPACE = 24
+PULL_HEADER_HEIGHT = 27  # 12pt text + 6pt top/bottom padding
+PULL_ROW_HEIGHT = 24     # 10pt text + 6pt top/bottom padding
+
+# Pick list table rows are single-line 11pt text (points)
+PICK_LIST_HEADER_HEIGHT = 23
+PICK_LIST_ROW_HEIGHT = 18
+
+
+# === PDF fonts ===
+# Parsing a TrueType file is most of ReportLab's startup cost. A TTFont holds
+# a lambda and a WeakKeyDictionary so it can't be pickled whole; instead the
+# parsed face and font attributes are pickled and the rest rebuilt on load.
+# The cache key covers the file bytes and the ReportLab version.
+
+def font_cache_path(font_path):
+    with open(font_path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:32]
+    version = re.sub(r'[^0-9A-Za-z.]', '_', reportlab.Version)
+    return os.path.join(FONT_CACHE_DIR, f"{os.path.basename(font_path)}.{digest}.rl{version}.pickle")
+
+
+def dump_ttfont(font, cache_path):
+    state = dict(vars(font))
+    state.pop('state', None)
+    face = dict(vars(font.face))
+    face.pop('_pdfScale', None)
+    state['face'] = face
+    os.makedirs(FONT_CACHE_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=FONT_CACHE_DIR)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def restore_ttfont(name, cache_path):
+    with open(cache_path, 'rb') as f:
+        state = pickle.load(f)
+    face = TTFontFace.__new__(TTFontFace)
+    face.__dict__.update(state.pop('face'))
+    scale = 1000 / face.unitsPerEm
+    face._pdfScale = (lambda x: x) if face.unitsPerEm == 1000 else (lambda x: x * scale)
+    font = TTFont.__new__(TTFont)
+    font.__dict__.update(state)
+    font.fontName = name
+    font.face = face
+    font.state = WeakKeyDictionary()
+    return font
+
+
+def load_ttfont(name, font_path):
+    """TTFont for font_path, from FONT_CACHE_DIR when already parsed"""
+    try:
+        cache_path = font_cache_path(font_path)
+    except OSError:
+        return TTFont(name, font_path)  # let ReportLab report the missing font
+    if os.path.exists(cache_path):
+        try:
+            return restore_ttfont(name, cache_path)
+        except Exception as e:
+            print(f"Font cache {cache_path} unusable, parsing {font_path} again: {e}")
+    font = TTFont(name, font_path)
+    try:
+        dump_ttfont(font, cache_path)
+    except Exception as e:
+        print(f"Could not write font cache for {font_path}: {e}")
+    return font
+
+
+def register_pdf_fonts():
+    for name, file_name in PDF_FONT_FILES.items():
+        pdfmetrics.registerFont(load_ttfont(name, os.path.join(FONT_DIR, file_name)))
+
+
+register_pdf_fonts()
+
 
 @app.route('/health', methods=['GET'])
 def health_check():
     return {'status': 'ok'}, 200
 
 
+# === Printer scheduling ===
+# Each printer has a PrinterLock. Waiting jobs are served by priority class
+# and then in arrival order. A job holding the lock can call
+# printer_checkpoint() at a document boundary (between label copies or
+# sheets). If a higher-priority job is waiting, the lock is handed to that
+# job, and the long job carries on once the queue in front of it is empty.
+
+PRINT_CONTEXT = threading.local()
+PRINT_WAIT_STATS = {
+    name: {'jobs': 0, 'total_wait': 0.0, 'max_wait': 0.0, 'recent': deque(maxlen=PRINT_WAIT_SAMPLES)}
+    for name in PRINT_PRIORITIES
+}
+PRINT_WAIT_STATS_LOCK = threading.Lock()
+
+
+class PrinterLock:
+    """Re-entrant printer lock that grants waiters by (priority, arrival)"""
+
+    def __init__(self, name):
+        self.name = name
+        self.cond = threading.Condition()
+        self.waiting = []  # heap of (priority, arrival, thread id)
+        self.arrivals = itertools.count()
+        self.owner = None
+        self.owner_entry = None
+        self.depth = 0
+        self.yields = 0
+        self.job_seconds = None  # moving average of how long a job holds the printer
+
+    def _wait_for_turn(self, entry):
+        # Caller holds self.cond
+        heapq.heappush(self.waiting, entry)
+        while self.owner is not None or self.waiting[0] is not entry:
+            self.cond.wait()
+        heapq.heappop(self.waiting)
+        self.owner = entry[2]
+        self.owner_entry = entry
+
+    def acquire(self, priority):
+        """Block until this thread holds the lock; returns seconds spent queued"""
+        me = threading.get_ident()
+        with self.cond:
+            if self.owner == me:
+                self.depth += 1
+                return 0.0
+            start = time.monotonic()
+            self._wait_for_turn((priority, next(self.arrivals), me))
+            self.depth = 1
+            return time.monotonic() - start
+
+    def release(self):
+        with self.cond:
+            self.depth -= 1
+            if self.depth == 0:
+                self.owner = None
+                self.owner_entry = None
+                self.cond.notify_all()
+
+    def yield_to_waiters(self):
+        """Let higher-priority waiters print first; returns True if this thread yielded"""
+        with self.cond:
+            if self.owner != threading.get_ident():
+                return False
+            entry = self.owner_entry
+            if not self.waiting or self.waiting[0][0] >= entry[0]:
+                return False
+
+            depth = self.depth
+            self.yields += 1
+            self.owner = None
+            self.owner_entry = None
+            self.depth = 0
+            self.cond.notify_all()
+
+            # Re-queue with the original arrival so we resume ahead of later jobs in our class
+            self._wait_for_turn(entry)
+            self.depth = depth
+            return True
+
+    def record_job(self, seconds):
+        with self.cond:
+            if self.job_seconds is None:
+                self.job_seconds = seconds
+            else:
+                self.job_seconds += PRINT_COST_ALPHA * (seconds - self.job_seconds)
+
+    def queue_depth(self):
+        """Jobs printing or waiting for this printer"""
+        with self.cond:
+            return len(self.waiting) + (1 if self.owner is not None else 0)
+
+    def status(self):
+        with self.cond:
+            waiting = {name: 0 for name in PRINT_PRIORITIES}
+            names = {level: name for name, level in PRINT_PRIORITIES.items()}
+            for priority, _, _ in self.waiting:
+                waiting[names[priority]] += 1
+            return {
+                'busy': self.owner is not None,
+                'running_priority': names[self.owner_entry[0]] if self.owner_entry else None,
+                'waiting': waiting,
+                'yields': self.yields,
+                'avg_job_seconds': round(self.job_seconds, 2) if self.job_seconds is not None else None,
+            }
+
+
+def get_printer_lock(printer_name):
+    with PRINTER_LOCKS_GUARD:
+        lock = PRINTER_LOCKS.get(printer_name)
+        if lock is None:
+            lock = PRINTER_LOCKS[printer_name] = PrinterLock(printer_name)
+        return lock
+
+
+def current_print_priority():
+    return getattr(PRINT_CONTEXT, 'priority', DEFAULT_PRINT_PRIORITY)
+
+
+def record_print_wait(priority_name, seconds):
+    with PRINT_WAIT_STATS_LOCK:
+        stats = PRINT_WAIT_STATS[priority_name]
+        stats['jobs'] += 1
+        stats['total_wait'] += seconds
+        stats['max_wait'] = max(stats['max_wait'], seconds)
+        stats['recent'].append(seconds)
+
+
+@app.before_request
+def set_print_priority():
+    """Pick the priority class printer locks use for this request"""
+    priority = request.headers.get('X-Print-Priority') or ENDPOINT_PRIORITIES.get(request.endpoint, DEFAULT_PRINT_PRIORITY)
+    if priority not in PRINT_PRIORITIES:
+        return validation_failed([{
+            'field': 'X-Print-Priority',
+            'error': f"must be one of {', '.join(PRINT_PRIORITIES)}"
+        }])
+    PRINT_CONTEXT.priority = priority
+
+
+@app.teardown_request
+def clear_print_priority(exc):
+    PRINT_CONTEXT.__dict__.pop('priority', None)
+
+
+@contextmanager
+def printer_lock(printer_name):
+    """
+    Hold the device lock for printer_name while a job is sent to it.
+
+    Each printer has its own lock, so jobs for different printers run
+    concurrently while two jobs for the same printer never interleave.
+    The lock is re-entrant so a job can call other print helpers for the
+    same printer (e.g. /print-range calling the single label logic).
+    Waiting jobs get the printer in priority order (see PrinterLock).
+    """
+    if current_dry_run() is not None:
+        # Nothing reaches the printer, so don't queue behind real jobs
+        yield
+        return
+
+    lock = get_printer_lock(printer_name)
+    priority_name = current_print_priority()
+    with trace_span('printer.wait', **{'printer.name': printer_name, 'print.priority': priority_name}):
+        waited = lock.acquire(PRINT_PRIORITIES[priority_name])
+    outermost = lock.depth == 1
+    if outermost:
+        record_print_wait(priority_name, waited)
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        if outermost:
+            lock.record_job(time.monotonic() - start)
+        lock.release()
+
+
+def printer_checkpoint(printer_name):
+    """
+    Document boundary in a long job: stop if the job was cancelled, else give
+    the printer to any higher-priority job that is waiting for it and carry on.
+    """
+    job = getattr(PRINT_CONTEXT, 'job', None)
+    if job is not None:
+        job.page_done()  # raises JobCancelled if the job was cancelled
+
+    lock = get_printer_lock(printer_name)
+    start = time.monotonic()
+    if lock.yield_to_waiters():
+        print(f"{current_print_priority()} job on {printer_name} yielded for "
+              f"{time.monotonic() - start:.1f}s to higher-priority work")
+
+
+@app.route('/printers/queue', methods=['GET'])
+def printer_queue():
+    """Per-printer queue state and queue wait times per priority class"""
+    with PRINTER_LOCKS_GUARD:
+        printers = {name: lock.status() for name, lock in PRINTER_LOCKS.items()}
+
+    wait_times = {}
+    with PRINT_WAIT_STATS_LOCK:
+        for name, stats in PRINT_WAIT_STATS.items():
+            recent = sorted(stats['recent'])
+            wait_times[name] = {
+                'jobs': stats['jobs'],
+                'avg_ms': round(stats['total_wait'] / stats['jobs'] * 1000, 1) if stats['jobs'] else 0,
+                'p50_ms': round(recent[len(recent) // 2] * 1000, 1) if recent else 0,
+                'p95_ms': round(recent[min(len(recent) - 1, int(len(recent) * 0.95))] * 1000, 1) if recent else 0,
+                'max_ms': round(stats['max_wait'] * 1000, 1),
+            }
+
+    return jsonify({
+        'success': True,
+        'printers': printers,
+        'wait_times': wait_times,
+        'coalescing': LABEL_COALESCER.status()
+    })
+
+
+# === Tracing ===
+# Each request is a trace: a server span for the request and child spans for
+# the stages under it (PDF rendering, label rasters, printer lock waits,
+# SumatraPDF spooling and the label print functions). The open spans live on
+# PRINT_CONTEXT.spans, so helpers called from a request join its trace; a
+# background job's thread carries the request's span over as trace_parent.
+# A caller can join its own trace with a W3C traceparent header, and every
+# traced response names its trace in traceparent and X-Trace-Id headers.
+# When the outermost span on a thread ends, its spans are written out.
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_STATUS_OK = 1
+SPAN_STATUS_ERROR = 2
+
+TRACE_LOCK = threading.Lock()
+
+
+class Span:
+    """One timed stage of a trace"""
+
+    def __init__(self, name, kind, trace_id, parent_id, attributes):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes = dict(attributes)
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.error = None
+        self.finished = []  # spans of this thread's part of the trace, when it is the outermost
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def traceparent(self):
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_otlp(self):
+        span = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': self.kind,
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns),
+            'attributes': otlp_attributes(self.attributes),
+            'status': {'code': SPAN_STATUS_ERROR, 'message': self.error} if self.error else {'code': SPAN_STATUS_OK},
+        }
+        if self.parent_id:
+            span['parentSpanId'] = self.parent_id
+        return span
+
+
+def otlp_attributes(attributes):
+    values = []
+    for key, value in attributes.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            values.append({'key': key, 'value': {'boolValue': value}})
+        elif isinstance(value, int):
+            values.append({'key': key, 'value': {'intValue': str(value)}})
+        elif isinstance(value, float):
+            values.append({'key': key, 'value': {'doubleValue': value}})
+        else:
+            values.append({'key': key, 'value': {'stringValue': str(value)}})
+    return values
+
+
+def current_span():
+    spans = getattr(PRINT_CONTEXT, 'spans', None)
+    return spans[-1] if spans else None
+
+
+def current_trace_parent():
+    """(trace id, span id) new spans on this thread hang under, or None"""
+    span = current_span()
+    if span is not None:
+        return span.trace_id, span.span_id
+    return getattr(PRINT_CONTEXT, 'trace_parent', None)
+
+
+def set_span_attributes(**attributes):
+    span = current_span()
+    if span is not None:
+        span.attributes.update(attributes)
+
+
+def start_span(name, kind=SPAN_KIND_INTERNAL, **attributes):
+    parent = current_trace_parent()
+    trace_id, parent_id = parent if parent else (os.urandom(16).hex(), None)
+    span = Span(name, kind, trace_id, parent_id, attributes)
+    PRINT_CONTEXT.__dict__.setdefault('spans', []).append(span)
+    return span
+
+
+def end_span(span, error=None):
+    span.end_ns = time.time_ns()
+    if error is not None and span.error is None:
+        span.error = error
+    spans = PRINT_CONTEXT.spans
+    spans.remove(span)
+    outermost = spans[0] if spans else span
+    outermost.finished.append(span)
+    if outermost is span:
+        export_spans(span.finished)
+
+
+@contextmanager
+def trace_span(name, **attributes):
+    """Time the with block as a child span of the current one"""
+    span = start_span(name, **attributes)
+    error = None
+    try:
+        yield span
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        end_span(span, error)
+
+
+def traced(name=None):
+    """Decorator: run the function inside a span named name (default: the function's name)"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with trace_span(name or func.__name__):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def export_spans(spans):
+    """Append spans to TRACE_FILE as one OTLP/JSON ExportTraceServiceRequest line"""
+    if not TRACE_FILE:
+        return
+    line = json.dumps({'resourceSpans': [{
+        'resource': {'attributes': otlp_attributes({
+            'service.name': TRACE_SERVICE_NAME,
+            'process.pid': os.getpid(),
+        })},
+        'scopeSpans': [{
+            'scope': {'name': TRACE_SERVICE_NAME},
+            'spans': [span.to_otlp() for span in spans],
+        }],
+    }]}, default=str)
+    with TRACE_LOCK:
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(TRACE_FILE)), exist_ok=True)
+            if os.path.exists(TRACE_FILE) and os.path.getsize(TRACE_FILE) > TRACE_FILE_MAX_BYTES:
+                os.replace(TRACE_FILE, TRACE_FILE + '.1')
+            with open(TRACE_FILE, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+        except OSError as e:
+            print(f"Could not write trace spans: {e}")
+
+
+@app.before_request
+def start_request_span():
+    match = TRACEPARENT_PATTERN.fullmatch(request.headers.get('traceparent', '').strip())
+    if match:
+        PRINT_CONTEXT.trace_parent = (match.group(1), match.group(2))
+    PRINT_CONTEXT.request_span = start_span(
+        f"{request.method} {request.url_rule.rule if request.url_rule else request.path}",
+        kind=SPAN_KIND_SERVER,
+        **{
+            'http.request.method': request.method,
+            'http.route': request.url_rule.rule if request.url_rule else None,
+            'url.path': request.path,
+            'print.priority': current_print_priority(),
+        }
+    )
+
+
+@app.after_request
+def tag_request_span(response):
+    span = getattr(PRINT_CONTEXT, 'request_span', None)
+    if span is not None:
+        span.set_attribute('http.response.status_code', response.status_code)
+        if response.status_code >= 500:
+            span.error = f"HTTP {response.status_code}"
+        response.headers['traceparent'] = span.traceparent()
+        response.headers['X-Trace-Id'] = span.trace_id
+    return response
+
+
+@app.teardown_request
+def end_request_span(exc):
+    span = PRINT_CONTEXT.__dict__.pop('request_span', None)
+    if span is not None:
+        # Close anything a failed handler left open, then the request itself
+        for child in reversed(PRINT_CONTEXT.spans[PRINT_CONTEXT.spans.index(span) + 1:]):
+            end_span(child, 'not finished')
+        end_span(span, f"{type(exc).__name__}: {exc}" if exc else None)
+    PRINT_CONTEXT.__dict__.pop('trace_parent', None)
+
+
+# === Dry runs ===
+# A dry run goes through the normal request path with PRINT_CONTEXT.dry_run
+# set to a DryRunTally: open_printer_dc hands out DryRunDCs, which lay every
+# page out and count it, send_pdf_to_printer counts the PDF's pages, printer
+# locks are skipped and journaled jobs are not written to the journal. The
+# counts and the throughput model give the estimate added to the response.
+
+class DryRunTally:
+    """Pages and spooler documents a dry run would have sent to each printer"""
+
+    def __init__(self):
+        self.printers = {}
+
+    def add(self, printer_name, pages=0, documents=0):
+        counts = self.printers.setdefault(printer_name, {'pages': 0, 'spool_jobs': 0})
+        counts['pages'] += pages
+        counts['spool_jobs'] += documents
+
+    def estimate(self):
+        printers = {}
+        for printer_name, counts in self.printers.items():
+            queue_seconds, queue_depth = printer_queue_seconds(printer_name)
+            unit_seconds = print_unit_seconds(PRINTER_COST_KINDS.get(printer_name, 'roll_label'))
+            printers[printer_name] = {
+                **counts,
+                'print_seconds': round(counts['pages'] * unit_seconds, 1),
+                'queue_depth': queue_depth,
+                'queue_seconds': round(queue_seconds, 1),
+            }
+
+        def pages_on(*names):
+            return sum(self.printers.get(name, {}).get('pages', 0) for name in names)
+
+        print_seconds = sum(printer['print_seconds'] for printer in printers.values())
+        queue_seconds = sum(printer['queue_seconds'] for printer in printers.values())
+        return {
+            'labels': pages_on(ROLL_PRINTER, ROLLO_PRINTER),
+            'sheets': pages_on(SHEET_PRINTER),
+            'pages': sum(counts['pages'] for counts in self.printers.values()),
+            'spool_jobs': sum(counts['spool_jobs'] for counts in self.printers.values()),
+            'print_seconds': round(print_seconds, 1),
+            'queue_seconds': round(queue_seconds, 1),
+            'estimated_seconds': round(print_seconds + queue_seconds, 1),
+            'printers': printers,
+        }
+
+
+def current_dry_run():
+    """The DryRunTally of the request being handled, or None when printing for real"""
+    return getattr(PRINT_CONTEXT, 'dry_run', None)
+
+
+@app.before_request
+def start_dry_run():
+    if request.endpoint not in DRY_RUN_ENDPOINTS:
+        return None
+    flags = {}
+    if 'dry_run' in request.args:
+        flags['dry_run'] = request.args['dry_run']
+    elif request.is_json:
+        body = request.get_json(silent=True)
+        if isinstance(body, dict) and 'dry_run' in body:
+            flags['dry_run'] = body['dry_run']
+    options, errors = VALIDATORS['dry_run'](flags)
+    if errors:
+        return validation_failed(errors)
+    if options['dry_run']:
+        PRINT_CONTEXT.dry_run = DryRunTally()
+    return None
+
+
+@app.after_request
+def add_dry_run_estimate(response):
+    tally = current_dry_run()
+    if tally is not None:
+        body = response.get_json(silent=True)
+        if isinstance(body, dict):
+            body['dry_run'] = True
+            body['estimate'] = tally.estimate()
+            response.set_data(app.json.dumps(body))
+    return response
+
+
+@app.teardown_request
+def clear_dry_run(exc):
+    PRINT_CONTEXT.__dict__.pop('dry_run', None)
+
+
+def send_pdf_to_printer(pdf, printer_name=SHEET_PRINTER):
+    """
+    Print a PDF silently through SumatraPDF while holding the printer lock.
+    pdf is the document's bytes, or the path of a PDF already on disk.
+    """
+    tally = current_dry_run()
+    if PRINTER_BACKEND == "fake" or tally is not None:
+        if not isinstance(pdf, bytes):
+            with open(pdf, 'rb') as f:
+                pdf = f.read()
+        pages = len(re.findall(rb'/Type\s*/Page\b', pdf))
+        if tally is not None:
+            tally.add(printer_name, pages=pages, documents=1)
+            return
+        with printer_lock(printer_name), trace_span('pdf.spool', **{'printer.name': printer_name, 'pdf.pages': pages}):
+            fake_print_pages(printer_name, pages)
+        return
+
+    if isinstance(pdf, bytes):
+        with pdf_spool_file(pdf) as file_path:
+            send_pdf_to_printer(file_path, printer_name)
+        return
+
+    command = f'"{SUMATRA_PATH}" -print-to "{printer_name}" -print-settings "fit,portrait" -silent "{pdf}"'
+    with printer_lock(printer_name), trace_span('pdf.spool', **{'printer.name': printer_name}):
+        subprocess.run(command, check=True, shell=True)
+
+
+def save_pdf(pdf, directory, prefix):
+    """Write PDF bytes to a new, uniquely named file in directory and return its path"""
+    os.makedirs(directory, exist_ok=True)
+    fd, file_path = tempfile.mkstemp(prefix=prefix, suffix='.pdf', dir=directory)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(pdf)
+    return file_path
+
+
+@contextmanager
+def pdf_spool_file(pdf):
+    """SumatraPDF only prints files: hold PDF bytes in a spool file of their own for the block"""
+    with SPOOL.owner(spool_owner()) as directory:
+        file_path = save_pdf(pdf, directory, 'print_')
+        try:
+            yield file_path
+        finally:
+            try:
+                os.remove(file_path)
+            except OSError as e:
+                print(f"Warning: Could not delete spool file {file_path}: {e}")
+
+
+# === Scratch and kept files ===
+
+class SpoolDirectory:
+    """
+    Scratch files under one root, in a subdirectory per owner (a job id, or
+    one request). An owner's directory is removed when its last user leaves
+    owner(); sweep() removes whatever a crash or a stuck print left behind.
+    """
+
+    def __init__(self, root, ttl_seconds):
+        self.root = root
+        self.ttl_seconds = ttl_seconds
+        self.active = {}  # owner -> users inside owner()
+        self.lock = threading.Lock()
+        self.stats = {'sweeps': 0, 'files_removed': 0, 'bytes_removed': 0, 'last_sweep': None}
+
+    @contextmanager
+    def owner(self, name):
+        path = os.path.join(self.root, name)
+        with self.lock:
+            self.active[name] = self.active.get(name, 0) + 1
+            os.makedirs(path, exist_ok=True)
+        try:
+            yield path
+        finally:
+            with self.lock:
+                self.active[name] -= 1
+                last = self.active[name] == 0
+                if last:
+                    del self.active[name]
+                    shutil.rmtree(path, ignore_errors=True)
+
+    def sweep(self):
+        """Remove files older than the TTL outside running owners' directories, then empty directories"""
+        cutoff = time.time() - self.ttl_seconds
+        removed, removed_bytes = remove_files_older_than(self.root, cutoff)
+        with self.lock:
+            active = set(self.active)
+        try:
+            owners = [entry for entry in os.scandir(self.root) if entry.is_dir(follow_symlinks=False)]
+        except OSError:
+            owners = []
+        for entry in owners:
+            if entry.name in active:
+                continue
+            count, size = remove_files_older_than(entry.path, cutoff, recursive=True)
+            removed += count
+            removed_bytes += size
+            with self.lock:
+                if entry.name not in self.active:
+                    try:
+                        os.rmdir(entry.path)  # only succeeds once empty
+                    except OSError:
+                        pass
+
+        with self.lock:
+            self.stats['sweeps'] += 1
+            self.stats['files_removed'] += removed
+            self.stats['bytes_removed'] += removed_bytes
+            self.stats['last_sweep'] = datetime.now().isoformat(timespec='seconds')
+        return removed
+
+    def status(self):
+        with self.lock:
+            return {'root': self.root, 'ttl_seconds': self.ttl_seconds, 'active_owners': sorted(self.active), **self.stats}
+
+
+SPOOL = SpoolDirectory(SPOOL_DIR, SPOOL_TTL_SECONDS)
+
+
+def spool_owner():
+    """Spool subdirectory for the current job, or a fresh one for a request outside any job"""
+    job = getattr(PRINT_CONTEXT, 'job', None)
+    return job.job_id if job else f"request-{uuid.uuid4().hex}"
+
+
+def remove_file(path):
+    try:
+        os.remove(path)
+        return 1
+    except OSError as e:
+        print(f"Warning: Could not delete {path}: {e}")
+        return 0
+
+
+def remove_files_older_than(directory, cutoff, recursive=False):
+    """Delete files in directory last modified before cutoff; returns (files removed, bytes removed)"""
+    removed = removed_bytes = 0
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return 0, 0
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            if recursive:
+                count, size = remove_files_older_than(entry.path, cutoff, recursive=True)
+                removed += count
+                removed_bytes += size
+                try:
+                    os.rmdir(entry.path)
+                except OSError:
+                    pass
+            continue
+        stat = entry.stat()
+        if stat.st_mtime < cutoff and remove_file(entry.path):
+            removed += 1
+            removed_bytes += stat.st_size
+    return removed, removed_bytes
+
+
+def apply_retention():
+    """Delete kept output files past their directory's FILE_RETENTION_DAYS"""
+    removed = {}
+    for directory, days in FILE_RETENTION_DAYS.items():
+        if days > 0 and os.path.isdir(directory):
+            removed[directory], _ = remove_files_older_than(directory, time.time() - days * 86400)
+    return removed
+
+
+def sweep_files():
+    swept = SPOOL.sweep()
+    expired = apply_retention()
+    if swept or any(expired.values()):
+        print(f"File sweep: {swept} stale spool files, {sum(expired.values())} expired kept files {expired}")
+
+
+def start_file_sweeper():
+    """Sweep stale spool files and expired kept files now, then every SPOOL_SWEEP_SECONDS"""
+    def run():
+        while True:
+            try:
+                sweep_files()
+            except Exception as e:
+                print(f"Error sweeping files: {str(e)}")
+            time.sleep(SPOOL_SWEEP_SECONDS)
+
+    threading.Thread(target=run, name="file-sweeper", daemon=True).start()
+
+
+@app.route('/files', methods=['GET'])
+def file_status():
+    """Spool directory state and the retention policy for kept files"""
+    return jsonify({
+        'success': True,
+        'spool': SPOOL.status(),
+        'retention_days': FILE_RETENTION_DAYS
+    })
+
+
+def fake_print_pages(printer_name, pages):
+    """Stand in for the time printer_name takes to print pages (fake backend)"""
+    seconds = pages * FAKE_PAGE_SECONDS.get(printer_name, 1.0) * FAKE_TIME_SCALE
+    if seconds > 0:
+        time.sleep(seconds)
+
+
 def create_font(name, size, bold=False, italic=False):
     weight = FW_BOLD if bold else FW_NORMAL
     return win32ui.CreateFont({
@@ -63,6 +1039,59 @@ def create_font(name, size, bold=False, italic=False):
     })
 
 
+class FontCache:
+    """
+    GDI fonts and pens created once and reused for a whole print job.
+
+    Call it like create_font: fonts("Calibri", 32, bold=True). Draw functions
+    take one of these instead of creating fonts themselves, so a batch of
+    labels (or every copy of one label) shares the same font objects.
+    """
+
+    def __init__(self, factory=None, pen_factory=None):
+        # Defaults are GDI objects, or PIL ones for the fake printer backend's
+        # and dry runs' DCs
+        fake = PRINTER_BACKEND == "fake" or current_dry_run() is not None
+        self.factory = factory or (create_preview_font if fake else create_font)
+        self.pen_factory = pen_factory or (create_preview_pen if fake else win32ui.CreatePen)
+        self.fonts = {}
+        self.pens = {}
+
+    def __call__(self, name, size, bold=False, italic=False):
+        key = (name, size, bold, italic)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = self.factory(name, size, bold=bold, italic=italic)
+        return font
+
+    def pen(self, style, width, color):
+        key = (style, width, color)
+        pen = self.pens.get(key)
+        if pen is None:
+            pen = self.pens[key] = self.pen_factory(style, width, color)
+        return pen
+
+
+def open_printer_dc(printer_name):
+    if current_dry_run() is not None:
+        return DryRunDC(printer_name)
+    if PRINTER_BACKEND == "fake":
+        return FakePrinterDC(printer_name)
+    if win32ui is None:
+        raise RuntimeError("pywin32 is not installed; set PRINT_SERVICE_PRINTER_BACKEND=fake to run without it")
+    dc = win32ui.CreateDC()
+    dc.CreatePrinterDC(printer_name)
+    return dc
+
+
+def draw_image(dc, image, box):
+    """Draw a PIL image into box (left, top, right, bottom) on a printer or preview DC"""
+    if isinstance(dc, PreviewDC):
+        dc.DrawImage(image, box)
+    else:
+        ImageWin.Dib(image).draw(dc.GetHandleOutput(), box)
+
+
 def format_variety_name_with_quotes(variety_name):
        """
        Format variety name with quotes only around the part outside parentheses.
@@ -77,10 +1106,448 @@ def format_variety_name_with_quotes(variety_name):
            return f"'{variety_name}'"
 
 
+# ---------------------------------------------------------------------------
+# Request validation
+#
+# Every endpoint payload is described by a schema below. The schemas are
+# compiled into validator functions once at import, and each route runs its
+# validator on the whole request before any printer, DC or spool file is
+# touched. A validator returns (normalized_data, errors): missing optional
+# fields are filled with their defaults, numbers arriving as strings are
+# converted, and every problem is reported at once as {'field', 'error'}.
+# ---------------------------------------------------------------------------
+
+def _coerce_text(value):
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise ValueError("must be text")
+    return str(value)
+
+
+def _coerce_int(value):
+    if isinstance(value, bool):
+        raise ValueError("must be a whole number")
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError("must be a whole number")
+    if number != int(number):
+        raise ValueError("must be a whole number")
+    return int(number)
+
+
+def _coerce_number(value):
+    if isinstance(value, bool):
+        raise ValueError("must be a number")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError("must be a number")
+
+
+def _coerce_bool(value):
+    if isinstance(value, bool):
+        return value
+    if value in (0, 1, '0', '1'):
+        return bool(int(value))
+    if isinstance(value, str) and value.lower() in ('true', 'false'):
+        return value.lower() == 'true'
+    raise ValueError("must be true or false")
+
+
+def _coerce_date(value):
+    value = _coerce_text(value)
+    try:
+        datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError("must be an ISO date")
+    return value
+
+
+def _coerce_list(value):
+    if not isinstance(value, list):
+        raise ValueError("must be a list")
+    return value
+
+
+def _coerce_dict(value):
+    if not isinstance(value, dict):
+        raise ValueError("must be an object")
+    return value
+
+
+FIELD_COERCERS = {
+    'text': _coerce_text,
+    'int': _coerce_int,
+    'number': _coerce_number,
+    'bool': _coerce_bool,
+    'date': _coerce_date,
+    'list': _coerce_list,
+    'dict': _coerce_dict,
+}
+
+
+def compile_schema(fields):
+    """
+    Compile a schema into a validator function.
+
+    fields maps a field name to its spec:
+        type      one of FIELD_COERCERS (default 'text')
+        required  reject the request if the field is missing or blank
+        default   value used when the field is missing or blank
+        min       smallest allowed value for 'int' and 'number' fields
+        max       largest allowed value for 'int' and 'number' fields
+        fields    schema a 'dict' field must itself match
+        items     schema each element of a 'list' must match
+        values    schema each value of a 'dict' must match (keyed by anything)
+        each      type each element of a 'list' / value of a 'dict' must have
+    Required fields also reject empty lists and objects. Fields not named in
+    the schema are passed through untouched.
+    """
+    checks = []
+    for name, spec in fields.items():
+        checks.append((
+            name,
+            FIELD_COERCERS[spec.get('type', 'text')],
+            spec.get('required', False),
+            spec.get('default'),
+            spec.get('min'),
+            spec.get('max'),
+            compile_schema(spec['fields']) if 'fields' in spec else None,
+            compile_schema(spec['items']) if 'items' in spec else None,
+            compile_schema(spec['values']) if 'values' in spec else None,
+            FIELD_COERCERS[spec['each']] if 'each' in spec else None,
+        ))
+
+    def validate(data, path=''):
+        if not isinstance(data, dict):
+            return None, [{'field': path or 'body', 'error': 'must be a JSON object'}]
+
+        clean = dict(data)
+        errors = []
+        for name, coerce, required, default, minimum, maximum, fields, items, values, each in checks:
+            field_path = f"{path}.{name}" if path else name
+            value = data.get(name)
+
+            if value is None or value == '' or (required and value in ([], {})):
+                if required:
+                    errors.append({'field': field_path, 'error': 'is required'})
+                else:
+                    clean[name] = type(default)(default) if isinstance(default, (list, dict)) else default
+                continue
+
+            try:
+                value = coerce(value)
+                if minimum is not None and value < minimum:
+                    raise ValueError(f"must be at least {minimum}")
+                if maximum is not None and value > maximum:
+                    raise ValueError(f"must be at most {maximum}")
+            except ValueError as e:
+                errors.append({'field': field_path, 'error': str(e)})
+                continue
+
+            if fields:
+                value, field_errors = fields(value, field_path)
+                errors.extend(field_errors)
+
+            elif items or values or each:
+                entries = enumerate(value) if isinstance(value, list) else value.items()
+                cleaned = [] if isinstance(value, list) else {}
+                for key, entry in entries:
+                    entry_path = f"{field_path}[{key!r}]" if isinstance(key, str) else f"{field_path}[{key}]"
+                    if each:
+                        try:
+                            entry = each(entry)
+                        except ValueError as e:
+                            errors.append({'field': entry_path, 'error': str(e)})
+                            continue
+                    schema = items or values
+                    if schema:
+                        entry, entry_errors = schema(entry, entry_path)
+                        errors.extend(entry_errors)
+                    if isinstance(cleaned, list):
+                        cleaned.append(entry)
+                    else:
+                        cleaned[key] = entry
+                value = cleaned
+
+            clean[name] = value
+
+        return clean, errors
+
+    return validate
+
+
+def validation_error_body(errors):
+    return {
+        'success': False,
+        'error': 'Invalid request: ' + '; '.join(f"{e['field']} {e['error']}" for e in errors),
+        'errors': errors
+    }
+
+
+def validation_failed(errors):
+    """400 response listing every field error found in a request"""
+    return jsonify(validation_error_body(errors)), 400
+
+
+QUANTITY_FIELDS = {
+    'quantity': {'type': 'int', 'default': 1, 'min': 1},
+    'env_multiplier': {'type': 'int', 'default': 1, 'min': 1},
+}
+
+BACK_LINE_FIELDS = {f'back{n}': {} for n in range(1, 8)}
+
+FRONT_LABEL_FIELDS = {
+    'variety_name': {'required': True},
+    'sku_suffix': {'required': True},
+    'crop': {'default': ''},
+    'common_name': {'default': ''},
+    'days': {'default': ''},
+    'pkg_size': {'default': ''},
+    'env_type': {'default': ''},
+    'lot_code': {'default': ''},
+    'germination': {'default': ''},
+    'for_year': {'default': ''},
+    'desc1': {'default': ''},
+    'desc2': {'default': ''},
+    'desc3': {},
+    'rad_type': {},
+    **QUANTITY_FIELDS,
+}
+
+BACK_LABEL_FIELDS = {
+    'variety_name': {'default': ''},
+    **BACK_LINE_FIELDS,
+    **QUANTITY_FIELDS,
+}
+
+LINEITEM_FIELDS = {
+    'qty': {'type': 'int', 'required': True},
+    'lineitem': {'required': True},
+    'price': {'type': 'number', 'required': True},
+}
+
+ORDER_FIELDS = {
+    'order_number': {'required': True},
+    'customer_name': {'required': True},
+    'date': {'type': 'date', 'required': True},
+    'address': {'default': ''},
+    'address2': {'default': ''},
+    'postal_code': {'default': ''},
+    'city': {'default': ''},
+    'state': {'default': ''},
+    'country': {'default': ''},
+    'note': {'default': ''},
+    'shipping': {'type': 'number', 'default': 0},
+    'tax': {'type': 'number', 'default': 0},
+    'subtotal': {'type': 'number', 'default': 0},
+    'total': {'type': 'number', 'default': 0},
+    'pkt_items': {'type': 'list', 'default': [], 'items': LINEITEM_FIELDS},
+    'bulk_items': {'type': 'list', 'default': [], 'items': LINEITEM_FIELDS},
+    'misc_items': {'type': 'list', 'default': [], 'items': LINEITEM_FIELDS},
+}
+
+# /print-orders keys order_data by order number, so its orders needn't repeat it
+ORDER_DATA_FIELDS = {**ORDER_FIELDS, 'order_number': {}}
+
+PULL_ITEM_FIELDS = {
+    'variety_name': {'default': ''},
+    'crop': {'default': ''},
+    'sku_suffix': {'default': ''},
+    'quantity': {'type': 'int', 'default': 0},
+}
+
+RANGE_ITEM_FIELDS = {
+    'sku': {'default': ''},
+    'lot': {},
+    'germination': {},
+    'for_year': {},
+    'print_back': {'type': 'bool', 'default': False},
+    **FRONT_LABEL_FIELDS,
+    **BACK_LINE_FIELDS,
+    # sku_suffix is derived from sku by /print-range
+    'sku_suffix': {'default': ''},
+}
+
+# Sheet requests can start part way into a used sheet (cells are numbered
+# 1-30 across then down) and print count labels instead of full sheets
+SHEET_CELL_FIELDS = {
+    'start_cell': {'type': 'int', 'default': 1, 'min': 1, 'max': SHEET_ROWS * SHEET_COLS},
+    'count': {'type': 'int', 'min': 1},
+}
+
+# Journaled jobs (/print-range, /print-orders) can be named by the client and run in the background
+JOB_FIELDS = {
+    'job_id': {},
+    'async': {'type': 'bool', 'default': False},
+}
+
+SCHEMAS = {
+    'germ_label': {
+        'variety_name': {'required': True},
+        'sku_prefix': {'required': True},
+        'species': {'required': True},
+        'lot_code': {'required': True},
+        'germ_year': {},
+    },
+    'front_label': FRONT_LABEL_FIELDS,
+    'back_label': BACK_LABEL_FIELDS,
+    'print_orders': {
+        'customer_orders': {'type': 'dict', 'required': True, 'each': 'list'},
+        'order_data': {'type': 'dict', 'required': True, 'values': ORDER_DATA_FIELDS},
+        'missing_orders': {},
+        'bulk_orders': {},
+        'misc_orders': {},
+        **JOB_FIELDS,
+    },
+    # /print-orders/stream: query string, then the customer_orders line and one line per order
+    'print_orders_stream': {
+        'job_id': {},
+        'resume': {'type': 'bool', 'default': False},
+    },
+    'order_stream_header': {
+        'customer_orders': {'type': 'dict', 'required': True, 'each': 'list'},
+    },
+    'order': ORDER_FIELDS,
+    'pull_list': {
+        'items': {'type': 'list', 'default': [], 'items': PULL_ITEM_FIELDS},
+        'batch_date': {'default': 'Unknown'},
+        'pull_id': {},
+        'final': {'type': 'bool', 'default': False},
+        'aggregate': {'type': 'bool'},  # default: on for an items list, off for pages
+    },
+    'pull_item': PULL_ITEM_FIELDS,
+    'packing_slip': {
+        'order': {'type': 'dict', 'required': True, 'fields': ORDER_FIELDS},
+    },
+    'reprocess_order': {
+        'order': {'type': 'dict', 'required': True, 'fields': ORDER_FIELDS},
+        'bulk_to_print': {'type': 'dict', 'default': {}, 'values': {**FRONT_LABEL_FIELDS, **BACK_LINE_FIELDS}},
+    },
+    'print_range': {
+        'items': {'type': 'list', 'required': True, 'items': RANGE_ITEM_FIELDS},
+        'current_order_year': {},
+        **JOB_FIELDS,
+    },
+    'sheet_front': {**FRONT_LABEL_FIELDS, **SHEET_CELL_FIELDS},
+    'sheet_back': {**BACK_LABEL_FIELDS, **SHEET_CELL_FIELDS},
+    'sheet_pack': {
+        'side': {'default': 'front'},
+        'start_cell': SHEET_CELL_FIELDS['start_cell'],
+        'labels': {'type': 'list', 'required': True, 'items': {
+            'data': {'type': 'dict', 'required': True},
+            'count': {'type': 'int', 'min': 1},
+        }},
+    },
+    'auto_route': {
+        'side': {'default': 'front'},
+        'route_only': {'type': 'bool', 'default': False},
+    },
+    'resume_job': {
+        'async': {'type': 'bool', 'default': False},
+    },
+    'dry_run': {
+        'dry_run': {'type': 'bool', 'default': False},
+    },
+    'envelope_table': {
+        'years': {'type': 'list', 'default': []},
+        'envelope_types': {'type': 'list', 'default': [], 'each': 'text'},
+        'report_title': {'default': 'Envelope Usage Report'},
+        'envelope_data_by_year': {'type': 'dict', 'default': {}, 'values': {
+            'envelope_counts': {'type': 'dict', 'default': {}, 'each': 'int'},
+        }},
+        'usage_rows': {'type': 'list', 'default': [], 'items': {
+            'year': {'required': True},
+            'envelope_type': {'required': True},
+            'count': {'type': 'int', 'required': True},
+        }},
+        'usage_columns': {'type': 'dict', 'default': {}, 'fields': {
+            'year': {'type': 'list', 'default': []},
+            'envelope_type': {'type': 'list', 'default': [], 'each': 'text'},
+            'count': {'type': 'list', 'default': [], 'each': 'int'},
+        }},
+    },
+    'stock_seed_label': {
+        'variety': {'default': 'Unknown'},
+        'crop': {'default': 'Unknown'},
+        'lot_number': {'default': 'Unknown'},
+        'quantity': {'default': 'Unknown'},
+    },
+    'pick_list': {
+        'order_id': {},
+        'order_number': {'default': 'Unknown'},
+        'store_name': {'default': 'Unknown'},
+        'items': {'type': 'list', 'default': [], 'items': {
+            'quantity': {'type': 'int', 'default': 0},
+            'variety_name': {'default': 'Unknown'},
+            'crop': {'default': 'Unknown'},
+            'has_photo': {'type': 'bool', 'default': False},
+        }},
+    },
+    'store_invoice': {
+        'order': {'type': 'dict', 'required': True, 'fields': {
+            'order_number': {'default': 'Unknown'},
+            'shipping': {'type': 'number', 'default': 0},
+            'credit': {'type': 'number', 'default': 0},
+            'fulfilled_date': {'default': ''},
+        }},
+        'store': {'type': 'dict', 'required': True, 'fields': {
+            'store_name': {'default': 'Unknown'},
+            'address': {'default': ''},
+            'address2': {'default': ''},
+            'city': {'default': ''},
+            'state': {'default': ''},
+            'zip': {'default': ''},
+        }},
+        'items': {'type': 'list', 'required': True, 'items': {
+            'variety_name': {'default': 'Unknown'},
+            'crop': {'default': 'Unknown'},
+            'quantity': {'type': 'int', 'default': 0},
+            'price': {'type': 'number', 'default': 0},
+        }},
+    },
+    'mix_label': {
+        'mix_name': {'required': True},
+        'is_component': {'type': 'bool', 'default': False},
+        'lot_code': {'required': True},
+        'components': {'type': 'list', 'default': [], 'items': {
+            'parts': {'default': '1'},
+            'variety': {'default': ''},
+            'lot': {'default': ''},
+        }},
+    },
+    'order_label': {
+        'order_text': {'required': True},
+        'store_text': {'default': ''},
+        'font_size_order': {'type': 'int', 'default': 56, 'min': 1},
+        'font_size_store': {'type': 'int', 'default': 48, 'min': 1},
+        'y_start': {'type': 'int', 'default': 20},
+    },
+    'preview': {
+        'dpi': {'type': 'int', 'min': 25, 'max': PREVIEW_MAX_DPI},
+    },
+    'pdf_pull_list': {
+        'items': {'type': 'list', 'required': True, 'items': PULL_ITEM_FIELDS},
+        'batch_date': {'default': 'Unknown'},
+        'aggregate': {'type': 'bool', 'default': True},
+    },
+    'print_batch': {
+        'jobs': {'type': 'list', 'required': True, 'items': {
+            'type': {'required': True},
+            'data': {'type': 'dict', 'default': {}},
+        }},
+    },
+}
+
+VALIDATORS = {name: compile_schema(fields) for name, fields in SCHEMAS.items()}
+
+
 @app.route('/print-germ-label', methods=['POST'])
 def print_germ_label():
     try:
-        data = request.get_json()
+        data, errors = VALIDATORS['germ_label'](request.get_json(silent=True))
+        if errors:
+            return validation_failed(errors)
 
         if CURRENT_USER.lower() == "ndefe":
             print("=== GERM SAMPLE PRINT REQUEST ON NDEFE===")
@@ -90,78 +1557,28 @@ def print_germ_label():
             print(f"Lot Code: {data.get('lot_code')}")
             print(f"Germ Year: {data.get('germ_year')}")
             print("================================")
-        
-        else: 
-
-            # === Construct label text ===
-            variety = data.get('variety_name')
-            sku_prefix = data.get('sku_prefix')
-            species = data.get('species')
-            lot_code = data.get('lot_code')
-
-            lot_number = f"{sku_prefix}-{lot_code}"
-            lot_text = f"Lot: {lot_number}"
-            var_name = f"'{variety}'"
 
-            # === Generate barcode image and save to file ===
-            barcode = Code128(lot_number, writer=ImageWriter())
-            barcode_file = barcode.save("barcode_temp", options={"write_text": False})
-
-            # === Open barcode image safely ===
-            with Image.open(barcode_file) as img:
-                barcode_img = img.convert("RGB")
+        else:
+            label = prepare_germ_label(data)
 
-                # === Setup printer ===
-                printer_name = ROLL_PRINTER
-                dc = win32ui.CreateDC()
-                dc.CreatePrinterDC(printer_name)
+            # === Setup printer ===
+            printer_name = ROLL_PRINTER
+            with printer_lock(printer_name):
+                dc = open_printer_dc(printer_name)
                 dc.StartDoc("Seed Label")
                 dc.StartPage()
-
-                # === Label dimensions ===
-                dpi = dc.GetDeviceCaps(88)  # LOGPIXELSX
-                label_width = int(2.625 * dpi)
-                label_height = int(1.0 * dpi)
-                x_center = label_width // 2
-
-                # === Text drawing ===
-                font = create_font("Courier New", 44)
-                dc.SelectObject(font)
-
-                line_height = 45
-                y_text = 25
-                lines = [var_name, species, lot_text]
-                for line in lines:
-                    text_width = dc.GetTextExtent(line)[0]
-                    dc.TextOut(x_center - text_width // 2, y_text, line)
-                    y_text += line_height
-
-                # === Resize barcode to fit ===
-                target_width = int(label_width * 0.9)
-                aspect_ratio = barcode_img.height / barcode_img.width
-                target_height = int(target_width * aspect_ratio * 0.6)
-                resized_barcode = barcode_img.resize((target_width, target_height))
-
-                # === Draw barcode ===
-                x_barcode = (label_width - target_width) // 2
-                y_barcode = y_text + 5
-                dib = ImageWin.Dib(resized_barcode)
-                dib.draw(dc.GetHandleOutput(), (x_barcode, y_barcode, x_barcode + target_width, y_barcode + target_height))
+                draw_germ_label(dc, FontCache(), label)
 
                 # === Finalize print job ===
                 dc.EndPage()
                 dc.EndDoc()
                 dc.DeleteDC()
 
-            # === Cleanup barcode file ===
-            if os.path.exists(barcode_file):
-                os.remove(barcode_file)
-
         return jsonify({
             'success': True,
             'message': 'Label printed successfully'
         })
-        
+
     except Exception as e:
         print(f"Error printing germ label: {str(e)}")
         return jsonify({
@@ -170,6 +1587,234 @@ def print_germ_label():
         }), 500
 
 
+def prepare_germ_label(data):
+    """Germ sample label text plus its lot barcode image"""
+    # === Construct label text ===
+    variety = data.get('variety_name')
+    sku_prefix = data.get('sku_prefix')
+    species = data.get('species')
+    lot_code = data.get('lot_code')
+
+    lot_number = f"{sku_prefix}-{lot_code}"
+
+    # === Generate barcode image in memory ===
+    # (a shared barcode_temp.png would be clobbered by concurrent requests)
+    barcode = Code128(lot_number, writer=ImageWriter())
+    barcode_buffer = io.BytesIO()
+    barcode.write(barcode_buffer, options={"write_text": False})
+    barcode_buffer.seek(0)
+
+    # === Open barcode image safely ===
+    with Image.open(barcode_buffer) as img:
+        barcode_img = img.convert("RGB")
+
+    return {
+        'lines': [f"'{variety}'", species, f"Lot: {lot_number}"],
+        'barcode_img': barcode_img,
+    }
+
+
+def draw_germ_label(dc, fonts, label):
+    """Draw a germ sample label onto the current page of a roll printer DC"""
+    # === Label dimensions ===
+    dpi = dc.GetDeviceCaps(88)  # LOGPIXELSX
+    label_width = int(2.625 * dpi)
+    label_height = int(1.0 * dpi)
+    x_center = label_width // 2
+
+    # === Text drawing ===
+    dc.SelectObject(fonts("Courier New", 44))
+
+    line_height = 45
+    y_text = 25
+    for line in label['lines']:
+        text_width = dc.GetTextExtent(line)[0]
+        dc.TextOut(x_center - text_width // 2, y_text, line)
+        y_text += line_height
+
+    # === Resize barcode to fit ===
+    barcode_img = label['barcode_img']
+    target_width = int(label_width * 0.9)
+    aspect_ratio = barcode_img.height / barcode_img.width
+    target_height = int(target_width * aspect_ratio * 0.6)
+    resized_barcode = barcode_img.resize((target_width, target_height))
+
+    # === Draw barcode ===
+    x_barcode = (label_width - target_width) // 2
+    y_barcode = y_text + 5
+    draw_image(dc, resized_barcode, (x_barcode, y_barcode, x_barcode + target_width, y_barcode + target_height))
+
+
+def prepare_front_label(data):
+    """Front label text shared by the roll and sheet layouts (and across copies)"""
+    variety_name = format_variety_name_with_quotes(data.get('variety_name'))
+
+    # Check for common_name first, fall back to crop if empty
+    common_name = data.get('common_name', '').strip()
+    variety_crop = common_name if common_name else data.get('crop')
+
+    days = data.get('days')
+    env_type = data.get('env_type')
+    year = data.get('for_year')
+    lot_code = data.get('lot_code')
+    germination = data.get('germination')
+
+    if env_type == "LG Coffee":
+        pkg_size = f"{data.get('pkg_size')} ••"
+    elif env_type == "SM Coffee":
+        pkg_size = f"{data.get('pkg_size')} •"
+    else:
+        pkg_size = data.get('pkg_size')
+
+    return {
+        'variety_name': variety_name,
+        'common_name': common_name,
+        'variety_crop': variety_crop,
+        'days': days,
+        'env_type': env_type,
+        'year': year,
+        'days_year': f"{days}    Packed for 20{year}",
+        'desc_line1': data.get('desc1'),
+        'desc_line2': data.get('desc2'),
+        'desc_line3': data.get('desc3'),
+        'lot_code': lot_code,
+        'germination': germination,
+        'rad_type': data.get('rad_type'),
+        'pkg_size': pkg_size,
+        'pkg_lot_germ': f"{pkg_size}    Lot: {lot_code}    Germ: {germination}%",
+        'lot_germ': f"Lot: {lot_code}    Germ: {germination}%",
+        'sku_suffix': data.get('sku_suffix'),
+    }
+
+
+def draw_front_label(dc, fonts, label):
+    """Draw a front label onto the current page of a roll printer DC (300 DPI)"""
+    bold_12 = fonts("Times New Roman", 48, bold=True)
+    italic_9 = fonts("Times New Roman", 36, italic=True)
+    normal_8 = fonts("Times New Roman", 32)
+    bold_14 = fonts("Times New Roman", 54, bold=True)
+    normal_12 = fonts("Times New Roman", 40)
+    italic_12 = fonts("Times New Roman", 40, italic=True)
+
+    variety_name = label['variety_name']
+    variety_crop = label['variety_crop']
+    common_name = label['common_name']
+    desc_line1 = label['desc_line1']
+    desc_line2 = label['desc_line2']
+    desc_line3 = label['desc_line3']
+    pkg_size = label['pkg_size']
+    pkg_lot_germ = label['pkg_lot_germ']
+    lot_germ = label['lot_germ']
+    days_year = label['days_year']
+    rad_type = label['rad_type']
+
+    # Label size
+    dpi = dc.GetDeviceCaps(88)
+    label_width = int(2.625 * dpi)
+    label_height = int(1.0 * dpi)
+    x_center = label_width // 2
+    y_start = 20
+
+    if "pkt" in label['sku_suffix']:
+        if not desc_line3:  # only 2 description lines
+            dc.SelectObject(bold_12)
+            dc.TextOut(x_center - dc.GetTextExtent(variety_name)[0] // 2, y_start, variety_name)
+            y_start += 55
+
+            dc.TextOut(x_center - dc.GetTextExtent(variety_crop)[0] // 2, y_start, variety_crop)
+            y_start += 58
+
+            dc.SelectObject(italic_9)
+            dc.TextOut(x_center - dc.GetTextExtent(desc_line1)[0] // 2, y_start, desc_line1)
+            y_start += 43
+
+            dc.TextOut(x_center - dc.GetTextExtent(desc_line2)[0] // 2, y_start, desc_line2)
+            y_start += 50
+
+            dc.SelectObject(normal_8)
+            dc.TextOut(x_center - dc.GetTextExtent(pkg_lot_germ)[0] // 2, y_start, pkg_lot_germ)
+            y_start += 40
+
+            dc.TextOut(x_center - dc.GetTextExtent(days_year)[0] // 2, y_start, days_year)
+        else:  # 3 description lines
+            dc.SelectObject(bold_12)
+            dc.TextOut(x_center - dc.GetTextExtent(variety_name)[0] // 2, y_start, variety_crop)
+            y_start += 55
+
+            dc.SelectObject(italic_9)
+            dc.TextOut(x_center - dc.GetTextExtent(desc_line1)[0] // 2, y_start, desc_line1)
+            y_start += 43
+
+            dc.TextOut(x_center - dc.GetTextExtent(desc_line2)[0] // 2, y_start, desc_line2)
+            y_start += 43
+
+            dc.TextOut(x_center - dc.GetTextExtent(desc_line3)[0] // 2, y_start, desc_line3)
+            y_start += 50
+
+            dc.SelectObject(normal_8)
+            dc.TextOut(x_center - dc.GetTextExtent(pkg_lot_germ)[0] // 2, y_start, pkg_lot_germ)
+            y_start += 40
+
+            dc.TextOut(x_center - dc.GetTextExtent(days_year)[0] // 2, y_start, days_year)
+    else:
+        if not desc_line3:
+            if not rad_type:
+                dc.SelectObject(bold_14)
+                dc.TextOut(x_center - dc.GetTextExtent(variety_name)[0] // 2, y_start, variety_name)
+                y_start += 69
+
+                dc.SelectObject(normal_12)
+                dc.TextOut(x_center - dc.GetTextExtent(variety_crop)[0] // 2, y_start, variety_crop)
+                y_start += 54
+
+                dc.SelectObject(bold_12)
+                dc.TextOut(x_center - dc.GetTextExtent(pkg_size)[0] // 2, y_start, pkg_size)
+                y_start += 65
+
+                dc.SelectObject(normal_12)
+                dc.TextOut(x_center - dc.GetTextExtent(lot_germ)[0] // 2, y_start, lot_germ)
+                y_start += 48
+
+                dc.TextOut(x_center - dc.GetTextExtent(days_year)[0] // 2, y_start, days_year)
+            else:
+                pkg_days = f"{pkg_size} -- {label['days']}"
+                lot_germ_year = f"{lot_germ}    Packed for: {label['year']}"
+
+                dc.SelectObject(bold_14)
+                dc.TextOut(x_center - dc.GetTextExtent(variety_name)[0] // 2, y_start, variety_name)
+                y_start += 64
+
+                dc.SelectObject(italic_12)
+                dc.TextOut(x_center - dc.GetTextExtent(rad_type)[0] // 2, y_start, rad_type)
+                y_start += 55
+
+                dc.SelectObject(normal_12)
+                dc.TextOut(x_center - dc.GetTextExtent(variety_crop)[0] // 2, y_start, variety_crop)
+                y_start += 50
+
+                dc.SelectObject(bold_12)
+                dc.TextOut(x_center - dc.GetTextExtent(pkg_days)[0] // 2, y_start, pkg_days)
+                y_start += 60
+
+                dc.SelectObject(normal_12)
+                dc.TextOut(x_center - dc.GetTextExtent(lot_germ_year)[0] // 2, y_start, lot_germ_year)
+        else:
+            dc.SelectObject(bold_14)
+            dc.TextOut(x_center - dc.GetTextExtent(common_name)[0] // 2, y_start, common_name)
+            y_start += 80
+
+            dc.SelectObject(bold_12)
+            dc.TextOut(x_center - dc.GetTextExtent(pkg_size)[0] // 2, y_start, pkg_size)
+            y_start += 75
+
+            dc.SelectObject(normal_12)
+            dc.TextOut(x_center - dc.GetTextExtent(lot_germ)[0] // 2, y_start, lot_germ)
+            y_start += 60
+
+            dc.TextOut(x_center - dc.GetTextExtent(days_year)[0] // 2, y_start, days_year)
+
+
+@traced()
 def print_single_front_label_logic(data):
     """Extract the core front label printing logic"""
     try:
@@ -198,170 +1843,77 @@ def print_single_front_label_logic(data):
             print("================================")
             return {'success': True, 'message': f'Front Single Label printed successfully ({quantity} copies)'}
         else:
-            # Gather label content (shared across copies)
-            variety_name = format_variety_name_with_quotes(data.get('variety_name'))
-           
-            # Check for common_name first, fall back to crop if empty
-            common_name = data.get('common_name', '').strip()
-            variety_crop = common_name if common_name else data.get('crop')
-
-            days = data.get('days')
-            env_type = data.get('env_type')
-            year = data.get('for_year')
-            days_year = f"{days}    Packed for 20{year}"
-
-            desc_line1 = data.get('desc1')
-            desc_line2 = data.get('desc2')
-            desc_line3 = data.get('desc3')
-            lot_code = data.get('lot_code')
-            germination = data.get('germination')
-            rad_type = data.get('rad_type')
-
-            if env_type == "LG Coffee":
-                pkg_size = f"{data.get('pkg_size')} ••"
-            elif env_type == "SM Coffee":
-                pkg_size = f"{data.get('pkg_size')} •"
-            else:
-                pkg_size = data.get('pkg_size')
-
-            pkg_lot_germ = f"{pkg_size}    Lot: {lot_code}    Germ: {germination}%"
-            sku_suffix = data.get('sku_suffix')
-
-            # Fonts (reusable)
-            bold_12 = create_font("Times New Roman", 48, bold=True)
-            italic_9 = create_font("Times New Roman", 36, italic=True)
-            normal_8 = create_font("Times New Roman", 32)
-            bold_14 = create_font("Times New Roman", 54, bold=True)
-            normal_12 = create_font("Times New Roman", 40)
-            italic_12 = create_font("Times New Roman", 40, italic=True)
+            # Gather label content and fonts (shared across copies)
+            label = prepare_front_label(data)
+            fonts = FontCache()
 
             printer_name = ROLL_PRINTER
 
             # Loop through each copy
-            for i in range(quantity):
-                dc = win32ui.CreateDC()
-                dc.CreatePrinterDC(printer_name)
-
-                dc.StartDoc("Seed Label")
-                dc.StartPage()
-
-                # Label size
-                dpi = dc.GetDeviceCaps(88)
-                label_width = int(2.625 * dpi)
-                label_height = int(1.0 * dpi)
-                x_center = label_width // 2
-                y_start = 20
-
-                if "pkt" in sku_suffix:
-                    if not desc_line3:  # only 2 description lines
-                        dc.SelectObject(bold_12)
-                        dc.TextOut(x_center - dc.GetTextExtent(variety_name)[0] // 2, y_start, variety_name)
-                        y_start += 55
-
-                        dc.TextOut(x_center - dc.GetTextExtent(variety_crop)[0] // 2, y_start, variety_crop)
-                        y_start += 58
-
-                        dc.SelectObject(italic_9)
-                        dc.TextOut(x_center - dc.GetTextExtent(desc_line1)[0] // 2, y_start, desc_line1)
-                        y_start += 43
-
-                        dc.TextOut(x_center - dc.GetTextExtent(desc_line2)[0] // 2, y_start, desc_line2)
-                        y_start += 50
-
-                        dc.SelectObject(normal_8)
-                        dc.TextOut(x_center - dc.GetTextExtent(pkg_lot_germ)[0] // 2, y_start, pkg_lot_germ)
-                        y_start += 40
+            with printer_lock(printer_name):
+                for i in range(quantity):
+                    start = time.perf_counter()
+                    dc = open_printer_dc(printer_name)
+
+                    dc.StartDoc("Seed Label")
+                    dc.StartPage()
+                    draw_cached_label(dc, fonts, 'front', label, draw_front_label)
+                    dc.EndPage()
+                    dc.EndDoc()
+                    dc.DeleteDC()
+                    record_print_cost('roll_label', 1, time.perf_counter() - start)
+                    printer_checkpoint(printer_name)
 
-                        dc.TextOut(x_center - dc.GetTextExtent(days_year)[0] // 2, y_start, days_year)
-                    else:  # 3 description lines
-                        dc.SelectObject(bold_12)
-                        dc.TextOut(x_center - dc.GetTextExtent(variety_name)[0] // 2, y_start, variety_crop)
-                        y_start += 55
-
-                        dc.SelectObject(italic_9)
-                        dc.TextOut(x_center - dc.GetTextExtent(desc_line1)[0] // 2, y_start, desc_line1)
-                        y_start += 43
-
-                        dc.TextOut(x_center - dc.GetTextExtent(desc_line2)[0] // 2, y_start, desc_line2)
-                        y_start += 43
+            return {'success': True, 'message': f'Front Single Label printed successfully ({quantity} copies)'}
 
-                        dc.TextOut(x_center - dc.GetTextExtent(desc_line3)[0] // 2, y_start, desc_line3)
-                        y_start += 50
+    except JobCancelled:
+        raise
+    except Exception as e:
+        print(f"Error printing front label: {str(e)}")
+        return {'success': False, 'error': str(e)}
 
-                        dc.SelectObject(normal_8)
-                        dc.TextOut(x_center - dc.GetTextExtent(pkg_lot_germ)[0] // 2, y_start, pkg_lot_germ)
-                        y_start += 40
 
-                        dc.TextOut(x_center - dc.GetTextExtent(days_year)[0] // 2, y_start, days_year)
-                else:
-                    lot_germ = f"Lot: {lot_code}    Germ: {germination}%"
-                    if not desc_line3:
-                        if not rad_type:
-                            dc.SelectObject(bold_14)
-                            dc.TextOut(x_center - dc.GetTextExtent(variety_name)[0] // 2, y_start, variety_name)
-                            y_start += 69
-
-                            dc.SelectObject(normal_12)
-                            dc.TextOut(x_center - dc.GetTextExtent(variety_crop)[0] // 2, y_start, variety_crop)
-                            y_start += 54
-
-                            dc.SelectObject(bold_12)
-                            dc.TextOut(x_center - dc.GetTextExtent(pkg_size)[0] // 2, y_start, pkg_size)
-                            y_start += 65
-
-                            dc.SelectObject(normal_12)
-                            dc.TextOut(x_center - dc.GetTextExtent(lot_germ)[0] // 2, y_start, lot_germ)
-                            y_start += 48
-
-                            dc.TextOut(x_center - dc.GetTextExtent(days_year)[0] // 2, y_start, days_year)
-                        else:
-                            pkg_days = f"{pkg_size} -- {days}"
-                            lot_germ_year = f"Lot: {lot_code}    Germ: {germination}%    Packed for: {year}"
-
-                            dc.SelectObject(bold_14)
-                            dc.TextOut(x_center - dc.GetTextExtent(variety_name)[0] // 2, y_start, variety_name)
-                            y_start += 64
-
-                            dc.SelectObject(italic_12)
-                            dc.TextOut(x_center - dc.GetTextExtent(rad_type)[0] // 2, y_start, rad_type)
-                            y_start += 55
-
-                            dc.SelectObject(normal_12)
-                            dc.TextOut(x_center - dc.GetTextExtent(variety_crop)[0] // 2, y_start, variety_crop)
-                            y_start += 50
-
-                            dc.SelectObject(bold_12)
-                            dc.TextOut(x_center - dc.GetTextExtent(pkg_days)[0] // 2, y_start, pkg_days)
-                            y_start += 60
-
-                            dc.SelectObject(normal_12)
-                            dc.TextOut(x_center - dc.GetTextExtent(lot_germ_year)[0] // 2, y_start, lot_germ_year)
-                    else:
-                        dc.SelectObject(bold_14)
-                        dc.TextOut(x_center - dc.GetTextExtent(common_name)[0] // 2, y_start, common_name)
-                        y_start += 80
+def back_label_lines(data):
+    """The non-empty back1..back7 lines of a back label"""
+    back_lines = [
+        data.get('back1'),
+        data.get('back2'),
+        data.get('back3'),
+        data.get('back4'),
+        data.get('back5'),
+        data.get('back6'),
+        data.get('back7')
+    ]
 
-                        dc.SelectObject(bold_12)
-                        dc.TextOut(x_center - dc.GetTextExtent(pkg_size)[0] // 2, y_start, pkg_size)
-                        y_start += 75
+    # Remove empty lines (None or "")
+    return [line for line in back_lines if line]
 
-                        dc.SelectObject(normal_12)
-                        dc.TextOut(x_center - dc.GetTextExtent(lot_germ)[0] // 2, y_start, lot_germ)
-                        y_start += 60
 
-                        dc.TextOut(x_center - dc.GetTextExtent(days_year)[0] // 2, y_start, days_year)
+def draw_back_label(dc, fonts, back_lines):
+    """Draw a back label onto the current page of a roll printer DC"""
+    # Label size: 1" x 2.625" at 300 DPI
+    dpi = dc.GetDeviceCaps(88)
+    print(f"[DEBUG] Printer DPI: {dpi}")
+    label_width = int(2.625 * dpi)
+    label_height = int(1.0 * dpi)
+    x_center = label_width // 2
 
-                dc.EndPage()
-                dc.EndDoc()
-                dc.DeleteDC()
+    dc.SelectObject(fonts("Book Antiqua", 32, italic=True))
 
-            return {'success': True, 'message': f'Front Single Label printed successfully ({quantity} copies)'}
+    # Spacing logic
+    num_lines = len(back_lines)
+    line_height = 39
+    total_text_height = line_height * num_lines
+    remaining_space = label_height - total_text_height
+    y_start = (remaining_space // 2) + 12
 
-    except Exception as e:
-        print(f"Error printing front label: {str(e)}")
-        return {'success': False, 'error': str(e)}
+    for line in back_lines:
+        text_width = dc.GetTextExtent(line)[0]
+        dc.TextOut(x_center - text_width // 2, y_start, line)
+        y_start += line_height
 
 
+@traced()
 def print_single_back_label_logic(data):
     """Extract the core back label printing logic"""
     try:
@@ -380,60 +1932,33 @@ def print_single_back_label_logic(data):
             print(f"Back7 {data.get('back7')}")
             return {'success': True, 'message': f'Back Single Label printed successfully ({quantity} copies)'}
         else:
-            back_lines = [
-                data.get('back1'),
-                data.get('back2'),
-                data.get('back3'),
-                data.get('back4'),
-                data.get('back5'),
-                data.get('back6'),
-                data.get('back7')
-            ]
-
-            # Remove empty lines (None or "")
-            back_lines = [line for line in back_lines if line]
+            back_lines = back_label_lines(data)
 
             if not back_lines:
                 return {'success': False, 'message': 'No back lines provided'}
 
             # Printer setup
             printer_name = ROLL_PRINTER
-            font = create_font("Book Antiqua", 32, italic=True)
-
-            for i in range(quantity):
-                dc = win32ui.CreateDC()
-                dc.CreatePrinterDC(printer_name)
-
-                dc.StartDoc("Seed Label")
-                dc.StartPage()
-
-                # Label size: 1" x 2.625" at 300 DPI
-                dpi = dc.GetDeviceCaps(88)
-                print(f"[DEBUG] Printer DPI: {dpi}")
-                label_width = int(2.625 * dpi)
-                label_height = int(1.0 * dpi)
-                x_center = label_width // 2
-
-                dc.SelectObject(font)
-
-                # Spacing logic
-                num_lines = len(back_lines)
-                line_height = 39
-                total_text_height = line_height * num_lines
-                remaining_space = label_height - total_text_height
-                y_start = (remaining_space // 2) + 12
-
-                for line in back_lines:
-                    text_width = dc.GetTextExtent(line)[0]
-                    dc.TextOut(x_center - text_width // 2, y_start, line)
-                    y_start += line_height
-
-                dc.EndPage()
-                dc.EndDoc()
-                dc.DeleteDC()
+            fonts = FontCache()
+
+            with printer_lock(printer_name):
+                for i in range(quantity):
+                    start = time.perf_counter()
+                    dc = open_printer_dc(printer_name)
+
+                    dc.StartDoc("Seed Label")
+                    dc.StartPage()
+                    draw_cached_label(dc, fonts, 'back', back_lines, draw_back_label)
+                    dc.EndPage()
+                    dc.EndDoc()
+                    dc.DeleteDC()
+                    record_print_cost('roll_label', 1, time.perf_counter() - start)
+                    printer_checkpoint(printer_name)
 
             return {'success': True, 'message': f'Back Single Label printed successfully ({quantity} copies)'}
 
+    except JobCancelled:
+        raise
     except Exception as e:
         print(f"Error printing back label: {str(e)}")
         return {'success': False, 'error': str(e)}
@@ -443,8 +1968,13 @@ def print_single_back_label_logic(data):
 def print_single_front_label():
     """Route handler for single front label printing"""
     try:
-        data = request.get_json()
-        result = print_single_front_label_logic(data)
+        data, errors = VALIDATORS['front_label'](request.get_json(silent=True))
+        if errors:
+            return validation_failed(errors)
+        if COALESCE_WINDOW_SECONDS > 0 and current_dry_run() is None:
+            result = LABEL_COALESCER.submit('front', data)
+        else:
+            result = print_single_front_label_logic(data)
         
         if result['success']:
             return jsonify(result)
@@ -463,8 +1993,13 @@ def print_single_front_label():
 def print_single_back_label():
     """Route handler for single back label printing"""
     try:
-        data = request.get_json()
-        result = print_single_back_label_logic(data)
+        data, errors = VALIDATORS['back_label'](request.get_json(silent=True))
+        if errors:
+            return validation_failed(errors)
+        if COALESCE_WINDOW_SECONDS > 0 and current_dry_run() is None:
+            result = LABEL_COALESCER.submit('back', data)
+        else:
+            result = print_single_back_label_logic(data)
         
         if result['success']:
             return jsonify(result)
@@ -479,241 +2014,344 @@ def print_single_back_label():
         }), 500
 
 
-def print_sheet_front_logic(data):
-    """Extract the core front sheet printing logic"""
-    try:
-        quantity = int(data.get('quantity', 1))
-        env_multiplier = int(data.get('env_multiplier', 1))
-        print(f"Environmental Multiplier: {env_multiplier}")
-        quantity *= env_multiplier
+def sheet_front_cells(dc):
+    """(x_center, y_start) of the 30 front label cells on a sheet, row by row"""
+    # Get printer DPI and calculate sheet dimensions
+    dpi = dc.GetDeviceCaps(88)
+    page_width = dc.GetDeviceCaps(8)
+
+    # To adjust the starting postition of the first row, change the dpi multiplier below
+    # Increasing the multiplier moves the labels down, decreasing moves them up
+    margin_y = int(0.41 * dpi)  # 0.5 inch top margin
+
+    label_width = page_width // 3
+
+    # 12/11/25 changes
+    # label_height = (page_height - margin_y) // 10 - 6
+    label_height = int(1.00 * dpi)  # Exactly 1 inch per label (Avery 5960 spec)
+
+    # Column adjustments for better alignment
+    left_col_offset = -30
+    middle_col_offset = 0
+    right_col_offset = 30
+
+    col_offsets = [left_col_offset, middle_col_offset, right_col_offset]
+
+    # Row-specific adjustments to compensate for printer scaling
+    row_adjustments = [0, 10, 20, 20, 30, 30, 30, 30, 30, 30]  # Adjust these values
+
+    cells = []
+    for row in range(SHEET_ROWS):
+        y_base = margin_y + (row * label_height) + row_adjustments[row]
+
+        for col in range(SHEET_COLS):
+            x_center = (col * label_width) + (label_width // 2) + col_offsets[col]
+            cells.append((x_center, y_base - 15))
+    return cells
+
+
+def draw_sheet_front_label(dc, fonts, label, x_center, y_start):
+    """Draw one front label cell of a sheet (fonts doubled for 600 DPI vs 300 DPI)"""
+    bold_12 = fonts("Times New Roman", 96, bold=True)     # 48 * 2
+    italic_9 = fonts("Times New Roman", 72, italic=True)  # 36 * 2
+    normal_8 = fonts("Times New Roman", 64)              # 32 * 2
+    bold_16 = fonts("Times New Roman", 120, bold=True)   # 60 * 2
+    normal_12 = fonts("Times New Roman", 80)            # 40 * 2
+    italic_12 = fonts("Times New Roman", 80, italic=True) # 40 * 2
+
+    variety_name = label['variety_name']
+    variety_crop = label['variety_crop']
+    desc_line1 = label['desc_line1']
+    desc_line2 = label['desc_line2']
+    desc_line3 = label['desc_line3']
+    pkg_size = label['pkg_size']
+    pkg_lot_germ = label['pkg_lot_germ']
+    lot_germ = label['lot_germ']
+    days_year = label['days_year']
+    rad_type = label['rad_type']
+
+    # Use same conditional logic as single front label
+    if "pkt" in label['sku_suffix']:
+        if not desc_line3:  # only 2 description lines
+            dc.SelectObject(bold_12)
+            dc.TextOut(x_center - dc.GetTextExtent(variety_name)[0] // 2, y_start, variety_name)
+            y_start += 110  # was 55
+
+            dc.TextOut(x_center - dc.GetTextExtent(variety_crop)[0] // 2, y_start, variety_crop)
+            y_start += 116  # was 58
+
+            dc.SelectObject(italic_9)
+            dc.TextOut(x_center - dc.GetTextExtent(desc_line1)[0] // 2, y_start, desc_line1)
+            y_start += 86  # was 43
+
+            dc.TextOut(x_center - dc.GetTextExtent(desc_line2)[0] // 2, y_start, desc_line2)
+            y_start += 100  # was 50
+
+            dc.SelectObject(normal_8)
+            dc.TextOut(x_center - dc.GetTextExtent(pkg_lot_germ)[0] // 2, y_start, pkg_lot_germ)
+            y_start += 80  # was 40
+
+            dc.TextOut(x_center - dc.GetTextExtent(days_year)[0] // 2, y_start, days_year)
+        else:  # 3 description lines
+            y_start += 10  # small adjustment for extra line
+            dc.SelectObject(bold_12)
+            dc.TextOut(x_center - dc.GetTextExtent(variety_crop)[0] // 2, y_start, variety_crop)
+            y_start += 110  # was 55
+
+            dc.SelectObject(italic_9)
+            dc.TextOut(x_center - dc.GetTextExtent(desc_line1)[0] // 2, y_start, desc_line1)
+            y_start += 86  # was 43
+
+            dc.TextOut(x_center - dc.GetTextExtent(desc_line2)[0] // 2, y_start, desc_line2)
+            y_start += 86  # was 43
+
+            dc.TextOut(x_center - dc.GetTextExtent(desc_line3)[0] // 2, y_start, desc_line3)
+            y_start += 100  # was 50
+
+            dc.SelectObject(normal_8)
+            dc.TextOut(x_center - dc.GetTextExtent(pkg_lot_germ)[0] // 2, y_start, pkg_lot_germ)
+            y_start += 80  # was 40
+
+            dc.TextOut(x_center - dc.GetTextExtent(days_year)[0] // 2, y_start, days_year)
+    else:
+        if not desc_line3:
+            if not rad_type:
+                dc.SelectObject(bold_16)
+                dc.TextOut(x_center - dc.GetTextExtent(variety_name)[0] // 2, y_start, variety_name)
+                y_start += 138  # was 69
 
-        if CURRENT_USER.lower() == "ndefe":
-            print(f"Printing {quantity} front sheet labels on Ndefe's printer")
-            print(f"Variety Name: {data.get('variety_name')}")
-            print(f"Crop: {data.get('crop')}")
-            print(f"Days: {data.get('days')}")
-            print(f"SKU Suffix: {data.get('sku_suffix')}")
-            print(f"Common name: {data.get('common_name')}")
-            print(f"Pkg. size: {data.get('pkg_size')}")
-            print(f"Env type: {data.get('env_type')}")
-            print(f"Lot Code: {data.get('lot_code')}")
-            print(f"Germination: {data.get('germination')}")
-            print(f"For Year: {data.get('for_year')}")
-            print(f"Quantity: {data.get('quantity')}")
-            print(f"Desc1: {data.get('desc1')}")
+                dc.SelectObject(normal_12)
+                dc.TextOut(x_center - dc.GetTextExtent(variety_crop)[0] // 2, y_start, variety_crop)
+                y_start += 108  # was 54
+
+                dc.SelectObject(bold_12)
+                dc.TextOut(x_center - dc.GetTextExtent(pkg_size)[0] // 2, y_start, pkg_size)
+                y_start += 130  # was 65
+
+                dc.SelectObject(normal_12)
+                dc.TextOut(x_center - dc.GetTextExtent(lot_germ)[0] // 2, y_start, lot_germ)
+                y_start += 96  # was 48
+
+                dc.TextOut(x_center - dc.GetTextExtent(days_year)[0] // 2, y_start, days_year)
+            else:
+                pkg_days = f"{pkg_size} -- {label['days']}"
+                lot_germ_year = f"{lot_germ}    Packed for: {label['year']}"
+
+                dc.SelectObject(bold_16)
+                dc.TextOut(x_center - dc.GetTextExtent(variety_name)[0] // 2, y_start, variety_name)
+                y_start += 128  # was 64
+
+                dc.SelectObject(italic_12)
+                dc.TextOut(x_center - dc.GetTextExtent(rad_type)[0] // 2, y_start, rad_type)
+                y_start += 110  # was 55
+
+                dc.SelectObject(normal_12)
+                dc.TextOut(x_center - dc.GetTextExtent(variety_crop)[0] // 2, y_start, variety_crop)
+                y_start += 100  # was 50
+
+                dc.SelectObject(bold_12)
+                dc.TextOut(x_center - dc.GetTextExtent(pkg_days)[0] // 2, y_start, pkg_days)
+                y_start += 120  # was 60
+
+                dc.SelectObject(normal_12)
+                dc.TextOut(x_center - dc.GetTextExtent(lot_germ_year)[0] // 2, y_start, lot_germ_year)
+        else:
+            dc.SelectObject(bold_16)
+            dc.TextOut(x_center - dc.GetTextExtent(variety_crop)[0] // 2, y_start, variety_crop)
+            y_start += 160  # was 80
+
+            dc.SelectObject(bold_12)
+            dc.TextOut(x_center - dc.GetTextExtent(pkg_size)[0] // 2, y_start, pkg_size)
+            y_start += 150  # was 75
+
+            dc.SelectObject(normal_12)
+            dc.TextOut(x_center - dc.GetTextExtent(lot_germ)[0] // 2, y_start, lot_germ)
+            y_start += 120  # was 60
+
+            dc.TextOut(x_center - dc.GetTextExtent(days_year)[0] // 2, y_start, days_year)
+
+
+def draw_sheet_front_footer(dc, fonts, text):
+    """Draw the envelope note at the bottom of a front sheet"""
+    dpi = dc.GetDeviceCaps(88)
+    page_height = dc.GetDeviceCaps(10)
+    dc.SelectObject(fonts("Times New Roman", 96, bold=True))  # Doubled from 48
+    envelope_x = int(0.5 * dpi)
+    envelope_y = page_height - int(0.2 * dpi)
+    dc.TextOut(envelope_x, envelope_y, text)
+
+
+def draw_sheet_front_page(dc, fonts, label):
+    """Draw a full sheet of 30 identical front labels plus the envelope footer"""
+    for x_center, y_start in sheet_front_cells(dc):
+        draw_sheet_front_label(dc, fonts, label, x_center, y_start)
+
+    # Add envelope info at bottom of sheet
+    draw_sheet_front_footer(dc, fonts, f"Envelope: {label['env_type']}")
+
+
+def partial_sheet_request(data, quantity):
+    """
+    (first cell 0-based, label count) when a sheet request names start_cell
+    or count, else None for the usual full sheets. Without count, the labels
+    still finish on quantity sheets, only the first one starts at start_cell.
+    """
+    start_cell = data.get('start_cell') or 1
+    count = data.get('count')
+    if start_cell == 1 and not count:
+        return None
+    if not count:
+        count = quantity * SHEET_ROWS * SHEET_COLS - (start_cell - 1)
+    return start_cell - 1, count
+
+
+@traced()
+def print_sheet_front_logic(data):
+    """
+    Extract the core front sheet printing logic
+
+    Prints quantity full sheets, or with start_cell / count set, count labels
+    from cell start_cell (1-based) of a part-used sheet onward.
+    """
+    try:
+        quantity = int(data.get('quantity', 1))
+        env_multiplier = int(data.get('env_multiplier', 1))
+        print(f"Environmental Multiplier: {env_multiplier}")
+        quantity *= env_multiplier
+
+        partial = partial_sheet_request(data, quantity)
+        if partial:
+            return print_sheet_pack_logic('front', [(data, partial[1])], partial[0])
+
+        if CURRENT_USER.lower() == "ndefe":
+            print(f"Printing {quantity} front sheet labels on Ndefe's printer")
+            print(f"Variety Name: {data.get('variety_name')}")
+            print(f"Crop: {data.get('crop')}")
+            print(f"Days: {data.get('days')}")
+            print(f"SKU Suffix: {data.get('sku_suffix')}")
+            print(f"Common name: {data.get('common_name')}")
+            print(f"Pkg. size: {data.get('pkg_size')}")
+            print(f"Env type: {data.get('env_type')}")
+            print(f"Lot Code: {data.get('lot_code')}")
+            print(f"Germination: {data.get('germination')}")
+            print(f"For Year: {data.get('for_year')}")
+            print(f"Quantity: {data.get('quantity')}")
+            print(f"Desc1: {data.get('desc1')}")
             print(f"Desc2: {data.get('desc2')}")
             print(f"Desc3: {data.get('desc3')}")
             print(f"Rad type: {data.get('rad_type')}")
             print("================================")
             return {'success': True, 'message': f'Front Sheet Label printed successfully ({quantity} copies)'}
         else:
-            
-            variety_name = format_variety_name_with_quotes(data.get('variety_name'))
-            
-            # Check for common_name first, fall back to crop if empty
-            common_name = data.get('common_name', '').strip()
-            variety_crop = common_name if common_name else data.get('crop')
-            
-            days = data.get('days')
-            env_type = data.get('env_type')
-            year = data.get('for_year')
-            days_year = f"{days}    Packed for 20{year}"
-
-            desc_line1 = data.get('desc1')
-            desc_line2 = data.get('desc2')
-            desc_line3 = data.get('desc3')
-            lot_code = data.get('lot_code')
-            germination = data.get('germination')
-            rad_type = data.get('rad_type')
-
-            if env_type == "LG Coffee":
-                pkg_size = f"{data.get('pkg_size')} ••"
-            elif env_type == "SM Coffee":
-                pkg_size = f"{data.get('pkg_size')} •"
-            else:
-                pkg_size = data.get('pkg_size')
-
-            pkg_lot_germ = f"{pkg_size}    Lot: {lot_code}    Germ: {germination}%"
-            sku_suffix = data.get('sku_suffix')
-
-            # Fonts (doubled for 600 DPI vs 300 DPI)
-            bold_12 = create_font("Times New Roman", 96, bold=True)     # 48 * 2
-            italic_9 = create_font("Times New Roman", 72, italic=True)  # 36 * 2
-            normal_8 = create_font("Times New Roman", 64)              # 32 * 2
-            bold_16 = create_font("Times New Roman", 120, bold=True)   # 60 * 2
-            normal_12 = create_font("Times New Roman", 80)            # 40 * 2
-            italic_12 = create_font("Times New Roman", 80, italic=True) # 40 * 2
+            label = prepare_front_label(data)
+            fonts = FontCache()
 
             printer_name = SHEET_PRINTER
 
             # Loop through each copy (same as single label approach)
-            for i in range(quantity):
-                dc = win32ui.CreateDC()
-                dc.CreatePrinterDC(printer_name)
+            with printer_lock(printer_name):
+                for i in range(quantity):
+                    start = time.perf_counter()
+                    dc = open_printer_dc(printer_name)
+
+                    dc.StartDoc("Seed Label Sheet")
+                    dc.StartPage()
+                    draw_sheet_front_page(dc, fonts, label)
+                    dc.EndPage()
+                    dc.EndDoc()
+                    dc.DeleteDC()
+                    record_print_cost('sheet', 1, time.perf_counter() - start)
+                    printer_checkpoint(printer_name)
 
-                dc.StartDoc("Seed Label Sheet")
-                dc.StartPage()
+            return {'success': True, 'message': f'Front Sheet Label printed successfully ({quantity} copies)'}
 
-                # Get printer DPI and calculate sheet dimensions
-                dpi = dc.GetDeviceCaps(88)
-                page_width = dc.GetDeviceCaps(8)
-                page_height = dc.GetDeviceCaps(10)
-                
+    except JobCancelled:
+        raise
+    except Exception as e:
+        print(f"Error printing front sheet: {str(e)}")
+        return {'success': False, 'error': str(e)}
+
+
+def sheet_back_cells(dc):
+    """(x_center, y_base, label_height) of the 30 back label cells on a sheet, row by row"""
+    # Get printer DPI and calculate sheet dimensions
+    dpi = dc.GetDeviceCaps(88)
+    page_width = dc.GetDeviceCaps(8)
+    page_height = dc.GetDeviceCaps(10)
+
+    # Sheet layout: 3 columns x 10 rows = 30 labels
+    margin_y = int(0.5 * dpi)
+    label_width = page_width // 3
+    label_height = (page_height - margin_y) // 10 - 7
+
+    # Column adjustments for better alignment
+    left_col_offset = -35
+    middle_col_offset = 0
+    right_col_offset = 35
+    col_offsets = [left_col_offset, middle_col_offset, right_col_offset]
+
+    cells = []
+    for row in range(SHEET_ROWS):
+        y_base = margin_y + (row * label_height)
+
+        for col in range(SHEET_COLS):
+            x_center = (col * label_width) + (label_width // 2) + col_offsets[col]
+            cells.append((x_center, y_base, label_height))
+    return cells
+
+
+def draw_sheet_back_label(dc, fonts, back_lines, x_center, y_base, label_height):
+    """Draw one back label cell of a sheet"""
+    dc.SelectObject(fonts("Book Antiqua", 66, italic=True))
+
+    # Spacing logic (same as single back label)
+    num_lines = len(back_lines)
+    # if back line 7 is not present, increase line height to spread out
+    if len(back_lines) < 7:
+        line_height = 90
+    else:
+        line_height = 80  # Exact same as single back label
+    total_text_height = line_height * num_lines
 
+    # Calculate y_start (same logic as single back label)
+    remaining_space = label_height - total_text_height
+    y_start = y_base + (remaining_space // 2) - 80
 
+    # Draw each back line (same as single back label)
+    for line in back_lines:
+        text_width = dc.GetTextExtent(line)[0]
+        dc.TextOut(x_center - text_width // 2, y_start, line)
+        y_start += line_height
 
-                # To adjust the starting postition of the first row, change the dpi multiplier below
-                # Increasing the multiplier moves the labels down, decreasing moves them up
-                margin_y = int(0.41 * dpi)  # 0.5 inch top margin
-                
-                
-                
-                label_width = page_width // 3
-
-                # 12/11/25 changes
-                # label_height = (page_height - margin_y) // 10 - 6
-                label_height = int(1.00 * dpi)  # Exactly 1 inch per label (Avery 5960 spec)
-
-                # Column adjustments for better alignment
-                left_col_offset = -30
-                middle_col_offset = 0
-                right_col_offset = 30
-
-                col_offsets = [left_col_offset, middle_col_offset, right_col_offset]
-
-                # Row-specific adjustments to compensate for printer scaling
-                row_adjustments = [0, 10, 20, 20, 30, 30, 30, 30, 30, 30]  # Adjust these values
-
-                for row in range(10):
-                    y_base = margin_y + (row * label_height) + row_adjustments[row]
-                    
-                    for col in range(3):
-                        x_center = (col * label_width) + (label_width // 2) + col_offsets[col]
-                        y_start = y_base - 15
-                        
-                        # Use same conditional logic as single front label
-                        if "pkt" in sku_suffix:
-                            if not desc_line3:  # only 2 description lines
-                                dc.SelectObject(bold_12)
-                                dc.TextOut(x_center - dc.GetTextExtent(variety_name)[0] // 2, y_start, variety_name)
-                                y_start += 110  # was 55
-
-                                dc.TextOut(x_center - dc.GetTextExtent(variety_crop)[0] // 2, y_start, variety_crop)
-                                y_start += 116  # was 58
-
-                                dc.SelectObject(italic_9)
-                                dc.TextOut(x_center - dc.GetTextExtent(desc_line1)[0] // 2, y_start, desc_line1)
-                                y_start += 86  # was 43
-
-                                dc.TextOut(x_center - dc.GetTextExtent(desc_line2)[0] // 2, y_start, desc_line2)
-                                y_start += 100  # was 50
-
-                                dc.SelectObject(normal_8)
-                                dc.TextOut(x_center - dc.GetTextExtent(pkg_lot_germ)[0] // 2, y_start, pkg_lot_germ)
-                                y_start += 80  # was 40
-
-                                dc.TextOut(x_center - dc.GetTextExtent(days_year)[0] // 2, y_start, days_year)
-                            else:  # 3 description lines
-                                y_start += 10  # small adjustment for extra line
-                                dc.SelectObject(bold_12)
-                                dc.TextOut(x_center - dc.GetTextExtent(variety_crop)[0] // 2, y_start, variety_crop)
-                                y_start += 110  # was 55
-
-                                dc.SelectObject(italic_9)
-                                dc.TextOut(x_center - dc.GetTextExtent(desc_line1)[0] // 2, y_start, desc_line1)
-                                y_start += 86  # was 43
-
-                                dc.TextOut(x_center - dc.GetTextExtent(desc_line2)[0] // 2, y_start, desc_line2)
-                                y_start += 86  # was 43
-
-                                dc.TextOut(x_center - dc.GetTextExtent(desc_line3)[0] // 2, y_start, desc_line3)
-                                y_start += 100  # was 50
-
-                                dc.SelectObject(normal_8)
-                                dc.TextOut(x_center - dc.GetTextExtent(pkg_lot_germ)[0] // 2, y_start, pkg_lot_germ)
-                                y_start += 80  # was 40
-
-                                dc.TextOut(x_center - dc.GetTextExtent(days_year)[0] // 2, y_start, days_year)
-                        else:
-                            lot_germ = f"Lot: {lot_code}    Germ: {germination}%"
-                            if not desc_line3:
-                                if not rad_type:
-                                    dc.SelectObject(bold_16)
-                                    dc.TextOut(x_center - dc.GetTextExtent(variety_name)[0] // 2, y_start, variety_name)
-                                    y_start += 138  # was 69
-
-                                    dc.SelectObject(normal_12)
-                                    dc.TextOut(x_center - dc.GetTextExtent(variety_crop)[0] // 2, y_start, variety_crop)
-                                    y_start += 108  # was 54
-
-                                    dc.SelectObject(bold_12)
-                                    dc.TextOut(x_center - dc.GetTextExtent(pkg_size)[0] // 2, y_start, pkg_size)
-                                    y_start += 130  # was 65
-
-                                    dc.SelectObject(normal_12)
-                                    dc.TextOut(x_center - dc.GetTextExtent(lot_germ)[0] // 2, y_start, lot_germ)
-                                    y_start += 96  # was 48
-
-                                    dc.TextOut(x_center - dc.GetTextExtent(days_year)[0] // 2, y_start, days_year)
-                                else:
-                                    pkg_days = f"{pkg_size} -- {days}"
-                                    lot_germ_year = f"Lot: {lot_code}    Germ: {germination}%    Packed for: {year}"
-
-                                    dc.SelectObject(bold_16)
-                                    dc.TextOut(x_center - dc.GetTextExtent(variety_name)[0] // 2, y_start, variety_name)
-                                    y_start += 128  # was 64
-
-                                    dc.SelectObject(italic_12)
-                                    dc.TextOut(x_center - dc.GetTextExtent(rad_type)[0] // 2, y_start, rad_type)
-                                    y_start += 110  # was 55
-
-                                    dc.SelectObject(normal_12)
-                                    dc.TextOut(x_center - dc.GetTextExtent(variety_crop)[0] // 2, y_start, variety_crop)
-                                    y_start += 100  # was 50
-
-                                    dc.SelectObject(bold_12)
-                                    dc.TextOut(x_center - dc.GetTextExtent(pkg_days)[0] // 2, y_start, pkg_days)
-                                    y_start += 120  # was 60
-
-                                    dc.SelectObject(normal_12)
-                                    dc.TextOut(x_center - dc.GetTextExtent(lot_germ_year)[0] // 2, y_start, lot_germ_year)
-                            else:
-                                dc.SelectObject(bold_16)
-                                dc.TextOut(x_center - dc.GetTextExtent(variety_crop)[0] // 2, y_start, variety_crop)
-                                y_start += 160  # was 80
-
-                                dc.SelectObject(bold_12)
-                                dc.TextOut(x_center - dc.GetTextExtent(pkg_size)[0] // 2, y_start, pkg_size)
-                                y_start += 150  # was 75
-
-                                dc.SelectObject(normal_12)
-                                dc.TextOut(x_center - dc.GetTextExtent(lot_germ)[0] // 2, y_start, lot_germ)
-                                y_start += 120  # was 60
-
-                                dc.TextOut(x_center - dc.GetTextExtent(days_year)[0] // 2, y_start, days_year)
-
-                # Add envelope info at bottom of sheet
-                
-                envelope = f"Envelope: {env_type}"
-                envelope_font = create_font("Times New Roman", 96, bold=True)  # Doubled from 48
-                dc.SelectObject(envelope_font)
-                envelope_x = int(0.5 * dpi)
-                envelope_y = page_height - int(0.2 * dpi)
-                dc.TextOut(envelope_x, envelope_y, envelope)
 
-                dc.EndPage()
-                dc.EndDoc()
-                dc.DeleteDC()
+def draw_sheet_back_footer(dc, fonts, text):
+    """Draw the variety note at the bottom of a back sheet"""
+    dpi = dc.GetDeviceCaps(88)
+    page_height = dc.GetDeviceCaps(10)
+    dc.SelectObject(fonts("Calibri", 80))
+    footer_x = int(0.5 * dpi)
+    footer_y = page_height - int(0.2 * dpi)
+    dc.TextOut(footer_x, footer_y, text)
 
-            return {'success': True, 'message': f'Front Sheet Label printed successfully ({quantity} copies)'}
 
-    except Exception as e:
-        print(f"Error printing front sheet: {str(e)}")
-        return {'success': False, 'error': str(e)}
+def draw_sheet_back_page(dc, fonts, back_lines, variety_name):
+    """Draw a full sheet of 30 identical back labels plus the variety footer"""
+    # Draw 30 labels (3 columns x 10 rows)
+    for x_center, y_base, label_height in sheet_back_cells(dc):
+        draw_sheet_back_label(dc, fonts, back_lines, x_center, y_base, label_height)
 
+    # Footer with variety name
+    draw_sheet_back_footer(dc, fonts, f"Variety: {variety_name}")
 
+
+@traced()
 def print_sheet_back_logic(data):
-    """Extract the core back sheet printing logic"""
+    """
+    Extract the core back sheet printing logic
+
+    Prints quantity full sheets, or with start_cell / count set, count labels
+    from cell start_cell (1-based) of a part-used sheet onward.
+    """
     try:
         quantity = int(data.get('quantity', 1))
         env_multiplier = int(data.get('env_multiplier', 1))
@@ -721,6 +2359,10 @@ def print_sheet_back_logic(data):
         quantity *= env_multiplier
         variety_name = f"'{data.get('variety_name')}'"
 
+        partial = partial_sheet_request(data, quantity)
+        if partial:
+            return print_sheet_pack_logic('back', [(data, partial[1])], partial[0])
+
         if CURRENT_USER.lower() == "ndefe":
             print(f"Printing {quantity} back sheet labels for {variety_name} on Ndefe's printer")
             print(f"Back1 {data.get('back1')}")
@@ -734,94 +2376,34 @@ def print_sheet_back_logic(data):
             return {'success': True, 'message': f'Back Sheet Label printed successfully ({quantity} copies)'}
         else:
             # Gather back label content (same as single back label logic)
-            back_lines = [
-                data.get('back1'),
-                data.get('back2'),
-                data.get('back3'),
-                data.get('back4'),
-                data.get('back5'),
-                data.get('back6'),
-                data.get('back7')
-            ]
-            
-            # Remove empty lines (same as single back label)
-            back_lines = [line for line in back_lines if line]
-            
+            back_lines = back_label_lines(data)
+
             if not back_lines:
                 return {'success': False, 'message': 'No back lines provided'}
 
-            # Font (same as single back label)
-            font = create_font("Book Antiqua", 66, italic=True)
-            footer_font = create_font("Calibri", 80)
+            fonts = FontCache()
 
             printer_name = SHEET_PRINTER
 
             # Loop through each copy (same as single label approach)
-            for i in range(quantity):
-                dc = win32ui.CreateDC()
-                dc.CreatePrinterDC(printer_name)
-
-                dc.StartDoc("Seed Label Back Sheet")
-                dc.StartPage()
-
-                # Get printer DPI and calculate sheet dimensions
-                dpi = dc.GetDeviceCaps(88)
-                # print(f"Printer DPI: {dpi}")
-                page_width = dc.GetDeviceCaps(8)
-                page_height = dc.GetDeviceCaps(10)
-
-                # Sheet layout: 3 columns x 10 rows = 30 labels
-                margin_y = int(0.5 * dpi)
-                label_width = page_width // 3
-                label_height = (page_height - margin_y) // 10 - 7
-                
-                # Column adjustments for better alignment
-                left_col_offset = -35
-                middle_col_offset = 0
-                right_col_offset = 35
-                col_offsets = [left_col_offset, middle_col_offset, right_col_offset]
-
-                dc.SelectObject(font)
-
-                # Spacing logic (same as single back label)
-                num_lines = len(back_lines)
-                # if back line 7 is not present, increase line height to spread out
-                if len(back_lines) < 7:
-                    line_height = 90
-                else:
-                    line_height = 80  # Exact same as single back label
-                total_text_height = line_height * num_lines
-
-                # Draw 30 labels (3 columns x 10 rows)
-                for row in range(10):
-                    y_base = margin_y + (row * label_height)
-                    
-                    for col in range(3):
-                        x_center = (col * label_width) + (label_width // 2) + col_offsets[col]
-                        
-                        # Calculate y_start (same logic as single back label)
-                        remaining_space = label_height - total_text_height
-                        y_start = y_base + (remaining_space // 2) - 80
-
-                        # Draw each back line (same as single back label)
-                        for line in back_lines:
-                            text_width = dc.GetTextExtent(line)[0]
-                            dc.TextOut(x_center - text_width // 2, y_start, line)
-                            y_start += line_height
-
-                # Footer with variety name
-                dc.SelectObject(footer_font)
-                footer_text = f"Variety: {variety_name}"
-                footer_x = int(0.5 * dpi)
-                footer_y = page_height - int(0.2 * dpi)
-                dc.TextOut(footer_x, footer_y, footer_text)
-
-                dc.EndPage()
-                dc.EndDoc()
-                dc.DeleteDC()
+            with printer_lock(printer_name):
+                for i in range(quantity):
+                    start = time.perf_counter()
+                    dc = open_printer_dc(printer_name)
+
+                    dc.StartDoc("Seed Label Back Sheet")
+                    dc.StartPage()
+                    draw_sheet_back_page(dc, fonts, back_lines, variety_name)
+                    dc.EndPage()
+                    dc.EndDoc()
+                    dc.DeleteDC()
+                    record_print_cost('sheet', 1, time.perf_counter() - start)
+                    printer_checkpoint(printer_name)
 
             return {'success': True, 'message': f'Back Sheet Label printed successfully ({quantity} copies)'}
 
+    except JobCancelled:
+        raise
     except Exception as e:
         print(f"Error printing back sheet: {str(e)}")
         return {'success': False, 'error': str(e)}
@@ -831,7 +2413,9 @@ def print_sheet_back_logic(data):
 def print_sheet_front():
     """Route handler for front sheet label printing"""
     try:
-        data = request.get_json()
+        data, errors = VALIDATORS['sheet_front'](request.get_json(silent=True))
+        if errors:
+            return validation_failed(errors)
         result = print_sheet_front_logic(data)
        
         if result['success']:
@@ -851,7 +2435,9 @@ def print_sheet_front():
 def print_sheet_back():
     """Route handler for back sheet label printing"""
     try:
-        data = request.get_json()
+        data, errors = VALIDATORS['sheet_back'](request.get_json(silent=True))
+        if errors:
+            return validation_failed(errors)
         result = print_sheet_back_logic(data)
        
         if result['success']:
@@ -867,238 +2453,1404 @@ def print_sheet_back():
         }), 500
 
 
-@app.route('/print-orders', methods=['POST'])
-def print_orders():
-    try:
-        data = request.get_json()
-        customer_orders = data.get('customer_orders')
-        missing_orders = data.get('missing_orders')
-        bulk_orders = data.get('bulk_orders')
-        misc_orders = data.get('misc_orders')
-        order_data = data.get('order_data')
-
-        # look through customer_orders dict and extract those with duplicate orders
-        duplicate_orders = {customer: orders for customer, orders in customer_orders.items() if len(orders) > 1}
-        # print(f"Duplicate Orders: {duplicate_orders}")
-
-        # Handle printing of duplicate orders
-        handled_orders = set()
-
-        for customer, orders in duplicate_orders.items():
-            for order_number in orders:
-                if order_number in order_data:
-                    order = order_data[order_number]
-                    print(f"Printing duplicate order {order_number} for customer {customer}")
-                    generate_pdf(order_number, order, action="print")
-                    handled_orders.add(order_number)
-
-        # Now remove them in one go
-        for order_number in handled_orders:
-            order_data.pop(order_number, None)  # safe remove
-
-        # Handle printing of packet-only orders
-        pkt_only_orders = [
-            order_number for order_number, order in order_data.items()
-            if not order.get("bulk_items") and not order.get("misc_items")
-        ]
-
-        for order_number in pkt_only_orders:
-            order = order_data[order_number]
-            print(f"Printing packet-only order {order_number}")
-            generate_pdf(order_number, order, action="print")
-
-        # Remove them afterward
-        for order_number in pkt_only_orders:
-            order_data.pop(order_number, None) 
-
-        # Print remaining orders
-        for order_number, order in order_data.items():
-            print(f"Printing bulk/misc order {order_number}")
-            generate_pdf(order_number, order, action="print")
+# === Sheet packing ===
+# /print-sheet-pack fills Avery 5960 sheets with a mix of labels, e.g. 7 of
+# one variety and 12 of another on a single sheet, in the order given:
+#   {"side": "front", "labels": [{"data": {...front label...}, "count": 7}, ...]}
+# Each label's data is what /print-sheet-front (or -back) takes; count
+# defaults to its quantity x env_multiplier. "start_cell" (1-30) begins on
+# a part-used sheet. All sheets go out as one spooler document, and only
+# the cells in use are drawn.
 
-        return jsonify({
-            'success': True,
-            'message': f'Orders printed successfully',
-            'multiple_order_customers': duplicate_orders
+def pack_sheet_labels(counts, start_cell=0):
+    """
+    Place counts[i] copies of label i on 30-up sheets, in order, beginning
+    at cell start_cell (0-based) of the first sheet.
+
+    Returns one [(cell, label index), ...] list per sheet.
+    """
+    cells_per_sheet = SHEET_ROWS * SHEET_COLS
+    sheets = []
+    position = start_cell
+    for index, count in enumerate(counts):
+        for _ in range(count):
+            sheet, cell = divmod(position, cells_per_sheet)
+            while len(sheets) <= sheet:
+                sheets.append([])
+            sheets[sheet].append((cell, index))
+            position += 1
+    return sheets
+
+
+def sheet_manifest(sheets, names, start_cell=0):
+    """Which labels went in which cells (1-based) of each sheet"""
+    manifest = []
+    for number, placements in enumerate(sheets, start=1):
+        skipped = start_cell if number == 1 else 0
+        runs = []
+        for cell, index in placements:
+            if runs and runs[-1]['label'] == index and runs[-1]['last_cell'] == cell:
+                runs[-1]['count'] += 1
+                runs[-1]['last_cell'] = cell + 1
+            else:
+                runs.append({'label': index, 'name': names[index], 'count': 1,
+                             'first_cell': cell + 1, 'last_cell': cell + 1})
+        manifest.append({
+            'sheet': number,
+            'labels': runs,
+            'skipped_cells': skipped,
+            'empty_cells': SHEET_ROWS * SHEET_COLS - skipped - len(placements),
         })
+    return manifest
+
+
+def draw_packed_sheet_page(dc, fonts, side, labels, placements, footer):
+    """Draw the labels placed on one sheet ([(cell, label index), ...]) and its footer"""
+    if side == 'front':
+        cells = sheet_front_cells(dc)
+        for cell, index in placements:
+            x_center, y_start = cells[cell]
+            draw_sheet_front_label(dc, fonts, labels[index], x_center, y_start)
+        draw_sheet_front_footer(dc, fonts, footer)
+    else:
+        cells = sheet_back_cells(dc)
+        for cell, index in placements:
+            x_center, y_base, label_height = cells[cell]
+            draw_sheet_back_label(dc, fonts, labels[index], x_center, y_base, label_height)
+        draw_sheet_back_footer(dc, fonts, footer)
+
+
+def packed_sheet_footer(side, sheet_number, sheet_count, labels, names, placements):
+    used = sorted({index for _, index in placements})
+    if side == 'front':
+        env_types = list(dict.fromkeys(labels[index]['env_type'] for index in used if labels[index]['env_type']))
+        return f"Sheet {sheet_number} of {sheet_count}    Envelope: {', '.join(env_types)}"
+    return f"Sheet {sheet_number} of {sheet_count}    Variety: {', '.join(names[index] for index in used)}"
+
 
+@traced()
+def print_sheet_pack_logic(side, entries, start_cell=0):
+    """
+    Print entries ([(label data, count), ...]) packed onto as few sheets as
+    possible. Returns a result dict with a per-sheet manifest.
+    """
+    try:
+        if side == 'front':
+            labels = [prepare_front_label(data) for data, _ in entries]
+            names = [label['variety_name'] for label in labels]
+        else:
+            labels = [back_label_lines(data) for data, _ in entries]
+            names = [f"'{data.get('variety_name')}'" for data, _ in entries]
+            empty = [str(index) for index, lines in enumerate(labels) if not lines]
+            if empty:
+                return {'success': False, 'message': f"No back lines provided for label(s) {', '.join(empty)}"}
+
+        counts = [count for _, count in entries]
+        sheets = pack_sheet_labels(counts, start_cell)
+        manifest = sheet_manifest(sheets, names, start_cell)
+        total = sum(counts)
+        message = f'Printed {total} {side} labels on {len(sheets)} sheet(s)'
+
+        if CURRENT_USER.lower() == "ndefe":
+            print(f"Printing {total} packed {side} sheet labels on Ndefe's printer")
+            for sheet in manifest:
+                runs = ', '.join(f"{run['name']} x{run['count']} (cells {run['first_cell']}-{run['last_cell']})"
+                                 for run in sheet['labels'])
+                print(f"Sheet {sheet['sheet']}: {runs}")
+            print("================================")
+            return {'success': True, 'message': message, 'sheets': manifest}
+
+        fonts = FontCache()
+        printer_name = SHEET_PRINTER
+
+        # One document per sheet, so a cancel or a higher-priority job can
+        # step in between sheets
+        with printer_lock(printer_name):
+            for number, placements in enumerate(sheets, start=1):
+                start = time.perf_counter()
+                dc = open_printer_dc(printer_name)
+                dc.StartDoc("Packed Seed Label Sheet")
+                try:
+                    dc.StartPage()
+                    footer = packed_sheet_footer(side, number, len(sheets), labels, names, placements)
+                    draw_packed_sheet_page(dc, fonts, side, labels, placements, footer)
+                    dc.EndPage()
+                finally:
+                    dc.EndDoc()
+                    dc.DeleteDC()
+                record_print_cost('sheet', 1, time.perf_counter() - start)
+                printer_checkpoint(printer_name)
+
+        return {'success': True, 'message': message, 'sheets': manifest}
+
+    except JobCancelled:
+        raise
     except Exception as e:
-        print(f"Error printing orders: {str(e)}")
+        print(f"Error printing packed sheets: {str(e)}")
+        return {'success': False, 'error': str(e)}
+
+
+@app.route('/print-sheet-pack', methods=['POST'])
+def print_sheet_pack():
+    """Route handler for mixed-variety sheet printing"""
+    try:
+        data, errors = VALIDATORS['sheet_pack'](request.get_json(silent=True))
+        if errors:
+            return validation_failed(errors)
+
+        if data['side'] not in ('front', 'back'):
+            return validation_failed([{'field': 'side', 'error': 'must be front or back'}])
+
+        validate = VALIDATORS['front_label' if data['side'] == 'front' else 'back_label']
+        entries = []
+        for index, entry in enumerate(data['labels']):
+            label_data, label_errors = validate(entry['data'], f"labels[{index}].data")
+            errors.extend(label_errors)
+            if not label_errors:
+                entries.append((label_data, entry['count'] or label_copies(label_data)))
+        if errors:
+            return validation_failed(errors)
+
+        result = print_sheet_pack_logic(data['side'], entries, data['start_cell'] - 1)
+
+        if result['success']:
+            return jsonify(result)
+        else:
+            return jsonify(result), 500
+
+    except Exception as e:
+        print(f"Error in sheet pack route: {str(e)}")
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
 
-@app.route('/print-items-to-pull', methods=['POST'])
-def print_items_to_pull():
+# === Auto routing ===
+# /print-auto takes a front or back label and a quantity and sends it to
+# whichever printer will finish it first: the Zebra roll printer one label
+# at a time, or the RICOH sheet printer 30 to a sheet. Each estimate is the
+# printer's current queue (jobs printing or waiting x their average time)
+# plus the job itself at the slower of the rated and measured seconds per
+# roll label or per sheet.
+
+PRINT_COSTS = {kind: None for kind in PRINT_RATED_SECONDS}
+PRINT_COST_SAMPLES = {kind: 0 for kind in PRINT_RATED_SECONDS}
+PRINT_COSTS_LOCK = threading.Lock()
+
+
+def record_print_cost(kind, units, seconds):
+    """Fold a measured print (units roll labels or sheets in seconds) into the throughput model"""
+    if units <= 0 or current_dry_run() is not None:
+        return
+    with PRINT_COSTS_LOCK:
+        per_unit = seconds / units
+        if PRINT_COSTS[kind] is None:
+            PRINT_COSTS[kind] = per_unit
+        else:
+            PRINT_COSTS[kind] += PRINT_COST_ALPHA * (per_unit - PRINT_COSTS[kind])
+        PRINT_COST_SAMPLES[kind] += 1
+
+
+def print_unit_seconds(kind):
+    with PRINT_COSTS_LOCK:
+        measured = PRINT_COSTS[kind]
+    return max(PRINT_RATED_SECONDS[kind], measured or 0.0)
+
+
+def printer_queue_seconds(printer_name):
+    lock = get_printer_lock(printer_name)
+    depth = lock.queue_depth()
+    return depth * (lock.job_seconds or 0.0), depth
+
+
+def plan_label_route(quantity):
+    """Estimated finish times on each printer and the one to use"""
+    roll_label_seconds = print_unit_seconds('roll_label')
+    sheet_seconds = print_unit_seconds('sheet')
+    sheets = -(-quantity // (SHEET_ROWS * SHEET_COLS))
+    roll_queue, roll_depth = printer_queue_seconds(ROLL_PRINTER)
+    sheet_queue, sheet_depth = printer_queue_seconds(SHEET_PRINTER)
+
+    roll = {
+        'printer': ROLL_PRINTER,
+        'queue_depth': roll_depth,
+        'queue_seconds': round(roll_queue, 1),
+        'print_seconds': round(quantity * roll_label_seconds, 1),
+    }
+    sheet = {
+        'printer': SHEET_PRINTER,
+        'sheets': sheets,
+        'queue_depth': sheet_depth,
+        'queue_seconds': round(sheet_queue, 1),
+        'print_seconds': round(sheets * sheet_seconds, 1),
+    }
+    for option in (roll, sheet):
+        option['finish_seconds'] = round(option['queue_seconds'] + option['print_seconds'], 1)
+
+    # Ties stay on the roll printer, which wastes no sheet cells
+    route = 'sheet' if sheet['finish_seconds'] < roll['finish_seconds'] else 'roll'
+    return {
+        'route': route,
+        'quantity': quantity,
+        'roll': roll,
+        'sheet': sheet,
+        'model': {
+            kind: {
+                'rated_seconds': PRINT_RATED_SECONDS[kind],
+                'measured_seconds': round(PRINT_COSTS[kind], 3) if PRINT_COSTS[kind] is not None else None,
+                'samples': PRINT_COST_SAMPLES[kind],
+            }
+            for kind in PRINT_RATED_SECONDS
+        },
+    }
+
+
+@app.route('/print-auto', methods=['POST'])
+def print_auto():
+    """
+    Print quantity x env_multiplier front or back labels on the roll or sheet
+    printer, whichever the throughput model says finishes first.
+    "route_only": true returns the decision without printing.
+    """
     try:
-        data = request.get_json()
-        items = data.get('items', [])
-        batch_date = data.get('batch_date', 'Unknown')
-        
-        if not items:
-            return jsonify({
-                'success': False,
-                'error': 'No items provided'
-            }), 400
-        
-        # Create pdfs directory if it doesn't exist
-        pdf_dir = 'packing_slips'
-        os.makedirs(pdf_dir, exist_ok=True)
-        
-        # Generate filename with current date
-        current_date = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f'pull_{current_date}.pdf'
-        file_path = os.path.join(pdf_dir, filename)
-        
-        # Create PDF
-        create_pull_items_pdf(file_path, items, batch_date)
-        
-        # Print using Sumatra (skip if user is ndefe)
-        if CURRENT_USER.lower() != "ndefe":
-            try:
-                command = f'"{SUMATRA_PATH}" -print-to "{SHEET_PRINTER}" -print-settings "fit,portrait" -silent "{file_path}"'
-                subprocess.run(command, check=True, shell=True)
-                print(f"Successfully printed {filename}")
-            except Exception as e:
-                print(f"Failed to print {filename}: {e}")
-                return jsonify({
-                    'success': False,
-                    'error': f'Failed to print: {str(e)}'
-                }), 500
-            finally:
-                # Clean up the file
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-                    print(f"Temporary file {file_path} deleted.")
+        data, errors = VALIDATORS['auto_route'](request.get_json(silent=True))
+        if errors:
+            return validation_failed(errors)
+
+        side = data['side']
+        if side not in ('front', 'back'):
+            return validation_failed([{'field': 'side', 'error': 'must be front or back'}])
+
+        data, errors = VALIDATORS['front_label' if side == 'front' else 'back_label'](data)
+        if errors:
+            return validation_failed(errors)
+
+        quantity = label_copies(data)
+        plan = plan_label_route(quantity)
+        print(f"Auto route: {quantity} {side} labels -> {plan['route']} "
+              f"(roll {plan['roll']['finish_seconds']}s, sheet {plan['sheet']['finish_seconds']}s)")
+
+        if data['route_only']:
+            return jsonify({'success': True, 'routing': plan})
+
+        if plan['route'] == 'sheet':
+            result = print_sheet_pack_logic(side, [(data, quantity)])
+        elif side == 'front':
+            result = print_single_front_label_logic(data)
         else:
-            print(f"PDF created at {file_path} (printing skipped for ndefe)")
-        
-        return jsonify({
-            'success': True,
-            'message': f'Successfully printed {len(items)} items to pull for batch {batch_date}'
-        })
-        
+            result = print_single_back_label_logic(data)
+        result['routing'] = plan
+
+        if result['success']:
+            return jsonify(result)
+        else:
+            return jsonify(result), 500
+
     except Exception as e:
-        print(f"Error printing items to pull: {str(e)}")
+        print(f"Error in auto route: {str(e)}")
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
 
-def create_pull_items_pdf(file_path, items, batch_date):
-    """Create a PDF with items to pull table - black and white version"""
-    doc = SimpleDocTemplate(file_path, pagesize=letter)
-    styles = getSampleStyleSheet()
-    story = []
-    
-    # Centered title with date
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading2'],
-        fontSize=14,
-        spaceAfter=20,
-        alignment=1  # Center alignment
-    )
-    title = Paragraph(f"Bulk items to pull -- {batch_date}", title_style)
-    story.append(title)
+# === Print job journal ===
+# /print-range and /print-orders record each job and every item it finishes
+# in a local SQLite database (WAL mode). Finished items are buffered and
+# committed in small batches, so after a crash at most JOURNAL_COMMIT_EVERY
+# items (or JOURNAL_COMMIT_SECONDS worth) are printed again on resume.
+# A job still marked 'running' when the service starts was cut short and
+# becomes 'interrupted'; POST /jobs/<job_id>/resume picks it up again.
+#
+# While a job runs, GET /jobs/<job_id>/events streams its progress as
+# Server-Sent Events and POST /jobs/<job_id>/cancel stops it at the next
+# label copy (or order). Send "async": true to get the job_id back at once
+# and follow the job through its event stream, or send your own "job_id"
+# to open the stream before posting the job.
+
+JOURNAL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    total_items INTEGER NOT NULL,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS job_items (
+    job_id TEXT NOT NULL REFERENCES jobs(job_id),
+    item_key TEXT NOT NULL,
+    order_number TEXT,
+    sku TEXT,
+    lot TEXT,
+    finished_at TEXT NOT NULL,
+    PRIMARY KEY (job_id, item_key)
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
+CREATE INDEX IF NOT EXISTS idx_job_items_order_number ON job_items(order_number);
+CREATE INDEX IF NOT EXISTS idx_job_items_sku ON job_items(sku);
+CREATE INDEX IF NOT EXISTS idx_job_items_lot ON job_items(lot);
+"""
+
+RESUMABLE_STATUSES = ('interrupted', 'failed')
+JOB_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]{1,64}")
+JOB_EVENTS_KEEPALIVE = 15     # seconds between keep-alive comments on an idle stream
+FINISHED_JOBS_KEPT = 100      # finished jobs whose final progress stays in memory
+
+ACTIVE_JOBS = OrderedDict()   # job_id -> JournalJob, this process's running and recent jobs
+ACTIVE_JOBS_CHANGED = threading.Condition()
+
+
+class JobCancelled(Exception):
+    """Raised at a page or item boundary of a job someone cancelled"""
+
+
+class PrintJournal:
+    """SQLite journal of print jobs, shared by all request threads"""
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = None
+        self.lock = threading.Lock()
+
+    def connect(self):
+        # Caller holds self.lock
+        if self.conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(JOURNAL_SCHEMA)
+            # Anything still running belongs to a process that died
+            conn.execute(
+                "UPDATE jobs SET status = 'interrupted', updated_at = ? WHERE status = 'running'",
+                (datetime.now().isoformat(timespec='seconds'),)
+            )
+            conn.commit()
+            self.conn = conn
+        return self.conn
+
+    def write(self, statements):
+        """Run [(sql, params), ...] and commit them as one transaction; returns the last one's rowcount"""
+        with self.lock:
+            conn = self.connect()
+            rowcount = 0
+            with conn:
+                for sql, params in statements:
+                    if params and isinstance(params[0], (list, tuple)):
+                        rowcount = conn.executemany(sql, params).rowcount
+                    else:
+                        rowcount = conn.execute(sql, params).rowcount
+            return rowcount
+
+    def query(self, sql, params=()):
+        with self.lock:
+            return [dict(row) for row in self.connect().execute(sql, params).fetchall()]
+
+    def start_job(self, endpoint, payload, total_items, job_id=None):
+        """Journal a new job; raises sqlite3.IntegrityError if job_id is taken"""
+        now = datetime.now().isoformat(timespec='seconds')
+        job_id = job_id or uuid.uuid4().hex
+        if current_dry_run() is not None:
+            return DryRunJob(job_id, endpoint, total_items)
+        self.write([(
+            "INSERT INTO jobs (job_id, endpoint, payload, status, total_items, created_at, updated_at) "
+            "VALUES (?, ?, ?, 'running', ?, ?, ?)",
+            (job_id, endpoint, json.dumps(payload, default=str), total_items, now, now)
+        )])
+        return register_job(JournalJob(self, job_id, endpoint, total_items))
+
+    def resume_job(self, job_id):
+        """Mark a resumable job running again; returns (job row, JournalJob) or (row, None)"""
+        rows = self.query("SELECT * FROM jobs WHERE job_id = ?", (job_id,))
+        if not rows:
+            return None, None
+        job = rows[0]
+        if job['status'] not in RESUMABLE_STATUSES:
+            return job, None
+
+        if current_dry_run() is None:
+            # Check and claim in one statement, so two resumes of the same
+            # job can't both pass the check and print its items twice
+            claimed = self.write([(
+                f"UPDATE jobs SET status = 'running', error = NULL, updated_at = ? "
+                f"WHERE job_id = ? AND status IN ({', '.join('?' * len(RESUMABLE_STATUSES))})",
+                (datetime.now().isoformat(timespec='seconds'), job_id, *RESUMABLE_STATUSES)
+            )])
+            if claimed != 1:
+                return self.query("SELECT * FROM jobs WHERE job_id = ?", (job_id,))[0], None
+
+        done = {row['item_key'] for row in self.query(
+            "SELECT item_key FROM job_items WHERE job_id = ?", (job_id,)
+        )}
+        if current_dry_run() is not None:
+            return job, DryRunJob(job_id, job['endpoint'], job['total_items'], done)
+        return job, register_job(JournalJob(self, job_id, job['endpoint'], job['total_items'], done))
+
+    def job_summary(self, job_id=None, status=None, limit=100):
+        sql = ("SELECT j.job_id, j.endpoint, j.status, j.total_items, j.error, j.created_at, j.updated_at, "
+               "(SELECT COUNT(*) FROM job_items i WHERE i.job_id = j.job_id) AS finished_items FROM jobs j")
+        params = []
+        if job_id:
+            sql += " WHERE j.job_id = ?"
+            params.append(job_id)
+        elif status:
+            sql += " WHERE j.status = ?"
+            params.append(status)
+        sql += " ORDER BY j.created_at DESC LIMIT ?"
+        params.append(limit)
+        return self.query(sql, params)
+
+
+class JournalJob:
+    """
+    One running job: its finished items (committed in batches), live
+    progress for event streams, and its cancel flag.
+    """
 
-    # Table data
-    table_data = [
-        ['Variety Name', 'Crop', 'SKU Suffix', 'Qty']
-    ]
+    def __init__(self, journal, job_id, endpoint, total_items, done=()):
+        self.journal = journal
+        self.job_id = job_id
+        self.endpoint = endpoint
+        self.total_items = total_items
+        self.done = set(done)
+        self.resumed_items = len(self.done)
+        self.pending = []
+        self.last_commit = time.monotonic()
+
+        self.status = 'running'
+        self.error = None
+        self.items_processed = 0
+        self.pages_done = 0
+        self.started = time.monotonic()
+        self.cancel_requested = threading.Event()
+        self.changed = threading.Condition()
+        self.version = 0
+
+    def notify(self):
+        with self.changed:
+            self.version += 1
+            self.changed.notify_all()
+
+    def progress(self):
+        elapsed = time.monotonic() - self.started
+        remaining = max(0, self.total_items - self.resumed_items - self.items_processed)
+        eta = None
+        if self.status == 'running' and self.items_processed:
+            eta = round(elapsed / self.items_processed * remaining, 1)
+        return {
+            'job_id': self.job_id,
+            'endpoint': self.endpoint,
+            'status': self.status,
+            'error': self.error,
+            'total_items': self.total_items,
+            'finished_items': len(self.done),
+            'processed_items': self.resumed_items + self.items_processed,
+            'pages_done': self.pages_done,
+            'elapsed_seconds': round(elapsed, 1),
+            'eta_seconds': eta,
+            'cancel_requested': self.cancel_requested.is_set(),
+        }
 
-    for item in items:
-        table_data.append([
-            item.get('variety_name', ''),
-            item.get('crop', ''),
-            item.get('sku_suffix', ''),
-            str(item.get('quantity', 0))
-        ])
-        
-    # Create table
-    table = Table(table_data, colWidths=[3*inch, 1.5*inch, 1*inch, 0.7*inch])
-    
-    # Black and white table style
-    table.setStyle(TableStyle([
-        # Header row - bold and larger font
-        ('FONTNAME', (0, 0), (-1, 0), 'Calibri-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        
-        # Data rows - regular font
-        ('FONTNAME', (0, 1), (-1, -1), 'Calibri'),
-        ('FONTSIZE', (0, 1), (-1, -1), 10),
-            
-        # Alignment
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        
-        # Grid lines
-        ('GRID', (0, 0), (-1, -1), 1, 'black'),
-        
-        # Padding
-        ('LEFTPADDING', (0, 0), (-1, -1), 6),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-        ('TOPPADDING', (0, 0), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-    ]))
-    
-    story.append(table)
-    
-    doc.build(story)
-    print(f"PDF created: {file_path}")
+    def checkpoint(self):
+        """Start of an item: stop here if the job was cancelled"""
+        if self.cancel_requested.is_set():
+            raise JobCancelled(self.job_id)
+        if self.items_processed:
+            self.notify()
+        self.items_processed += 1
+
+    def page_done(self):
+        """A label copy or sheet finished printing: stop here if the job was cancelled"""
+        self.pages_done += 1
+        self.notify()
+        if self.cancel_requested.is_set():
+            raise JobCancelled(self.job_id)
+
+    def cancel(self):
+        self.cancel_requested.set()
+        self.notify()
+
+    def is_done(self, item_key):
+        return item_key in self.done
+
+    def record(self, item_key, order_number=None, sku=None, lot=None):
+        self.done.add(item_key)
+        self.notify()
+        self.pending.append((
+            self.job_id, item_key, order_number, sku, lot,
+            datetime.now().isoformat(timespec='seconds')
+        ))
+        if (len(self.pending) >= JOURNAL_COMMIT_EVERY
+                or time.monotonic() - self.last_commit >= JOURNAL_COMMIT_SECONDS):
+            self.flush()
+
+    def flush(self, status=None, error=None):
+        statements = []
+        if self.pending:
+            statements.append((
+                "INSERT OR REPLACE INTO job_items (job_id, item_key, order_number, sku, lot, finished_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                self.pending
+            ))
+        if status:
+            statements.append((
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE job_id = ?",
+                (status, error, datetime.now().isoformat(timespec='seconds'), self.job_id)
+            ))
+        if statements:
+            self.journal.write(statements)
+        self.pending = []
+        self.last_commit = time.monotonic()
+
+    def finish(self, status, error=None):
+        self.flush(status=status, error=error)
+        self.status = status
+        self.error = error
+        self.notify()
+
+    def set_total_items(self, total_items):
+        self.total_items = total_items
+        self.journal.write([("UPDATE jobs SET total_items = ? WHERE job_id = ?", (total_items, self.job_id))])
+
+
+class DryRunJob(JournalJob):
+    """A job for a dry run: tracks progress like a JournalJob but writes nothing"""
+
+    def __init__(self, job_id, endpoint, total_items, done=()):
+        super().__init__(None, job_id, endpoint, total_items, done)
+
+    def flush(self, status=None, error=None):
+        self.pending = []
+
+    def set_total_items(self, total_items):
+        self.total_items = total_items
+
+
+JOURNAL = PrintJournal(JOURNAL_PATH)
+
+
+def register_job(job):
+    with ACTIVE_JOBS_CHANGED:
+        ACTIVE_JOBS[job.job_id] = job
+        finished = [job_id for job_id, other in ACTIVE_JOBS.items() if other.status != 'running']
+        for job_id in finished[:max(0, len(finished) - FINISHED_JOBS_KEPT)]:
+            del ACTIVE_JOBS[job_id]
+        ACTIVE_JOBS_CHANGED.notify_all()
+    return job
+
+
+def run_journaled(runner, data, job):
+    """Run a job runner, then commit its remaining progress and final status"""
+    PRINT_CONTEXT.job = job
+    try:
+        with SPOOL.owner(job.job_id), trace_span('print.job', **{'job.id': job.job_id, 'job.endpoint': job.endpoint}):
+            body, status = runner(data, job)
+    except JobCancelled:
+        job.finish('cancelled', 'Cancelled by request')
+        print(f"Job {job.job_id} cancelled after {len(job.done)} of {job.total_items} items")
+        body, status = {
+            'success': False,
+            'cancelled': True,
+            'message': f'Job cancelled after {len(job.done)} of {job.total_items} items',
+        }, 200
+    except Exception as e:
+        job.finish('failed', str(e))
+        raise
+    else:
+        if status < 400:
+            job.finish('done')
+        else:
+            job.finish('failed', body.get('error') or body.get('message'))
+    finally:
+        PRINT_CONTEXT.__dict__.pop('job', None)
+    body['job_id'] = job.job_id
+    return body, status
 
 
-@app.route('/generate-packing-slip', methods=['POST'])
-def generate_packing_slip():
-    if request.method == 'OPTIONS':
-        return '', 200
+def dispatch_job(runner, data, job, run_async=False):
+    """Run a journaled job now, or in a background thread when run_async (202 + job_id)"""
+    if not run_async or current_dry_run() is not None:
+        return run_journaled(runner, data, job)
+
+    priority = current_print_priority()
+    trace_parent = current_trace_parent()
+
+    def run():
+        PRINT_CONTEXT.priority = priority
+        PRINT_CONTEXT.trace_parent = trace_parent
+        try:
+            run_journaled(runner, data, job)
+        except Exception as e:
+            print(f"Error in background job {job.job_id}: {str(e)}")
+
+    threading.Thread(target=run, name=f"print-job-{job.job_id}", daemon=True).start()
+    return {
+        'success': True,
+        'message': 'Job started',
+        'job_id': job.job_id,
+        'events': f'/jobs/{job.job_id}/events',
+    }, 202
+
+
+def start_journaled_job(endpoint, runner, data, total_items):
+    """Journal and run a /print-range or /print-orders request; returns a Flask response"""
+    job_id = data.get('job_id')
+    if job_id and not JOB_ID_PATTERN.fullmatch(job_id):
+        return validation_failed([{'field': 'job_id', 'error': 'must be 1-64 letters, digits, _ or -'}])
+    try:
+        job = JOURNAL.start_job(endpoint, data, total_items, job_id)
+    except sqlite3.IntegrityError:
+        return jsonify({'success': False, 'error': f'Job {job_id} already exists'}), 409
+
+    body, status = dispatch_job(runner, data, job, data.get('async'))
+    return jsonify(body), status
+
+
+@app.route('/jobs', methods=['GET'])
+def list_jobs():
+    """Recent journaled jobs, optionally only those with ?status=interrupted (or failed, ...)"""
     try:
-        # print("Generating packing slip PDF in flask...")
-        data = request.get_json()
-        order = data.get('order')
-        
-        if not order:
-            return jsonify({'success': False, 'error': 'No order data provided'})
-        
-        order_number = order.get('order_number', 'unknown')
-        
-        # Call your existing generate_pdf function with action="view"
-        generate_pdf(order_number, order, action="view")
-        
-        # Return success response to the browser
         return jsonify({
-            'success': True, 
-            'message': f'Packing slip for order {order_number} opened locally'
+            'success': True,
+            'jobs': JOURNAL.job_summary(status=request.args.get('status'))
         })
-       
     except Exception as e:
-        print(f"Error generating packing slip PDF: {e}")
-        return jsonify({'success': False, 'error': str(e)})
+        print(f"Error reading print journal: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
 
 
-@app.route('/reprocess-order', methods=['POST', 'OPTIONS'])
-def reprocess_order():
-    if request.method == 'OPTIONS':
-        return '', 200
-    
+@app.route('/jobs/lookup', methods=['GET'])
+def lookup_job_items():
+    """Journaled items matching ?order_number=, ?sku= and/or ?lot="""
     try:
-        print("Reprocessing order in Flask...")
-        data = request.get_json()
-        order = data.get('order')
-        bulk_to_print = data.get('bulk_to_print', {})
-        
-    
-        if not order:
-            return jsonify({'success': False, 'error': 'No order data provided'})
-        
-        order_number = order.get('order_number', 'unknown')
-        
-        # Generate and print the packing slip
-        generate_pdf(order_number, order, action="print")
-        
+        clauses = []
+        params = []
+        for field in ('order_number', 'sku', 'lot'):
+            if request.args.get(field):
+                clauses.append(f"i.{field} = ?")
+                params.append(request.args[field])
+        if not clauses:
+            return jsonify({
+                'success': False,
+                'error': 'Give at least one of order_number, sku or lot'
+            }), 400
+
+        items = JOURNAL.query(
+            "SELECT i.job_id, i.item_key, i.order_number, i.sku, i.lot, i.finished_at, j.endpoint, j.status "
+            "FROM job_items i JOIN jobs j ON j.job_id = i.job_id WHERE " + " AND ".join(clauses) +
+            " ORDER BY i.finished_at DESC LIMIT 500",
+            params
+        )
+        return jsonify({'success': True, 'items': items})
+    except Exception as e:
+        print(f"Error reading print journal: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """A journaled job, with live progress if it ran in this process (poll this or use /events)"""
+    try:
+        jobs = JOURNAL.job_summary(job_id=job_id)
+        if not jobs:
+            return jsonify({'success': False, 'error': f'No job {job_id}'}), 404
+        job = ACTIVE_JOBS.get(job_id)
+        return jsonify({
+            'success': True,
+            'job': jobs[0],
+            'progress': job.progress() if job else None
+        })
+    except Exception as e:
+        print(f"Error reading print journal: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+def job_events(job_id, wait_for_start):
+    """Server-Sent Events for a job: a 'progress' event per change, then 'end'"""
+    deadline = time.monotonic() + wait_for_start
+    with ACTIVE_JOBS_CHANGED:
+        # A client-chosen job_id may be streamed before the job is posted
+        while job_id not in ACTIVE_JOBS and time.monotonic() < deadline:
+            ACTIVE_JOBS_CHANGED.wait(deadline - time.monotonic())
+        job = ACTIVE_JOBS.get(job_id)
+
+    if job is None:
+        # Not run by this process (or long finished): report what the journal has
+        jobs = JOURNAL.job_summary(job_id=job_id)
+        summary = jobs[0] if jobs else {'job_id': job_id, 'status': 'unknown'}
+        yield f"event: end\ndata: {json.dumps(summary)}\n\n"
+        return
+
+    seen = None
+    while True:
+        with job.changed:
+            if job.version == seen:
+                job.changed.wait(JOB_EVENTS_KEEPALIVE)
+            version = job.version
+        if version == seen:
+            yield ": keep-alive\n\n"
+            continue
+        seen = version
+        progress = job.progress()
+        yield f"event: progress\ndata: {json.dumps(progress)}\n\n"
+        if progress['status'] != 'running':
+            yield f"event: end\ndata: {json.dumps(progress)}\n\n"
+            return
+
+
+@app.route('/jobs/<job_id>/events', methods=['GET'])
+def stream_job_events(job_id):
+    """Live progress of a job as text/event-stream (?wait=N seconds for it to start)"""
+    try:
+        wait_for_start = min(float(request.args.get('wait', 10)), 60)
+    except ValueError:
+        return validation_failed([{'field': 'wait', 'error': 'must be a number'}])
+    return Response(
+        stream_with_context(job_events(job_id, wait_for_start)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@app.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Stop a running job after the label copy (or order) it is printing now"""
+    job = ACTIVE_JOBS.get(job_id)
+    if job is None or job.status != 'running':
+        return jsonify({
+            'success': False,
+            'error': f'Job {job_id} is not running'
+        }), 404 if job is None else 409
+    job.cancel()
+    print(f"Cancel requested for job {job_id}")
+    return jsonify({
+        'success': True,
+        'message': f'Job {job_id} will stop at the next page boundary',
+        'progress': job.progress()
+    })
+
+
+@app.route('/jobs/<job_id>/resume', methods=['POST'])
+def resume_job(job_id):
+    """Re-run an interrupted or failed job, skipping the items it already finished"""
+    try:
+        options, errors = VALIDATORS['resume_job'](request.get_json(silent=True) or {})
+        if errors:
+            return validation_failed(errors)
+
+        summary = JOURNAL.job_summary(job_id)
+        if summary and summary[0]['endpoint'] == 'print_orders_stream':
+            # The orders were never stored, so the client has to send them again
+            return jsonify({
+                'success': False,
+                'error': f'Streamed job {job_id} is resumed by re-sending its orders to '
+                         f'/print-orders/stream?job_id={job_id}&resume=1'
+            }), 409
+
+        row, job = JOURNAL.resume_job(job_id)
+        if row is None:
+            return jsonify({'success': False, 'error': f'No job {job_id}'}), 404
+        if job is None:
+            return jsonify({
+                'success': False,
+                'error': f"Job {job_id} is {row['status']}; only {' or '.join(RESUMABLE_STATUSES)} jobs can be resumed"
+            }), 409
+
+        runner = {'print_orders': run_print_orders, 'print_range': run_print_range}[row['endpoint']]
+        skipped_items = len(job.done)
+        print(f"Resuming {row['endpoint']} job {job_id} ({skipped_items} of {row['total_items']} items already printed)")
+        body, status = dispatch_job(runner, json.loads(row['payload']), job, options['async'])
+        body['skipped_items'] = skipped_items
+        return jsonify(body), status
+
+    except Exception as e:
+        print(f"Error resuming job {job_id}: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/print-orders', methods=['POST'])
+def print_orders():
+    try:
+        data, errors = VALIDATORS['print_orders'](request.get_json(silent=True))
+        if errors:
+            return validation_failed(errors)
+
+        return start_journaled_job('print_orders', run_print_orders, data, len(data['order_data']))
+
+    except Exception as e:
+        print(f"Error printing orders: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+def run_print_orders(data, job):
+    """
+    Print every order's packing slip, journaling each order as it finishes.
+
+    Orders already finished in job (when resuming) are skipped. Returns
+    (response body, status code).
+    """
+    customer_orders = data.get('customer_orders')
+    missing_orders = data.get('missing_orders')
+    bulk_orders = data.get('bulk_orders')
+    misc_orders = data.get('misc_orders')
+    order_data = dict(data.get('order_data'))
+    failed_orders = []
+
+    def print_order(order_number, message):
+        if job.is_done(order_number):
+            print(f"Skipping order {order_number} (already printed)")
+            return
+        job.checkpoint()
+        print(message)
+        # Only journal orders the printer took, so a resume retries the rest
+        if generate_pdf(order_number, order_data[order_number], action="print"):
+            job.record(order_number, order_number=order_number)
+        else:
+            failed_orders.append(order_number)
+
+    # look through customer_orders dict and extract those with duplicate orders
+    duplicate_orders = {customer: orders for customer, orders in customer_orders.items() if len(orders) > 1}
+    # print(f"Duplicate Orders: {duplicate_orders}")
+
+    # Handle printing of duplicate orders
+    handled_orders = set()
+
+    for customer, orders in duplicate_orders.items():
+        for order_number in orders:
+            if order_number in order_data:
+                print_order(order_number, f"Printing duplicate order {order_number} for customer {customer}")
+                handled_orders.add(order_number)
+
+    # Now remove them in one go
+    for order_number in handled_orders:
+        order_data.pop(order_number, None)  # safe remove
+
+    # Handle printing of packet-only orders
+    pkt_only_orders = [
+        order_number for order_number, order in order_data.items()
+        if not order.get("bulk_items") and not order.get("misc_items")
+    ]
+
+    for order_number in pkt_only_orders:
+        print_order(order_number, f"Printing packet-only order {order_number}")
+
+    # Remove them afterward
+    for order_number in pkt_only_orders:
+        order_data.pop(order_number, None) 
+
+    # Print remaining orders
+    for order_number in order_data:
+        print_order(order_number, f"Printing bulk/misc order {order_number}")
+
+    if failed_orders:
+        return {
+            'success': False,
+            'error': f'{len(failed_orders)} order(s) failed to print; resume the job to retry them',
+            'failed_orders': failed_orders,
+            'multiple_order_customers': duplicate_orders
+        }, 500
+
+    return {
+        'success': True,
+        'message': 'Orders printed successfully',
+        'multiple_order_customers': duplicate_orders
+    }, 200
+
+
+@app.route('/print-orders/stream', methods=['POST'])
+def print_orders_stream():
+    """
+    /print-orders for batches too big to hold in memory. The body is
+    newline-delimited JSON: a {"customer_orders": {...}} line, then one order
+    (the order_data fields plus order_number) per line. Orders print as they
+    are classified, so memory stays flat however many are sent.
+    ?job_id= names the job; ?job_id=...&resume=1 re-sends a failed or
+    interrupted job, skipping the orders it already printed.
+    """
+    try:
+        options, errors = VALIDATORS['print_orders_stream'](request.args.to_dict())
+        if errors:
+            return validation_failed(errors)
+
+        job_id = options.get('job_id')
+        if job_id and not JOB_ID_PATTERN.fullmatch(job_id):
+            return validation_failed([{'field': 'job_id', 'error': 'must be 1-64 letters, digits, _ or -'}])
+
+        if options['resume']:
+            if not job_id:
+                return validation_failed([{'field': 'job_id', 'error': 'is required to resume'}])
+            summary = JOURNAL.job_summary(job_id)
+            if not summary or summary[0]['endpoint'] != 'print_orders_stream':
+                return jsonify({'success': False, 'error': f'No streamed job {job_id}'}), 404
+            row, job = JOURNAL.resume_job(job_id)
+            if job is None:
+                return jsonify({
+                    'success': False,
+                    'error': f"Job {job_id} is {row['status']}; only {' or '.join(RESUMABLE_STATUSES)} jobs can be resumed"
+                }), 409
+            print(f"Resuming streamed orders job {job_id} ({len(job.done)} orders already printed)")
+        else:
+            try:
+                job = JOURNAL.start_job('print_orders_stream', {'stream': True}, 0, job_id)
+            except sqlite3.IntegrityError:
+                return jsonify({'success': False, 'error': f'Job {job_id} already exists'}), 409
+
+        lines = (line.decode('utf-8') for line in request.stream)
+        body, status = run_journaled(run_print_orders_stream, lines, job)
+        return jsonify(body), status
+
+    except Exception as e:
+        print(f"Error printing streamed orders: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+def run_print_orders_stream(lines, job):
+    """
+    run_print_orders over an NDJSON stream, in the same order: duplicate
+    customers' orders, then packet-only orders, then bulk/misc orders.
+
+    Duplicates print as soon as they arrive. Packet-only and bulk/misc
+    orders are spooled to temporary files and printed from there once the
+    stream ends, one order in memory at a time. Lines that fail validation
+    are skipped and reported (400) so the job can be fixed and resumed.
+    """
+    duplicate_orders = None
+    duplicate_customers = {}  # order_number -> customer with several orders
+    invalid_lines = []
+    failed_orders = []
+    received = 0
+
+    def print_order(order, message):
+        order_number = order['order_number']
+        if job.is_done(order_number):
+            print(f"Skipping order {order_number} (already printed)")
+            return
+        job.checkpoint()
+        print(message)
+        if generate_pdf(order_number, order, action="print"):
+            job.record(order_number, order_number=order_number)
+        else:
+            failed_orders.append(order_number)
+
+    with SPOOL.owner(job.job_id) as spool_dir, \
+            tempfile.TemporaryFile('w+', encoding='utf-8', dir=spool_dir) as pkt_spool, \
+            tempfile.TemporaryFile('w+', encoding='utf-8', dir=spool_dir) as bulk_spool:
+        for line_number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                invalid_lines.append({'line': line_number, 'errors': [{'field': 'body', 'error': 'is not valid JSON'}]})
+                continue
+
+            if duplicate_orders is None:
+                header, errors = VALIDATORS['order_stream_header'](record)
+                if errors:
+                    # The first line must be {"customer_orders": {...}}
+                    return validation_error_body(errors), 400
+                duplicate_orders = {
+                    customer: orders for customer, orders in header['customer_orders'].items() if len(orders) > 1
+                }
+                duplicate_customers = {
+                    order_number: customer for customer, orders in duplicate_orders.items() for order_number in orders
+                }
+                continue
+
+            order, errors = VALIDATORS['order'](record)
+            if errors:
+                invalid_lines.append({'line': line_number, 'order_number': record.get('order_number'), 'errors': errors})
+                continue
+            received += 1
+            job.total_items = received
+
+            order_number = order['order_number']
+            if order_number in duplicate_customers:
+                customer = duplicate_customers[order_number]
+                print_order(order, f"Printing duplicate order {order_number} for customer {customer}")
+            elif not order.get("bulk_items") and not order.get("misc_items"):
+                pkt_spool.write(json.dumps(order) + "\n")
+            else:
+                bulk_spool.write(json.dumps(order) + "\n")
+
+        if duplicate_orders is None:
+            return validation_error_body([{'field': 'customer_orders', 'error': 'is required'}]), 400
+
+        for spool, kind in ((pkt_spool, 'packet-only'), (bulk_spool, 'bulk/misc')):
+            spool.seek(0)
+            for line in spool:
+                order = json.loads(line)
+                print_order(order, f"Printing {kind} order {order['order_number']}")
+
+    job.set_total_items(received)
+
+    if invalid_lines:
+        return {
+            'success': False,
+            'error': f'{len(invalid_lines)} order line(s) were invalid and not printed',
+            'invalid_lines': invalid_lines,
+            'failed_orders': failed_orders,
+            'orders_received': received,
+            'multiple_order_customers': duplicate_orders
+        }, 400
+
+    if failed_orders:
+        return {
+            'success': False,
+            'error': f'{len(failed_orders)} order(s) failed to print; resume the job to retry them',
+            'failed_orders': failed_orders,
+            'orders_received': received,
+            'multiple_order_customers': duplicate_orders
+        }, 500
+
+    return {
+        'success': True,
+        'message': 'Orders printed successfully',
+        'orders_received': received,
+        'multiple_order_customers': duplicate_orders
+    }, 200
+
+
+@app.route('/print-items-to-pull', methods=['POST'])
+def print_items_to_pull():
+    """
+    Print the bulk items to pull list.
+
+    Items can arrive three ways:
+      - a JSON body with an 'items' list (the original format)
+      - a newline-delimited JSON body (Content-Type: application/x-ndjson),
+        one item per line, with batch_date in the query string
+      - a JSON body in pages: each request carries 'pull_id', its slice of
+        'items' and 'final': true on the last page, which triggers the print
+    The NDJSON and paged forms are never held in memory as a whole list.
+
+    With aggregate on, rows sharing (variety_name, crop, sku_suffix) are
+    merged into one row with the summed quantity and sorted into pick order
+    before rendering. Merging has to see every row before drawing the first,
+    so it holds one row per distinct item in memory. It is on by default for
+    a plain items list, which is in memory anyway, and off by default for
+    NDJSON (?aggregate=1 turns it on) and paged lists ('aggregate': true on
+    the final page), which then print rows in the order they were sent.
+    """
+    spool_path = None
+    row_errors = []
+    try:
+        if request.mimetype == 'application/x-ndjson':
+            batch_date = request.args.get('batch_date', 'Unknown')
+            aggregate = request.args.get('aggregate', '0') in ('1', 'true')
+            items = iter_valid_rows(iter_ndjson(request.stream), VALIDATORS['pull_item'], row_errors)
+        else:
+            data, errors = VALIDATORS['pull_list'](request.get_json(silent=True))
+            if errors:
+                return validation_failed(errors)
+            items = data.get('items', [])
+            batch_date = data.get('batch_date', 'Unknown')
+            pull_id = data.get('pull_id')
+            aggregate = data.get('aggregate')
+            if aggregate is None:
+                aggregate = not pull_id
+
+            if pull_id:
+                if not PULL_ID_PATTERN.fullmatch(str(pull_id)):
+                    return jsonify({
+                        'success': False,
+                        'error': 'Invalid pull_id'
+                    }), 400
+
+                # A dry run stores nothing: its final page is estimated
+                # together with the pages stored so far
+                dry_run = current_dry_run() is not None
+                if not dry_run:
+                    page_path = append_pull_page(pull_id, items)
+                if not data.get('final'):
+                    return jsonify({
+                        'success': True,
+                        'message': f'Received {len(items)} items for pull list {pull_id}',
+                        'pull_id': pull_id
+                    })
+                if not dry_run:
+                    spool_path = page_path
+                    items = iter_ndjson_file(spool_path)
+                elif os.path.exists(pull_page_path(pull_id)):
+                    items = itertools.chain(iter_ndjson_file(pull_page_path(pull_id)), items)
+
+            elif not items:
+                return jsonify({
+                    'success': False,
+                    'error': 'No items provided'
+                }), 400
+        
+        # Name the list by the current date
+        current_date = datetime.now().strftime('%Y%m%d_%H%M%S')
+        filename = f'pull_{current_date}.pdf'
+        
+        # Merge duplicate rows before rendering
+        if aggregate:
+            items, input_count = aggregate_pull_items(items)
+        else:
+            input_count = None
+
+        # Create PDF
+        pdf = io.BytesIO()
+        item_count = create_pull_items_pdf(pdf, items, batch_date)
+        if input_count is None:
+            input_count = item_count
+
+        # Streamed rows are checked as they are drawn; reject before printing
+        if row_errors:
+            return validation_failed(row_errors)
+
+        if not item_count:
+            return jsonify({
+                'success': False,
+                'error': 'No items provided'
+            }), 400
+        
+        # Print using Sumatra (skip if user is ndefe)
+        if CURRENT_USER.lower() != "ndefe":
+            try:
+                send_pdf_to_printer(pdf.getvalue())
+                print(f"Successfully printed {filename}")
+            except Exception as e:
+                print(f"Failed to print {filename}: {e}")
+                return jsonify({
+                    'success': False,
+                    'error': f'Failed to print: {str(e)}'
+                }), 500
+        else:
+            file_path = save_pdf(pdf.getvalue(), 'packing_slips', f'pull_{current_date}_')
+            print(f"PDF created at {file_path} (printing skipped for ndefe)")
+        
+        return jsonify({
+            'success': True,
+            'message': f'Successfully printed {item_count} items to pull for batch {batch_date}',
+            'input_rows': input_count,
+            'output_rows': item_count,
+            'collapse_ratio': round(input_count / item_count, 2)
+        })
+        
+    except Exception as e:
+        print(f"Error printing items to pull: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+    finally:
+        # A paged pull list is finished once its final page has been handled
+        if spool_path and os.path.exists(spool_path):
+            os.remove(spool_path)
+
+
+def iter_ndjson(stream):
+    """Yield one decoded JSON object per non-blank line of a byte stream"""
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def iter_valid_rows(rows, validate, errors):
+    """Yield the normalized form of each valid row, collecting errors for the rest"""
+    for index, row in enumerate(rows):
+        clean, row_errors = validate(row, f"items[{index}]")
+        if row_errors:
+            errors.extend(row_errors)
+        else:
+            yield clean
+
+
+def iter_ndjson_file(file_path):
+    """Yield the JSON objects stored one per line in file_path"""
+    with open(file_path, 'rb') as f:
+        yield from iter_ndjson(f)
+
+
+def pull_page_path(pull_id):
+    return os.path.join(PULL_SPOOL_DIR, f"{pull_id}.ndjson")
+
+
+def append_pull_page(pull_id, items):
+    """Append one page of pull items to the on-disk spool for pull_id"""
+    os.makedirs(PULL_SPOOL_DIR, exist_ok=True)
+    spool_path = pull_page_path(pull_id)
+    with open(spool_path, 'a', encoding='utf-8') as f:
+        for item in items:
+            f.write(json.dumps(item) + "\n")
+    return spool_path
+
+
+def pull_pick_order(item):
+    """Sort key putting pull rows in warehouse pick order: crop, variety, size"""
+    return (
+        str(item['crop']).lower(),
+        str(item['variety_name']).lower(),
+        str(item['sku_suffix']).lower()
+    )
+
+
+def aggregate_pull_items(items):
+    """
+    Merge pull rows sharing (variety_name, crop, sku_suffix) in a single
+    hash-based pass, summing their quantities, and return the merged rows in
+    pick order along with the number of input rows consumed.
+    """
+    merged = {}
+    input_count = 0
+    for item in items:
+        input_count += 1
+        variety_name = item.get('variety_name', '')
+        crop = item.get('crop', '')
+        sku_suffix = item.get('sku_suffix', '')
+        quantity = int(item.get('quantity', 0) or 0)
+
+        key = (variety_name, crop, sku_suffix)
+        row = merged.get(key)
+        if row is None:
+            merged[key] = {
+                'variety_name': variety_name,
+                'crop': crop,
+                'sku_suffix': sku_suffix,
+                'quantity': quantity
+            }
+        else:
+            row['quantity'] += quantity
+
+    return sorted(merged.values(), key=pull_pick_order), input_count
+
+
+def create_pull_items_pdf(output, items, batch_date):
+    """
+    Create a PDF with items to pull table - black and white version
+
+    The table is drawn straight onto the canvas one row at a time and split
+    page by page with the header row repeated on every page, so items can be
+    any iterable (list, NDJSON stream, spool file) and nothing is laid out
+    ahead of the page being drawn. Returns the number of item rows drawn.
+    """
+    c = canvas.Canvas(output, pagesize=letter)
+    width, height = letter
+
+    col_widths = PULL_COL_WIDTHS
+    table_width = sum(col_widths)
+    left_x = (width - table_width) / 2
+    top_y = height - PULL_PAGE_MARGIN
+    bottom_y = PULL_PAGE_MARGIN
+
+    # Centre x of each column
+    col_centers = []
+    x = left_x
+    for col_width in col_widths:
+        col_centers.append(x + col_width / 2)
+        x += col_width
+
+    def draw_row(cells, y_top, row_height, font_name, font_size):
+        y_bottom = y_top - row_height
+        c.setLineWidth(1)
+        c.rect(left_x, y_bottom, table_width, row_height, stroke=1, fill=0)
+        x = left_x
+        for col_width in col_widths[:-1]:
+            x += col_width
+            c.line(x, y_bottom, x, y_top)
+
+        c.setFont(font_name, font_size)
+        baseline = y_bottom + (row_height - font_size) / 2 + font_size * 0.2
+        for center_x, text in zip(col_centers, cells):
+            c.drawCentredString(center_x, baseline, text)
+        return y_bottom
+
+    def draw_header(y_top):
+        return draw_row(PULL_HEADERS, y_top, PULL_HEADER_HEIGHT, 'Calibri-Bold', 12)
+
+    # Centered title with date
+    c.setFont('Helvetica-Bold', 14)
+    c.drawCentredString(width / 2, top_y - 14, f"Bulk items to pull -- {batch_date}")
+    y = draw_header(top_y - 14 - PULL_TITLE_SPACE)
+
+    count = 0
+    for item in items:
+        if y - PULL_ROW_HEIGHT < bottom_y:
+            c.showPage()
+            y = draw_header(top_y)
+
+        y = draw_row([
+            str(item.get('variety_name', '')),
+            str(item.get('crop', '')),
+            str(item.get('sku_suffix', '')),
+            str(item.get('quantity', 0))
+        ], y, PULL_ROW_HEIGHT, 'Calibri', 10)
+        count += 1
+
+    c.save()
+    print(f"Pull list PDF created for {batch_date} ({count} rows)")
+    return count
+
+
+@app.route('/generate-packing-slip', methods=['POST'])
+def generate_packing_slip():
+    if request.method == 'OPTIONS':
+        return '', 200
+    try:
+        # print("Generating packing slip PDF in flask...")
+        data, errors = VALIDATORS['packing_slip'](request.get_json(silent=True))
+        if errors:
+            return validation_failed(errors)
+        order = data.get('order')
+        
+        if not order:
+            return jsonify({'success': False, 'error': 'No order data provided'})
+        
+        order_number = order.get('order_number', 'unknown')
+        
+        # Call your existing generate_pdf function with action="view"
+        generate_pdf(order_number, order, action="view")
+        
+        # Return success response to the browser
+        return jsonify({
+            'success': True, 
+            'message': f'Packing slip for order {order_number} opened locally'
+        })
+       
+    except Exception as e:
+        print(f"Error generating packing slip PDF: {e}")
+        return jsonify({'success': False, 'error': str(e)})
+
+
+@app.route('/reprocess-order', methods=['POST', 'OPTIONS'])
+def reprocess_order():
+    if request.method == 'OPTIONS':
+        return '', 200
+    
+    try:
+        print("Reprocessing order in Flask...")
+        data, errors = VALIDATORS['reprocess_order'](request.get_json(silent=True))
+        if errors:
+            return validation_failed(errors)
+        order = data.get('order')
+        bulk_to_print = data.get('bulk_to_print', {})
+        
+    
+        if not order:
+            return jsonify({'success': False, 'error': 'No order data provided'})
+        
+        order_number = order.get('order_number', 'unknown')
+        
+        # Generate and print the packing slip
+        generate_pdf(order_number, order, action="print")
+        
 
         # TODO: Process bulk_to_print items here if needed
         # by calling print_single_front_label_logic, and print_single_back_label_logic (if back lines exist)
@@ -1127,10 +3879,35 @@ def reprocess_order():
 
 
 # GENERATES PACKING SLIPS
+# Returns False if action is "print" and the printer didn't take the slip
+@traced()
 def generate_pdf(order_number, order, action):
+    set_span_attributes(**{'order.number': order_number, 'order.action': action})
+    pdf, _, _ = cached_pdf('packing-slip', {'order': {**order, 'order_number': order_number}})
+
+    if action == "print":
+        if CURRENT_USER.lower() != "ndefe":
+            try:
+                send_pdf_to_printer(pdf)
+
+            except Exception as e:
+                print(f"Failed to print: {e}")
+                return False
+        else:
+            save_pdf(pdf, 'packing_slips', f"{order_number}_")
+
+    elif action == "view" and current_dry_run() is None:
+    
+        # The viewer needs a file of its own, left in place for it to open
+        file_path = os.path.abspath(save_pdf(pdf, 'packing_slips', f"{order['order_number']}_"))
+        os.startfile(file_path)  # This works on Windows only
+
+    return True
+
+
+def render_packing_slip(output, order_number, order):
+    """Draw an order's packing slip into output (a path or file object)"""
     # from process_orders import separate_pkts_and_bulk, sort_lineitems
-    filename = f"{order_number}.pdf"
-    file_path = f"packing_slips/{filename}"    
 
     sorted_misc_list = order.get("misc_items", [])
     sorted_bulk_list = order.get("bulk_items", [])
@@ -1194,7 +3971,7 @@ def generate_pdf(order_number, order, action):
     else:
         num_pages = 9 
             
-    c = canvas.Canvas(file_path, pagesize=letter)
+    c = canvas.Canvas(output, pagesize=letter)
     width, height = letter
 
     # Add logo
@@ -1516,187 +4293,196 @@ def generate_pdf(order_number, order, action):
         lineitem_height, counter = draw_lineitems(c, sorted_misc_list, lineitem_height, counter)
 
     c.save()
-    
-    if action == "print":
-        if CURRENT_USER.lower() != "ndefe":
-            try:
-                command = f'"{SUMATRA_PATH}" -print-to "{SHEET_PRINTER}" -print-settings "fit,portrait" -silent "{file_path}"'
-                subprocess.run(command, check=True, shell=True)
-
-            except Exception as e:
-                print(f"Failed to print: {e}")
-            finally:
-                # Clean up the file
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-                    print(f"Temporary file {file_path} deleted.")
-
-    elif action == "view":
-    
-        file_path = os.path.abspath(f"packing_slips/{order['order_number']}.pdf")  # Fixed
-        os.startfile(file_path)  # This works on Windows only
-
-    return
 
 
 # Handles printing bulk items from the process order page
 @app.route('/print-range', methods=['POST'])
 def print_range():
+    try:
 
-    items_missing_data = []
+        data, errors = VALIDATORS['print_range'](request.get_json(silent=True))
+        if errors:
+            return validation_failed(errors)
 
-    try:
+        return start_journaled_job('print_range', run_print_range, data, len(data['items']))
+        
+    except Exception as e:
+        print(f"Error printing bulk range: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+def run_print_range(data, job):
+    """
+    Print front (and back) labels for each item, journaling each item as it finishes.
+
+    Items already finished in job (when resuming) are skipped. Returns
+    (response body, status code).
+    """
+    items_missing_data = []
 
-        data = request.get_json()
-        items = data.get("items")
-        current_order_year = data.get("current_order_year")
+    items = data.get("items")
+    current_order_year = data.get("current_order_year")
         
-        if not items:
-            return jsonify({
-                'success': False,
-                'error': 'No items provided'
-            }), 400
+    total_printed = 0
+    
+    for index, item in enumerate(items):
+        quantity = int(item.get('quantity', 1))
+        env_multiplier = int(item.get('env_multiplier', 1))
+        quantity *= env_multiplier
+        sku = item.get('sku', '')
         
-        total_printed = 0
+        # Extract sku_suffix from full sku (everything after the dash)
+        sku_parts = sku.split('-')
+        sku_suffix = sku_parts[-1] if len(sku_parts) > 1 else ''
         
-        for item in items:
-            quantity = int(item.get('quantity', 1))
-            env_multiplier = int(item.get('env_multiplier', 1))
-            quantity *= env_multiplier
-            sku = item.get('sku', '')
-            
-            # Extract sku_suffix from full sku (everything after the dash)
-            sku_parts = sku.split('-')
-            sku_suffix = sku_parts[-1] if len(sku_parts) > 1 else ''
-            
-            lot_code = item.get('lot', '')
-            germination = item.get('germination', '')
-            for_year = item.get('for_year', '')
-            if not lot_code or not germination or not for_year:
-                print(f"Item {sku} is missing lot, germination, or for_year")
-                items_missing_data.append(sku)
-                continue  # Skip this item and move to the next
+        lot_code = item.get('lot', '')
+        germination = item.get('germination', '')
+        for_year = item.get('for_year', '')
 
+        if job.is_done(str(index)):
+            print(f"Skipping item {sku} (already printed)")
+            continue
+        job.checkpoint()
 
-            try:
-                for_year_int = int(for_year)
-                current_year_int = int(current_order_year) if current_order_year else 0
-                
-                if for_year_int < current_year_int:
-                    print(f"Item {sku} germination for_year ({for_year_int}) is less than current_order_year ({current_year_int})")
-                    items_missing_data.append(sku)
-                    continue  # Skip this item
-                    
-            except (ValueError, TypeError):
-                print(f"Item {sku} has invalid for_year ({for_year}) or current_order_year ({current_order_year})")
+        if not lot_code or not germination or not for_year:
+            print(f"Item {sku} is missing lot, germination, or for_year")
+            items_missing_data.append(sku)
+            continue  # Skip this item and move to the next
+
+
+        try:
+            for_year_int = int(for_year)
+            current_year_int = int(current_order_year) if current_order_year else 0
+            
+            if for_year_int < current_year_int:
+                print(f"Item {sku} germination for_year ({for_year_int}) is less than current_order_year ({current_year_int})")
                 items_missing_data.append(sku)
                 continue  # Skip this item
+                
+        except (ValueError, TypeError):
+            print(f"Item {sku} has invalid for_year ({for_year}) or current_order_year ({current_order_year})")
+            items_missing_data.append(sku)
+            continue  # Skip this item
+
+
+        # Prepare data for printing functions
+        print_data = {
+            'variety_name': item.get('variety_name'),
+            'crop': item.get('crop'),
+            'common_name': item.get('common_name'),
+            'days': item.get('days'),
+            'sku_suffix': sku_suffix,
+            'pkg_size': item.get('pkg_size'),
+            'env_type': item.get('env_type'),
+            'lot_code': item.get('lot', 'N/A'),
+            'germination': item.get('germination', 'N/A'), 
+            'for_year': item.get('for_year', 'N/A'),  
+            'quantity': quantity,
+            'desc1': item.get('desc1'),
+            'desc2': item.get('desc2'),
+            'desc3': item.get('desc3'),
+            'rad_type': item.get('rad_type')
+        }
 
-
-            # Prepare data for printing functions
-            print_data = {
-                'variety_name': item.get('variety_name'),
-                'crop': item.get('crop'),
-                'common_name': item.get('common_name'),
-                'days': item.get('days'),
-                'sku_suffix': sku_suffix,
-                'pkg_size': item.get('pkg_size'),
-                'env_type': item.get('env_type'),
-                'lot_code': item.get('lot', 'N/A'),
-                'germination': item.get('germination', 'N/A'), 
-                'for_year': item.get('for_year', 'N/A'),  
+        # Print back labels first if needed
+        if item.get('print_back', False):
+            back_data = {
                 'quantity': quantity,
-                'desc1': item.get('desc1'),
-                'desc2': item.get('desc2'),
-                'desc3': item.get('desc3'),
-                'rad_type': item.get('rad_type')
+                'back1': item.get('back1'),
+                'back2': item.get('back2'),
+                'back3': item.get('back3'),
+                'back4': item.get('back4'),
+                'back5': item.get('back5'),
+                'back6': item.get('back6'),
+                'back7': item.get('back7')
             }
-   
-            # Print back labels first if needed
-            if item.get('print_back', False):
-                back_data = {
-                    'quantity': quantity,
-                    'back1': item.get('back1'),
-                    'back2': item.get('back2'),
-                    'back3': item.get('back3'),
-                    'back4': item.get('back4'),
-                    'back5': item.get('back5'),
-                    'back6': item.get('back6'),
-                    'back7': item.get('back7')
-                }
-                
-                # Call the back label printing logic directly
-                result = print_single_back_label_logic(back_data)
-                if not result.get('success'):
-                    return jsonify(result), 500
             
-            # Print front labels
-            result = print_single_front_label_logic(print_data)
+            # Call the back label printing logic directly
+            result = print_single_back_label_logic(back_data)
             if not result.get('success'):
-                return jsonify(result), 500
-                
-            total_printed += quantity
-        
-        # ONLY CHANGE: Include items_missing_data in response
-        response = {
-            'success': True,
-            'message': f'Printed {total_printed} bulk labels successfully',
-        }
+                return result, 500
         
-        if items_missing_data:
-            response['items_missing_data'] = items_missing_data
-            
-        return jsonify(response)
+        # Print front labels
+        result = print_single_front_label_logic(print_data)
+        if not result.get('success'):
+            return result, 500
+
+        job.record(str(index), sku=sku, lot=lot_code)
+        total_printed += quantity
+    
+    # ONLY CHANGE: Include items_missing_data in response
+    response = {
+        'success': True,
+        'message': f'Printed {total_printed} bulk labels successfully',
+    }
+    
+    if items_missing_data:
+        response['items_missing_data'] = items_missing_data
         
-    except Exception as e:
-        print(f"Error printing bulk range: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    return response, 200
 
 
 @app.route('/print-envelope-table', methods=['POST'])
 def print_envelope_table():
     """
     Receive envelope data and either print to console or create PDF and print
+
+    Usage can be sent as raw rows ('usage_rows': [{year, envelope_type,
+    count}, ...]), as columns ('usage_columns': {'year': [...],
+    'envelope_type': [...], 'count': [...]}) or pre-aggregated per year
+    ('envelope_data_by_year'). Either way it is reduced to one envelope
+    matrix that both the console table and the PDF are drawn from.
     """
     try:
         # Get JSON data from request
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({
-                'success': False,
-                'error': 'No data received'
-            }), 400
+        data, errors = VALIDATORS['envelope_table'](request.get_json(silent=True))
+        if errors:
+            return validation_failed(errors)
         
         print(f"Received envelope data for printing from user: {CURRENT_USER}")
         print(f"Data keys: {list(data.keys())}")
         
         # Extract envelope data
-        envelope_data_by_year = data.get('envelope_data_by_year', {})
         years = data.get('years', [])
-        grand_total = data.get('grand_total', 0)
         envelope_types = data.get('envelope_types', [])
         report_title = data.get('report_title', 'Envelope Usage Report')
-        
-        if not envelope_data_by_year:
+
+        if data.get('usage_columns'):
+            columns = data['usage_columns']
+            year_col = columns.get('year', [])
+            type_col = columns.get('envelope_type', [])
+            count_col = columns.get('count', [])
+        elif data.get('usage_rows'):
+            rows = data['usage_rows']
+            year_col = [row.get('year') for row in rows]
+            type_col = [row.get('envelope_type') for row in rows]
+            count_col = [row.get('count', 0) for row in rows]
+        else:
+            year_col, type_col, count_col = flatten_envelope_data_by_year(
+                data.get('envelope_data_by_year', {})
+            )
+
+        if not count_col:
             return jsonify({
                 'success': False,
                 'error': 'No envelope data found'
             }), 400
+
+        matrix = build_envelope_matrix(year_col, type_col, count_col, years, envelope_types)
         
         # Check current user and handle accordingly
         if CURRENT_USER.lower() == "ndefe":
-            print_console_table(envelope_data_by_year, years, grand_total, report_title)
+            print_console_table(matrix, report_title)
             return jsonify({
                 'success': True,
                 'message': 'Table printed to console',
                 'user': CURRENT_USER
             }), 200
         else:
-            return create_and_print_pdf(envelope_data_by_year, years, grand_total, envelope_types, report_title)
+            return create_and_print_pdf(matrix, report_title)
             
     except Exception as e:
         print(f"Error in print_envelope_table: {str(e)}")
@@ -1706,10 +4492,83 @@ def print_envelope_table():
         }), 500
 
 
-def print_console_table(envelope_data_by_year, years, grand_total, report_title):
+def flatten_envelope_data_by_year(envelope_data_by_year):
+    """Turn the browser's per-year envelope_counts dicts into year/type/count columns"""
+    year_col, type_col, count_col = [], [], []
+    for year, year_data in envelope_data_by_year.items():
+        envelope_counts = year_data.get('envelope_counts', {})
+        year_col.extend([year] * len(envelope_counts))
+        type_col.extend(envelope_counts.keys())
+        count_col.extend(envelope_counts.values())
+    return year_col, type_col, count_col
+
+
+def envelope_year_sort_key(year):
+    """Sort years numerically where possible ('2024' before '2025' before 'n/a')"""
+    return (0, int(year), '') if year.isdigit() else (1, 0, year)
+
+
+def build_envelope_matrix(year_col, type_col, count_col, years=None, envelope_types=None):
+    """
+    Aggregate envelope usage columns into a year-by-type matrix.
+
+    The year and type columns are encoded to integer codes, then every count
+    is added into one flat cell list at code arithmetic offsets, so the cost
+    is a single pass over the columns however many orders they came from.
+    If years is given only those years are reported; envelope_types adds
+    types that should appear even with no usage.
+
+    Returns a dict with 'years', 'envelope_types', 'rows' (one list of
+    per-year counts per envelope type), 'row_totals', 'year_totals' and
+    'grand_total'.
+    """
+    year_codes = {}
+    type_codes = {}
+    year_idx = [year_codes.setdefault(str(year), len(year_codes)) for year in year_col]
+    type_idx = [type_codes.setdefault(str(env_type), len(type_codes)) for env_type in type_col]
+    for env_type in envelope_types or []:
+        type_codes.setdefault(str(env_type), len(type_codes))
+
+    width = len(type_codes)
+    cells = [0] * (len(year_codes) * width)
+    for y, t, count in zip(year_idx, type_idx, count_col):
+        cells[y * width + t] += int(count or 0)
+
+    if years:
+        report_years = sorted({str(year) for year in years}, key=envelope_year_sort_key)
+    else:
+        report_years = sorted(year_codes, key=envelope_year_sort_key)
+    report_types = sorted(type_codes)
+
+    # Column offset of each reported year in the flat cell list (None = no usage)
+    year_offsets = [year_codes.get(year) for year in report_years]
+
+    rows = []
+    for env_type in report_types:
+        t = type_codes[env_type]
+        rows.append([0 if y is None else cells[y * width + t] for y in year_offsets])
+
+    row_totals = [sum(row) for row in rows]
+    year_totals = [sum(column) for column in zip(*rows)] if rows else [0] * len(report_years)
+
+    return {
+        'years': report_years,
+        'envelope_types': report_types,
+        'rows': rows,
+        'row_totals': row_totals,
+        'year_totals': year_totals,
+        'grand_total': sum(row_totals),
+    }
+
+
+def print_console_table(matrix, report_title):
     """
     Print a nicely formatted table to the console for ndefe user
     """
+    years = matrix['years']
+    envelope_types = matrix['envelope_types']
+    grand_total = matrix['grand_total']
+
     print("\n" + "="*80)
     print(f"{report_title:^80}")
     print("="*80)
@@ -1717,49 +4576,32 @@ def print_console_table(envelope_data_by_year, years, grand_total, report_title)
     print(f"Grand Total Envelopes: {grand_total:,}")
     print("="*80)
     
-    # Get all unique envelope types across all years
-    all_envelope_types = set()
-    for year_data in envelope_data_by_year.values():
-        all_envelope_types.update(year_data['envelope_counts'].keys())
-    all_envelope_types = sorted(all_envelope_types)
-    
-    # Create header
-    header = ["Envelope Type"] + [str(year) for year in sorted(years)] + ["Total"]
-    
     # Calculate column widths
-    max_type_width = max(len("Envelope Type"), max(len(env_type) for env_type in all_envelope_types) if all_envelope_types else 0)
+    max_type_width = max([len("Envelope Type")] + [len(env_type) for env_type in envelope_types])
     year_width = 10
     total_width = 12
+    separator = "-" * (max_type_width + len(years) * (year_width + 1) + total_width + 1)
     
     # Print header
     print(f"{'Envelope Type':<{max_type_width}} ", end="")
-    for year in sorted(years):
-        print(f"{str(year):>{year_width}} ", end="")
+    for year in years:
+        print(f"{year:>{year_width}} ", end="")
     print(f"{'Total':>{total_width}}")
     
     # Print separator
-    print("-" * (max_type_width + len(years) * (year_width + 1) + total_width + 1))
+    print(separator)
     
     # Print data rows
-    for env_type in all_envelope_types:
-        row_total = 0
+    for env_type, row, row_total in zip(envelope_types, matrix['rows'], matrix['row_totals']):
         print(f"{env_type:<{max_type_width}} ", end="")
-        
-        for year in sorted(years):
-            year_str = str(year)
-            count = envelope_data_by_year.get(year_str, {}).get('envelope_counts', {}).get(env_type, 0)
-            row_total += count
+        for count in row:
             print(f"{count:>{year_width},} ", end="")
-        
         print(f"{row_total:>{total_width},}")
     
     # Print totals row
-    print("-" * (max_type_width + len(years) * (year_width + 1) + total_width + 1))
+    print(separator)
     print(f"{'TOTAL':<{max_type_width}} ", end="")
-    
-    for year in sorted(years):
-        year_str = str(year)
-        year_total = envelope_data_by_year.get(year_str, {}).get('total', 0)
+    for year_total in matrix['year_totals']:
         print(f"{year_total:>{year_width},} ", end="")
     
     print(f"{grand_total:>{total_width},}")
@@ -1767,18 +4609,15 @@ def print_console_table(envelope_data_by_year, years, grand_total, report_title)
     print()
 
 
-def create_and_print_pdf(envelope_data_by_year, years, grand_total, envelope_types, report_title):
+def create_and_print_pdf(matrix, report_title):
     """
-    Create a PDF report and print it
+    Create a PDF report of an envelope matrix and print it
     """
-    # Create temporary file
-    temp_file = tempfile.NamedTemporaryFile(suffix='.pdf', delete=False)
-    file_path = temp_file.name
-    temp_file.close()
+    pdf = io.BytesIO()
     
     try:
         # Create PDF document
-        doc = SimpleDocTemplate(file_path, pagesize=letter,
+        doc = SimpleDocTemplate(pdf, pagesize=letter,
                               rightMargin=72, leftMargin=72,
                               topMargin=72, bottomMargin=18)
         
@@ -1800,40 +4639,21 @@ def create_and_print_pdf(envelope_data_by_year, years, grand_total, envelope_typ
         elements.append(title)
         
         # Subtitle with generation info
+        grand_total = matrix['grand_total']
         subtitle_text = f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | Grand Total: {grand_total:,} Envelopes"
         subtitle = Paragraph(subtitle_text, styles['Normal'])
         elements.append(subtitle)
         elements.append(Spacer(1, 20))
         
-        # Prepare table data
-        sorted_years = sorted(years)
-        sorted_envelope_types = sorted(envelope_types)
-        
         # Table header
-        table_data = [["Envelope Type"] + [str(year) for year in sorted_years] + ["Total"]]
+        table_data = [["Envelope Type"] + matrix['years'] + ["Total"]]
         
         # Table rows
-        for env_type in sorted_envelope_types:
-            row = [env_type]
-            row_total = 0
-            
-            for year in sorted_years:
-                year_str = str(year)
-                count = envelope_data_by_year.get(year_str, {}).get('envelope_counts', {}).get(env_type, 0)
-                row.append(f"{count:,}")
-                row_total += count
-            
-            row.append(f"{row_total:,}")
-            table_data.append(row)
+        for env_type, row, row_total in zip(matrix['envelope_types'], matrix['rows'], matrix['row_totals']):
+            table_data.append([env_type] + [f"{count:,}" for count in row] + [f"{row_total:,}"])
         
         # Totals row
-        totals_row = ["TOTAL"]
-        for year in sorted_years:
-            year_str = str(year)
-            year_total = envelope_data_by_year.get(year_str, {}).get('total', 0)
-            totals_row.append(f"{year_total:,}")
-        totals_row.append(f"{grand_total:,}")
-        table_data.append(totals_row)
+        table_data.append(["TOTAL"] + [f"{year_total:,}" for year_total in matrix['year_totals']] + [f"{grand_total:,}"])
         
         # Create table
         table = Table(table_data)
@@ -1871,19 +4691,17 @@ def create_and_print_pdf(envelope_data_by_year, years, grand_total, envelope_typ
         
         # Build PDF
         doc.build(elements)
-        print(f"PDF created successfully: {file_path}")
+        print(f"PDF created successfully: {report_title}")
         
         # Print the PDF
         if CURRENT_USER.lower() != "ndefe":
             try:
-                command = f'"{SUMATRA_PATH}" -print-to "{SHEET_PRINTER}" -print-settings "fit,portrait" -silent "{file_path}"'
-                subprocess.run(command, check=True, shell=True)
+                send_pdf_to_printer(pdf.getvalue())
                 print(f"Successfully printed envelope report")
                 
                 return jsonify({
                     'success': True,
-                    'message': 'PDF created and sent to printer successfully',
-                    'filename': os.path.basename(file_path)
+                    'message': 'PDF created and sent to printer successfully'
                 }), 200
                 
             except subprocess.CalledProcessError as e:
@@ -1905,15 +4723,6 @@ def create_and_print_pdf(envelope_data_by_year, years, grand_total, envelope_typ
             'success': False,
             'error': f'Failed to create PDF: {str(e)}'
         }), 500
-    
-    finally:
-        # Clean up the temporary file
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-                print(f"Temporary file {file_path} deleted.")
-            except Exception as e:
-                print(f"Warning: Could not delete temporary file {file_path}: {e}")
 
 
 @app.route('/print-address-labels', methods=['POST'])
@@ -1944,8 +4753,7 @@ def print_address_labels():
                 }), 404
             
             try:
-                command = f'"{SUMATRA_PATH}" -print-to "{SHEET_PRINTER}" -print-settings "fit,portrait" -silent "{pdf_path}"'
-                subprocess.run(command, check=True, shell=True)
+                send_pdf_to_printer(pdf_path)
                 print(f"Successfully printed address labels from {pdf_path}")
                 
                 return jsonify({
@@ -1981,10 +4789,9 @@ def print_stock_seed_label():
     Handle stock seed label printing requests
     """
     try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({'error': 'No data provided'}), 400
+        data, errors = VALIDATORS['stock_seed_label'](request.get_json(silent=True))
+        if errors:
+            return validation_failed(errors)
         
         # Extract the data
         variety = data.get('variety', 'Unknown')
@@ -2013,56 +4820,19 @@ def print_stock_seed_label():
         else:
             # Print actual label for other users
             try:
-                # Format the variety name with single quotes
-                variety_formatted = f"'{variety}'"
-                
                 # Setup printer
                 printer_name = ROLL_PRINTER
-                dc = win32ui.CreateDC()
-                dc.CreatePrinterDC(printer_name)
-                
-                dc.StartDoc("Stock Seed Label")
-                dc.StartPage()
-                
-                # Label dimensions - same as your other labels
-                dpi = dc.GetDeviceCaps(88)
-                label_width = int(2.625 * dpi)
-                label_height = int(1.0 * dpi)
-                x_center = label_width // 2
-                
-                # Create bold font at size 54
-                bold_font = create_font("Times New Roman", 54, bold=True)
-                dc.SelectObject(bold_font)
-                
-                # Starting Y position
-                y_start = 20
-                line_height = 70  # Increased spacing between rows
+                with printer_lock(printer_name):
+                    dc = open_printer_dc(printer_name)
                 
-                # Line 1: "* STOCK SEED *"
-                header_text = "* STOCK SEED *"
-                text_width = dc.GetTextExtent(header_text)[0]
-                dc.TextOut(x_center - text_width // 2, y_start, header_text)
-                y_start += line_height
+                    dc.StartDoc("Stock Seed Label")
+                    dc.StartPage()
+                    draw_stock_seed_label(dc, FontCache(), data)
                 
-                # Line 2: Variety name in single quotes
-                text_width = dc.GetTextExtent(variety_formatted)[0]
-                dc.TextOut(x_center - text_width // 2, y_start, variety_formatted)
-                y_start += line_height
-                
-                # Line 3: Vegetable type
-                text_width = dc.GetTextExtent(crop)[0]
-                dc.TextOut(x_center - text_width // 2, y_start, crop)
-                y_start += line_height
-                
-                # Line 4: "Lot: " + lot number
-                lot_text = f"Lot: {lot_number}"
-                text_width = dc.GetTextExtent(lot_text)[0]
-                dc.TextOut(x_center - text_width // 2, y_start, lot_text)
-                
-                # Finalize print job
-                dc.EndPage()
-                dc.EndDoc()
-                dc.DeleteDC()
+                    # Finalize print job
+                    dc.EndPage()
+                    dc.EndDoc()
+                    dc.DeleteDC()
                 
                 return jsonify({
                     'success': True,
@@ -2081,36 +4851,70 @@ def print_stock_seed_label():
         return jsonify({'error': str(e)}), 500
 
 
+def draw_stock_seed_label(dc, fonts, data):
+    """Draw a stock seed label onto the current page of a roll printer DC"""
+    # Format the variety name with single quotes
+    variety_formatted = f"'{data.get('variety', 'Unknown')}'"
+    crop = data.get('crop', 'Unknown')
+    lot_number = data.get('lot_number', 'Unknown')
+
+    # Label dimensions - same as your other labels
+    dpi = dc.GetDeviceCaps(88)
+    label_width = int(2.625 * dpi)
+    label_height = int(1.0 * dpi)
+    x_center = label_width // 2
+
+    # Create bold font at size 54
+    dc.SelectObject(fonts("Times New Roman", 54, bold=True))
+
+    # Starting Y position
+    y_start = 20
+    line_height = 70  # Increased spacing between rows
+
+    # Line 1: "* STOCK SEED *"
+    header_text = "* STOCK SEED *"
+    text_width = dc.GetTextExtent(header_text)[0]
+    dc.TextOut(x_center - text_width // 2, y_start, header_text)
+    y_start += line_height
+
+    # Line 2: Variety name in single quotes
+    text_width = dc.GetTextExtent(variety_formatted)[0]
+    dc.TextOut(x_center - text_width // 2, y_start, variety_formatted)
+    y_start += line_height
+
+    # Line 3: Vegetable type
+    text_width = dc.GetTextExtent(crop)[0]
+    dc.TextOut(x_center - text_width // 2, y_start, crop)
+    y_start += line_height
+
+    # Line 4: "Lot: " + lot number
+    lot_text = f"Lot: {lot_number}"
+    text_width = dc.GetTextExtent(lot_text)[0]
+    dc.TextOut(x_center - text_width // 2, y_start, lot_text)
+
+
 @app.route('/print-pick-list', methods=['POST'])
 def print_pick_list():
     """
     Handle pick list printing for store orders
     """
     try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({'success': False, 'error': 'No data provided'}), 400
+        data, errors = VALIDATORS['pick_list'](request.get_json(silent=True))
+        if errors:
+            return validation_failed(errors)
         
         order_id = data.get('order_id')
         order_number = data.get('order_number', 'Unknown')
-        store_name = data.get('store_name', 'Unknown')
         items = data.get('items', [])
         
         if not items:
             return jsonify({'success': False, 'error': 'No items provided'}), 400
         
         # Generate the PDF (regardless of user)
-        filename = f"pick_list_{order_number}.pdf"
-        filepath = os.path.join("store_pick_lists", filename)
-        
-        # Ensure directory exists
-        os.makedirs("store_pick_lists", exist_ok=True)
-        
-        # Create the pick list PDF
-        generate_pick_list_pdf(filepath, order_number, store_name, items)
+        pdf, _, _ = cached_pdf('pick-list', data)
         
         if CURRENT_USER.lower() == "ndefe":
+            filepath = save_pdf(pdf, "store_pick_lists", f"pick_list_{order_number}_")
             print(f"\nPick list saved to {filepath}")
             return jsonify({
                 'success': True,
@@ -2119,25 +4923,19 @@ def print_pick_list():
         else:
             # Print using Sumatra
             try:
-                command = f'"{SUMATRA_PATH}" -print-to "{SHEET_PRINTER}" -print-settings "fit,portrait" -silent "{filepath}"'
-                subprocess.run(command, check=True, shell=True)
-                print(f"Successfully printed pick list {filename}")
+                send_pdf_to_printer(pdf)
+                print(f"Successfully printed pick list for order {order_number}")
                 
                 return jsonify({
                     'success': True,
                     'message': f'Pick list for {len(items)} items sent to printer'
                 })
             except Exception as e:
-                print(f"Failed to print pick list {filename}: {e}")
+                print(f"Failed to print pick list for order {order_number}: {e}")
                 return jsonify({
                     'success': False,
                     'error': f'Failed to print: {str(e)}'
                 }), 500
-            finally:
-                # Clean up the file
-                if os.path.exists(filepath):
-                    os.remove(filepath)
-                    print(f"Temporary file {filename} deleted.")
         
     except Exception as e:
         logging.error(f"Error printing pick list: {str(e)}")
@@ -2149,24 +4947,78 @@ def print_pick_list():
         }), 500
 
 
-def generate_pick_list_pdf(filepath, order_number, store_name, items):
-    print("====== ITEMS TO PRINT ======")
-    # print(items)
+class PagedTable(Flowable):
     """
-    Generate a pick list PDF using ReportLab Platypus
+    A table that is only laid out one page at a time.
+
+    Every row must have the same height, which lets split() work out in O(1)
+    how many rows fit on the page and hand ReportLab a LongTable holding just
+    that page's rows (with the header repeated), while the remainder keeps
+    pointing into the same row list. Per-row cost stays flat however long
+    the table is, instead of re-measuring every remaining row on each split.
+
+    band_styles is a pair of TableStyles used for chunks starting on an even
+    and an odd row respectively, so ROWBACKGROUNDS banding stays in step
+    across pages.
+    """
+
+    def __init__(self, header, rows, col_widths, header_height, row_height,
+                 band_styles, start=0, hAlign='LEFT'):
+        Flowable.__init__(self)
+        self.header = header
+        self.rows = rows
+        self.col_widths = col_widths
+        self.header_height = header_height
+        self.row_height = row_height
+        self.band_styles = band_styles
+        self.start = start
+        self.hAlign = hAlign
+
+    def _remaining(self):
+        return len(self.rows) - self.start
+
+    def _page_table(self, end):
+        page_rows = self.rows[self.start:end]
+        table = LongTable(
+            [self.header] + page_rows,
+            colWidths=self.col_widths,
+            rowHeights=[self.header_height] + [self.row_height] * len(page_rows),
+            hAlign=self.hAlign
+        )
+        table.setStyle(self.band_styles[self.start % 2])
+        return table
+
+    def wrap(self, availWidth, availHeight):
+        self.width = sum(self.col_widths)
+        self.height = self.header_height + self._remaining() * self.row_height
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        fit = int((availHeight - self.header_height) // self.row_height)
+        if fit <= 0:
+            return []
+        if fit >= self._remaining():
+            return [self._page_table(len(self.rows))]
+        rest = PagedTable(self.header, self.rows, self.col_widths, self.header_height,
+                          self.row_height, self.band_styles, self.start + fit, self.hAlign)
+        return [self._page_table(self.start + fit), rest]
+
+    def draw(self):
+        table = self._page_table(len(self.rows))
+        table.wrapOn(self.canv, self.width, self.height)
+        table.drawOn(self.canv, 0, 0)
+
+
+@functools.lru_cache(maxsize=None)
+def get_pick_list_styles(has_photos):
+    """
+    Build the pick list paragraph and table styles once per process.
+
+    Zebra striping uses a single ROWBACKGROUNDS command, so the style has
+    the same handful of commands no matter how many rows the list has.
     """
-    from reportlab.lib.styles import ParagraphStyle, TA_RIGHT
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-    
-    # Create PDF document
-    doc = SimpleDocTemplate(filepath, pagesize=letter,
-                            leftMargin=40, rightMargin=40,
-                            topMargin=40, bottomMargin=40)
-    
     styles = getSampleStyleSheet()
-    elements = []
-    
-    # Custom styles
+
     header_style = ParagraphStyle(
         name="HeaderBigBold",
         parent=styles["Normal"],
@@ -2174,13 +5026,7 @@ def generate_pick_list_pdf(filepath, order_number, store_name, items):
         fontSize=16,
         spaceAfter=6,
     )
-    
-    # small_right = ParagraphStyle(
-    #     name="RightSmall",
-    #     parent=styles["Normal"],
-    #     fontSize=12,
-    #     alignment=TA_RIGHT,
-    # )
+
     small_right = ParagraphStyle(
         name="RightSmall",
         parent=styles["Normal"],
@@ -2188,6 +5034,51 @@ def generate_pick_list_pdf(filepath, order_number, store_name, items):
         fontSize=12,
         alignment=TA_RIGHT,
     )
+
+    header_table_style = TableStyle([
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+    ])
+
+    # Table style
+    table_commands = [
+        ('FONTNAME', (0, 0), (-1, 0), 'Calibri-Bold'),  # Changed from Helvetica-Bold
+        ('FONTNAME', (0, 1), (-1, -1), 'Calibri'),      # Add this line for table body
+        ('FONTSIZE', (0, 0), (-1, -1), 11),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+    ]
+
+    if has_photos:
+        table_commands.append(('ALIGN', (0, 0), (2, -1), 'CENTER'))  # Center Photo, Seed and Qty columns
+    else:
+        table_commands.append(('ALIGN', (0, 0), (1, -1), 'CENTER'))  # Center Seed and Qty columns
+
+    # Shade every other item row, starting with the first item of the list;
+    # the second style is for page chunks that start on an odd item
+    band_styles = (
+        TableStyle(table_commands + [('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.whitesmoke, None])]),
+        TableStyle(table_commands + [('ROWBACKGROUNDS', (0, 1), (-1, -1), [None, colors.whitesmoke])]),
+    )
+
+    return header_style, small_right, header_table_style, band_styles
+
+
+def generate_pick_list_pdf(output, order_number, store_name, items):
+    """
+    Generate a pick list PDF using ReportLab Platypus
+    """
+    print("====== ITEMS TO PRINT ======")
+
+    # Check if any items have photos
+    has_photos = any(item.get('has_photo', False) for item in items)
+
+    header_style, small_right, header_table_style, band_styles = get_pick_list_styles(has_photos)
+    
+    # Create PDF document
+    doc = SimpleDocTemplate(output, pagesize=letter,
+                            leftMargin=40, rightMargin=40,
+                            topMargin=40, bottomMargin=40)
     
     # First row: Order Number + Store Name (big and bold), Date (right-aligned)
     left_header = Paragraph(f"{order_number} &nbsp;&nbsp;&nbsp; {store_name}", header_style)
@@ -2201,21 +5092,16 @@ def generate_pick_list_pdf(filepath, order_number, store_name, items):
         [[left_header, right_header]],
         colWidths=[400, 130]
     )
-    header_table.setStyle(TableStyle([
-        ("VALIGN", (0, 0), (-1, -1), "TOP"),
-    ]))
+    header_table.setStyle(header_table_style)
     
     elements = [header_table, Spacer(1, 12)]
     
-    # Check if any items have photos
-    has_photos = any(item.get('has_photo', False) for item in items)
-    
     # Build table data
     headers = ["Photo", "Seed", "Qty", "Variety", "Crop"]  # Swapped Photo and Seed
     if not has_photos:
         headers = ["Seed", "Qty", "Variety", "Crop"]  # When no photos, only show Seed
         
-    data = [headers]
+    data = []
     for item in items:
         if has_photos:
             # Show checkmark if photo is NOT needed, empty if photo IS needed
@@ -2236,41 +5122,14 @@ def generate_pick_list_pdf(filepath, order_number, store_name, items):
     else:
         col_widths = [50, 50, 200, 180]
     
-    # Create the table
-    table = Table(data, colWidths=col_widths, repeatRows=1, hAlign='LEFT')
-    
-    # Table style
-    style = TableStyle([
-        ('FONTNAME', (0, 0), (-1, 0), 'Calibri-Bold'),  # Changed from Helvetica-Bold
-        ('FONTNAME', (0, 1), (-1, -1), 'Calibri'),      # Add this line for table body
-        ('FONTSIZE', (0, 0), (-1, -1), 11),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('GRID', (0, 0), (-1, -1), 0.25, colors.grey)
-    ])
-    
-    if has_photos:
-        style.add('ALIGN', (0, 0), (0, -1), 'CENTER')  # Center Photo column (now first)
-        style.add('ALIGN', (1, 0), (1, -1), 'CENTER')  # Center Seed checkbox column (now second)
-        style.add('ALIGN', (2, 0), (2, -1), 'CENTER')  # Center Qty column
-    else:
-        style.add('ALIGN', (0, 0), (0, -1), 'CENTER')  # Center Seed checkbox column
-        style.add('ALIGN', (1, 0), (1, -1), 'CENTER')  # Center Qty column
-    
-    if has_photos:
-        style.add('ALIGN', (1, 0), (1, -1), 'CENTER')  # Center Photo column
-    
-    # Shade every other row
-    for i in range(1, len(data)):
-        if i % 2 == 1:
-            style.add('BACKGROUND', (0, i), (-1, i), colors.whitesmoke)
-    
-    table.setStyle(style)
+    # Create the table, laid out a page at a time with the header repeated
+    table = PagedTable(headers, data, col_widths, PICK_LIST_HEADER_HEIGHT,
+                       PICK_LIST_ROW_HEIGHT, band_styles, hAlign='LEFT')
     elements.append(table)
     
     # Build the PDF
     doc.build(elements)
-    print(f"Pick list PDF created: {filepath}")
+    print(f"Pick list PDF created for order {order_number}")
 
 
 @app.route('/print-store-order-invoice', methods=['POST'])
@@ -2279,10 +5138,9 @@ def print_store_order_invoice():
     Handle invoice printing for finalized store orders
     """
     try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({'success': False, 'error': 'No data provided'}), 400
+        data, errors = VALIDATORS['store_invoice'](request.get_json(silent=True))
+        if errors:
+            return validation_failed(errors)
         
         order = data.get('order', {})
         store = data.get('store', {})
@@ -2324,9 +5182,49 @@ def print_store_order_invoice():
         }), 500
 
 
+@traced()
 def generate_store_invoice_pdf(order, store, items):
     """
-    Generate store invoice PDF using BaseDocTemplate approach
+    Generate, keep a copy of and print a store invoice, then its two order labels
+    """
+    order_number = order.get('order_number', 'Unknown')
+    store_name = store.get('store_name', 'Unknown').replace('/', '-')
+    file_path = f"store_invoices/{store_name}_{order_number}.pdf"
+    pdf, _, _ = cached_pdf('invoice', {'order': order, 'store': store, 'items': items})
+
+    # Keep a copy of every invoice: written beside the old one and renamed
+    # over it, so a reprint running at the same time never sees half a file
+    if current_dry_run() is None:
+        os.replace(save_pdf(pdf, "store_invoices", f".{store_name}_{order_number}_"), file_path)
+        print(f"Store invoice PDF created: {file_path}")
+    
+    if CURRENT_USER.lower() != "ndefe":
+        try:
+            # Print the invoice PDF
+            send_pdf_to_printer(pdf)
+            print(f"Successfully printed invoice {file_path}")
+            
+            # Print two labels on roll printer
+            order_label = f"Order #: {order_number}"
+            store_label = store.get('store_name', 'Unknown')
+            
+            # First label (smaller font - for inside)
+            print_order_label(order_label, store_label, font_size_order=56, font_size_store=48, y_start=20)
+            
+            # Second label (larger font - for outside)
+            print_order_label(order_label, store_label, font_size_order=64, font_size_store=54, y_start=80)
+            
+        except Exception as e:
+            print(f"Failed to print invoice: {e}")
+            import traceback
+            traceback.print_exc()
+    else:
+        print(f"{store.get('store_name')}_{order_number}.pdf saved in store_invoices/ dir")
+
+
+def render_store_invoice(output, order, store, items):
+    """
+    Draw a store invoice into output (a path or file object) using BaseDocTemplate approach
     """
     from reportlab.platypus import BaseDocTemplate, PageTemplate, Frame, NextPageTemplate
     from datetime import datetime, timedelta 
@@ -2349,13 +5247,7 @@ def generate_store_invoice_pdf(order, store, items):
     store_state = store.get('state', '')          
     store_zip = store.get('zip', '')              
 
-    # Setup file path
     order_number = order.get('order_number', 'Unknown')
-    store_name = store.get('store_name', 'Unknown').replace('/', '-')
-    file_path = f"store_invoices/{store_name}_{order_number}.pdf"
-    
-    # Ensure directory exists
-    os.makedirs("store_invoices", exist_ok=True)
 
     width, height = letter
     styles = getSampleStyleSheet()
@@ -2581,7 +5473,7 @@ def generate_store_invoice_pdf(order, store, items):
         canvas.line(0, height - 40, width - 0, height - 40)
     
     # Set up the document
-    doc = BaseDocTemplate(file_path, pagesize=letter)
+    doc = BaseDocTemplate(output, pagesize=letter)
     doc.addPageTemplates([
         PageTemplate(id='FirstPage', frames=first_page_frame, onPage=on_first_page),
         PageTemplate(id='LaterPages', frames=later_pages_frame, onPage=on_later_pages)
@@ -2595,72 +5487,60 @@ def generate_store_invoice_pdf(order, store, items):
     
     # Build the PDF
     doc.build(elements)
-    print(f"Store invoice PDF created: {file_path}")
-    
-    if CURRENT_USER.lower() != "ndefe":
-        try:
-            # Print the invoice PDF
-            command = f'"{SUMATRA_PATH}" -print-to "{SHEET_PRINTER}" -print-settings "fit,portrait" -silent "{file_path}"'
-            subprocess.run(command, check=True, shell=True)
-            print(f"Successfully printed invoice {file_path}")
-            
-            # Print two labels on roll printer
-            order_label = f"Order #: {order_number}"
-            store_label = store.get('store_name', 'Unknown')
-            
-            # First label (smaller font - for inside)
-            print_order_label(order_label, store_label, font_size_order=56, font_size_store=48, y_start=20)
-            
-            # Second label (larger font - for outside)
-            print_order_label(order_label, store_label, font_size_order=64, font_size_store=54, y_start=80)
-            
-        except Exception as e:
-            print(f"Failed to print invoice: {e}")
-            import traceback
-            traceback.print_exc()
-    else:
-        print(f"{store.get('store_name')}_{order_number}.pdf saved in store_invoices/ dir")
 
 
-def print_order_label(order_text, store_text, font_size_order=56, font_size_store=48, y_start=20):
-    """
-    Print a single order label on roll printer
-    """
-    printer_name = ROLL_PRINTER
-    dc = win32ui.CreateDC()
-    dc.CreatePrinterDC(printer_name)
-    
-    dc.StartDoc("Order Label")
-    dc.StartPage()
-    
+def draw_order_label(dc, fonts, label):
+    """Draw an order number / store name label onto the current page of a roll printer DC"""
+    order_text = label['order_text']
+    store_text = label['store_text']
+    y_start = label.get('y_start', 20)
+
     # Label dimensions
     dpi = dc.GetDeviceCaps(88)
     label_width = int(2.625 * dpi)
     label_height = int(1.0 * dpi)
     x_center = label_width // 2
-    
-    # Fonts
-    bold_font = create_font("Times New Roman", font_size_order, bold=True)
-    norm_font = create_font("Times New Roman", font_size_store)
-    
+
     # Draw order number
-    dc.SelectObject(bold_font)
+    dc.SelectObject(fonts("Times New Roman", label.get('font_size_order', 56), bold=True))
     dc.TextOut(x_center - dc.GetTextExtent(order_text)[0] // 2, y_start, order_text)
     y_start += 75
-    
+
     # Draw store name
-    dc.SelectObject(norm_font)
+    dc.SelectObject(fonts("Times New Roman", label.get('font_size_store', 48)))
     dc.TextOut(x_center - dc.GetTextExtent(store_text)[0] // 2, y_start, store_text)
+
+
+@traced()
+def print_order_label(order_text, store_text, font_size_order=56, font_size_store=48, y_start=20):
+    """
+    Print a single order label on roll printer
+    """
+    label = {
+        'order_text': order_text,
+        'store_text': store_text,
+        'font_size_order': font_size_order,
+        'font_size_store': font_size_store,
+        'y_start': y_start,
+    }
+    printer_name = ROLL_PRINTER
+    with printer_lock(printer_name):
+        dc = open_printer_dc(printer_name)
     
-    dc.EndPage()
-    dc.EndDoc()
-    dc.DeleteDC()
+        dc.StartDoc("Order Label")
+        dc.StartPage()
+        draw_order_label(dc, FontCache(), label)
+        dc.EndPage()
+        dc.EndDoc()
+        dc.DeleteDC()
 
 
 @app.route('/print-mix-label', methods=['POST'])
 def print_mix_label():
     try:
-        data = request.get_json()
+        data, errors = VALIDATORS['mix_label'](request.get_json(silent=True))
+        if errors:
+            return validation_failed(errors)
         
         mix_name = data.get('mix_name')
         is_component = data.get('is_component', False)
@@ -2678,118 +5558,16 @@ def print_mix_label():
         
         # Setup printer
         printer_name = ROLLO_PRINTER
-        dc = win32ui.CreateDC()
-        dc.CreatePrinterDC(printer_name)
-        dc.StartDoc("Mix Label")
-        dc.StartPage()
-        
-        # Label dimensions (4x6 shipping label)
-        dpi = dc.GetDeviceCaps(88)  # LOGPIXELSX
-        label_width = int(4.0 * dpi)
-        label_height = int(6.0 * dpi)
-        
-        margin = int(0.25 * dpi)
-        y_pos = margin
-        
-        # Title - Mix Name
-        title_font = create_font("Calibri", 60, bold=True)
-        dc.SelectObject(title_font)
-        
-        # Word wrap the mix name if needed
-        max_width = label_width - (2 * margin)
-        words = mix_name.split()
-        lines = []
-        current_line = []
-        
-        for word in words:
-            test_line = ' '.join(current_line + [word])
-            text_width = dc.GetTextExtent(test_line)[0]
-            if text_width <= max_width:
-                current_line.append(word)
-            else:
-                if current_line:
-                    lines.append(' '.join(current_line))
-                current_line = [word]
-        if current_line:
-            lines.append(' '.join(current_line))
-        
-        # Draw mix name (centered)
-        for line in lines:
-            text_width = dc.GetTextExtent(line)[0]
-            x_pos = (label_width - text_width) // 2
-            dc.TextOut(x_pos, y_pos, line)
-            y_pos += 70
-        
-        # (component) subtitle if applicable
-        if is_component:
-            subtitle_font = create_font("Calibri", 40, italic=True)
-            dc.SelectObject(subtitle_font)
-            component_text = "(component)"
-            text_width = dc.GetTextExtent(component_text)[0]
-            x_pos = (label_width - text_width) // 2
-            dc.TextOut(x_pos, y_pos, component_text)
-            y_pos += 60
-        
-        y_pos += 20  # Extra spacing
-        
-        # Lot Code
-        lot_font = create_font("Calibri", 48, bold=True)
-        dc.SelectObject(lot_font)
-        lot_text = f"Lot: {lot_code}"
-        text_width = dc.GetTextExtent(lot_text)[0]
-        x_pos = (label_width - text_width) // 2
-        dc.TextOut(x_pos, y_pos, lot_text)
-        y_pos += 80
+        with printer_lock(printer_name):
+            dc = open_printer_dc(printer_name)
+            dc.StartDoc("Mix Label")
+            dc.StartPage()
+            draw_mix_label(dc, FontCache(), data)
         
-        # Table header
-        header_font = create_font("Calibri", 36, bold=True)
-        dc.SelectObject(header_font)
-        
-        col1_x = margin
-        col2_x = margin + int(0.8 * dpi)
-        col3_x = margin + int(2.5 * dpi)
-        
-        # Draw table headers
-        dc.TextOut(col1_x, y_pos, "Amt")
-        dc.TextOut(col2_x, y_pos, "Variety")
-        dc.TextOut(col3_x, y_pos, "Lot")
-        y_pos += 50
-        
-        # Draw header line
-        pen = win32ui.CreatePen(0, 2, 0x000000)  # Solid black line
-        dc.SelectObject(pen)
-        dc.MoveTo(margin, y_pos)
-        dc.LineTo(label_width - margin, y_pos)
-        y_pos += 15
-        
-        # Table rows
-        row_font = create_font("Calibri", 32)
-        dc.SelectObject(row_font)
-        
-        for component in components:
-            parts = str(component.get('parts', 1))
-            variety = component.get('variety', '')
-            lot = component.get('lot', '')
-            
-            # Truncate variety name if too long
-            max_variety_chars = 18
-            if len(variety) > max_variety_chars:
-                variety = variety[:max_variety_chars-3] + '...'
-            
-            dc.TextOut(col1_x, y_pos, parts)
-            dc.TextOut(col2_x, y_pos, variety)
-            dc.TextOut(col3_x, y_pos, lot)
-            y_pos += 45
-            
-            # Draw row line
-            dc.MoveTo(margin, y_pos)
-            dc.LineTo(label_width - margin, y_pos)
-            y_pos += 10
-        
-        # Finalize print job
-        dc.EndPage()
-        dc.EndDoc()
-        dc.DeleteDC()
+            # Finalize print job
+            dc.EndPage()
+            dc.EndDoc()
+            dc.DeleteDC()
         
         return jsonify({
             'success': True,
@@ -2805,5 +5583,1109 @@ def print_mix_label():
             'error': str(e)
         }), 500
 
+
+def draw_mix_label(dc, fonts, data):
+    """Draw a mix label onto the current page of the 4x6 Rollo printer DC"""
+    mix_name = data.get('mix_name')
+    is_component = data.get('is_component', False)
+    lot_code = data.get('lot_code')
+    components = data.get('components', [])
+
+    # Label dimensions (4x6 shipping label)
+    dpi = dc.GetDeviceCaps(88)  # LOGPIXELSX
+    label_width = int(4.0 * dpi)
+    label_height = int(6.0 * dpi)
+
+    margin = int(0.25 * dpi)
+    y_pos = margin
+
+    # Title - Mix Name
+    dc.SelectObject(fonts("Calibri", 60, bold=True))
+
+    # Word wrap the mix name if needed
+    max_width = label_width - (2 * margin)
+    words = mix_name.split()
+    lines = []
+    current_line = []
+
+    for word in words:
+        test_line = ' '.join(current_line + [word])
+        text_width = dc.GetTextExtent(test_line)[0]
+        if text_width <= max_width:
+            current_line.append(word)
+        else:
+            if current_line:
+                lines.append(' '.join(current_line))
+            current_line = [word]
+    if current_line:
+        lines.append(' '.join(current_line))
+
+    # Draw mix name (centered)
+    for line in lines:
+        text_width = dc.GetTextExtent(line)[0]
+        x_pos = (label_width - text_width) // 2
+        dc.TextOut(x_pos, y_pos, line)
+        y_pos += 70
+
+    # (component) subtitle if applicable
+    if is_component:
+        dc.SelectObject(fonts("Calibri", 40, italic=True))
+        component_text = "(component)"
+        text_width = dc.GetTextExtent(component_text)[0]
+        x_pos = (label_width - text_width) // 2
+        dc.TextOut(x_pos, y_pos, component_text)
+        y_pos += 60
+
+    y_pos += 20  # Extra spacing
+
+    # Lot Code
+    dc.SelectObject(fonts("Calibri", 48, bold=True))
+    lot_text = f"Lot: {lot_code}"
+    text_width = dc.GetTextExtent(lot_text)[0]
+    x_pos = (label_width - text_width) // 2
+    dc.TextOut(x_pos, y_pos, lot_text)
+    y_pos += 80
+
+    # Table header
+    dc.SelectObject(fonts("Calibri", 36, bold=True))
+
+    col1_x = margin
+    col2_x = margin + int(0.8 * dpi)
+    col3_x = margin + int(2.5 * dpi)
+
+    # Draw table headers
+    dc.TextOut(col1_x, y_pos, "Amt")
+    dc.TextOut(col2_x, y_pos, "Variety")
+    dc.TextOut(col3_x, y_pos, "Lot")
+    y_pos += 50
+
+    # Draw header line
+    dc.SelectObject(fonts.pen(0, 2, 0x000000))  # Solid black line
+    dc.MoveTo(margin, y_pos)
+    dc.LineTo(label_width - margin, y_pos)
+    y_pos += 15
+
+    # Table rows
+    dc.SelectObject(fonts("Calibri", 32))
+
+    for component in components:
+        parts = str(component.get('parts', 1))
+        variety = component.get('variety', '')
+        lot = component.get('lot', '')
+
+        # Truncate variety name if too long
+        max_variety_chars = 18
+        if len(variety) > max_variety_chars:
+            variety = variety[:max_variety_chars-3] + '...'
+
+        dc.TextOut(col1_x, y_pos, parts)
+        dc.TextOut(col2_x, y_pos, variety)
+        dc.TextOut(col3_x, y_pos, lot)
+        y_pos += 45
+
+        # Draw row line
+        dc.MoveTo(margin, y_pos)
+        dc.LineTo(label_width - margin, y_pos)
+        y_pos += 10
+
+
+# === Batch printing ===
+# /print-batch takes an ordered list of typed label jobs, e.g.
+#   {"jobs": [{"type": "germ", "data": {...}}, {"type": "front", "data": {...}}]}
+# where each job's data is the same payload its single-label endpoint takes.
+# Jobs are grouped by target printer and every group is sent as ONE spooler
+# document (one DC, one StartDoc, one page per label copy) with fonts shared
+# across the whole group, instead of one HTTP request and print job per label.
+
+def label_copies(data):
+    return data['quantity'] * data['env_multiplier']
+
+
+def prepare_back_label(data):
+    back_lines = back_label_lines(data)
+    if not back_lines:
+        raise ValueError('No back lines provided')
+    return back_lines
+
+
+def prepare_sheet_back(data):
+    return prepare_back_label(data), f"'{data.get('variety_name')}'"
+
+
+BATCH_JOB_TYPES = {
+    'germ': {
+        'printer': ROLL_PRINTER, 'schema': 'germ_label',
+        'prepare': prepare_germ_label, 'draw': draw_germ_label,
+    },
+    'front': {
+        'printer': ROLL_PRINTER, 'schema': 'front_label', 'copies': label_copies,
+        'prepare': prepare_front_label,
+        'draw': lambda dc, fonts, label: draw_cached_label(dc, fonts, 'front', label, draw_front_label),
+    },
+    'back': {
+        'printer': ROLL_PRINTER, 'schema': 'back_label', 'copies': label_copies,
+        'prepare': prepare_back_label,
+        'draw': lambda dc, fonts, label: draw_cached_label(dc, fonts, 'back', label, draw_back_label),
+    },
+    'stock_seed': {
+        'printer': ROLL_PRINTER, 'schema': 'stock_seed_label',
+        'draw': draw_stock_seed_label,
+    },
+    'order_label': {
+        'printer': ROLL_PRINTER, 'schema': 'order_label',
+        'draw': draw_order_label,
+    },
+    'mix': {
+        'printer': ROLLO_PRINTER, 'schema': 'mix_label',
+        'draw': draw_mix_label,
+    },
+    'sheet_front': {
+        'printer': SHEET_PRINTER, 'schema': 'front_label', 'copies': label_copies,
+        'prepare': prepare_front_label, 'draw': draw_sheet_front_page,
+    },
+    'sheet_back': {
+        'printer': SHEET_PRINTER, 'schema': 'back_label', 'copies': label_copies,
+        'prepare': prepare_sheet_back,
+        'draw': lambda dc, fonts, label: draw_sheet_back_page(dc, fonts, *label),
+    },
+}
+
+
+def validate_batch_jobs(jobs):
+    """Validate every job's data against its label type's schema"""
+    clean_jobs = []
+    errors = []
+    for index, job in enumerate(jobs):
+        job_type = BATCH_JOB_TYPES.get(job['type'])
+        if job_type is None:
+            errors.append({
+                'field': f"jobs[{index}].type",
+                'error': f"must be one of {', '.join(sorted(BATCH_JOB_TYPES))}"
+            })
+            continue
+        job_data, job_errors = VALIDATORS[job_type['schema']](job['data'], f"jobs[{index}].data")
+        errors.extend(job_errors)
+        clean_jobs.append({'index': index, 'type': job['type'], 'data': job_data})
+    return clean_jobs, errors
+
+
+def group_jobs_by_printer(jobs):
+    """{printer_name: [job, ...]} in the order each printer first appears"""
+    groups = {}
+    for job in jobs:
+        groups.setdefault(BATCH_JOB_TYPES[job['type']]['printer'], []).append(job)
+    return groups
+
+
+@traced()
+def print_batch_group(printer_name, jobs):
+    """
+    Print one printer's jobs as a single spooler document.
+
+    Returns a result dict per job; a job that fails to draw is reported
+    without stopping the rest of the group.
+    """
+    results = []
+    prepared = []
+    for job in jobs:
+        job_type = BATCH_JOB_TYPES[job['type']]
+        result = {'index': job['index'], 'type': job['type'], 'printer': printer_name}
+        results.append(result)
+        try:
+            prepare = job_type.get('prepare')
+            label = prepare(job['data']) if prepare else job['data']
+            copies = job_type['copies'](job['data']) if 'copies' in job_type else 1
+        except Exception as e:
+            result.update(success=False, error=str(e))
+            continue
+        prepared.append((result, job_type['draw'], label, copies))
+
+    if CURRENT_USER.lower() == "ndefe":
+        print(f"=== LABEL BATCH FOR {printer_name} ON NDEFE ===")
+        for result, draw, label, copies in prepared:
+            print(f"Job {result['index']}: {result['type']} x {copies}")
+            result.update(success=True, copies=copies)
+        print("=========================================")
+        return results
+
+    if not prepared:
+        return results
+
+    fonts = FontCache()
+    with printer_lock(printer_name):
+        dc = open_printer_dc(printer_name)
+        dc.StartDoc("Label Batch")
+        try:
+            for result, draw, label, copies in prepared:
+                try:
+                    for i in range(copies):
+                        dc.StartPage()
+                        try:
+                            draw(dc, fonts, label)
+                        finally:
+                            dc.EndPage()
+                    result.update(success=True, copies=copies)
+                except Exception as e:
+                    print(f"Error printing batch job {result['index']} ({result['type']}): {str(e)}")
+                    result.update(success=False, error=str(e))
+        finally:
+            dc.EndDoc()
+            dc.DeleteDC()
+
+    return results
+
+
+@app.route('/print-batch', methods=['POST'])
+def print_batch():
+    try:
+        data, errors = VALIDATORS['print_batch'](request.get_json(silent=True))
+        if errors:
+            return validation_failed(errors)
+
+        jobs, errors = validate_batch_jobs(data['jobs'])
+        if errors:
+            return validation_failed(errors)
+
+        groups = group_jobs_by_printer(jobs)
+        results = []
+        for printer_name, group in groups.items():
+            try:
+                results.extend(print_batch_group(printer_name, group))
+            except Exception as e:
+                # The printer itself failed (DC or spooler), so none of its jobs printed
+                print(f"Error printing batch on {printer_name}: {str(e)}")
+                results.extend(
+                    {'index': job['index'], 'type': job['type'], 'printer': printer_name,
+                     'success': False, 'error': str(e)}
+                    for job in group
+                )
+        results.sort(key=lambda result: result['index'])
+
+        failed = [result for result in results if not result['success']]
+        return jsonify({
+            'success': not failed,
+            'message': f"{len(results) - len(failed)} of {len(results)} label jobs printed "
+                       f"in {len(groups)} printer job(s)",
+            'results': results
+        }), 500 if failed else 200
+
+    except Exception as e:
+        print(f"Error printing label batch: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+# === Request coalescing ===
+# Staff stepping through an order fire /print-single-front and -back calls
+# back to back. With coalescing on, the first request for a printer waits up
+# to COALESCE_WINDOW_SECONDS for others to join it, then prints every label
+# that joined as one /print-batch style document, in arrival order. Each
+# request still gets its own result. Only requests of the same priority
+# class are merged, so the combined document queues like any one of them.
+
+SINGLE_LABEL_MESSAGES = {
+    'front': 'Front Single Label printed successfully ({copies} copies)',
+    'back': 'Back Single Label printed successfully ({copies} copies)',
+}
+
+
+class CoalescedLabel:
+    def __init__(self, index, job_type, data):
+        self.job = {'index': index, 'type': job_type, 'data': data}
+        self.result = None
+        self.done = threading.Event()
+
+
+class LabelCoalescer:
+    """Merges single-label requests per (printer, priority) into one spooler document"""
+
+    def __init__(self, window_seconds, max_jobs):
+        self.window_seconds = window_seconds
+        self.max_jobs = max_jobs
+        self.cond = threading.Condition()
+        self.pending = {}  # (printer, priority) -> [CoalescedLabel, ...] still accepting labels
+        self.arrivals = itertools.count()
+        self.stats = {'requests': 0, 'documents': 0, 'largest_document': 0}
+
+    def submit(self, job_type, data):
+        """Print one label request, possibly together with others; returns its result dict"""
+        key = (BATCH_JOB_TYPES[job_type]['printer'], current_print_priority())
+        with self.cond:
+            self.stats['requests'] += 1
+            batch = self.pending.get(key)
+            leader = batch is None
+            if leader:
+                batch = self.pending[key] = []
+            entry = CoalescedLabel(next(self.arrivals), job_type, data)
+            batch.append(entry)
+
+            if not leader:
+                if len(batch) >= self.max_jobs:
+                    del self.pending[key]
+                    self.cond.notify_all()
+            else:
+                deadline = time.monotonic() + self.window_seconds
+                while self.pending.get(key) is batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        del self.pending[key]
+                        break
+                    self.cond.wait(remaining)
+                self.stats['documents'] += 1
+                self.stats['largest_document'] = max(self.stats['largest_document'], len(batch))
+
+        if leader:
+            self.print_batch(key[0], batch)
+        else:
+            entry.done.wait()
+        return entry.result
+
+    def print_batch(self, printer_name, batch):
+        try:
+            # Take the printer first so the cost sample excludes queueing
+            # (print_batch_group's own printer_lock then just re-enters)
+            with printer_lock(printer_name):
+                start = time.perf_counter()
+                results = print_batch_group(printer_name, [entry.job for entry in batch])
+                elapsed = time.perf_counter() - start
+            copies = sum(result.get('copies', 0) for result in results)
+            if CURRENT_USER.lower() != "ndefe":
+                record_print_cost('roll_label', copies, elapsed)
+            if len(batch) > 1:
+                print(f"Coalesced {len(batch)} single-label requests ({copies} labels) on {printer_name}")
+            for entry, result in zip(batch, results):
+                if result['success']:
+                    message = SINGLE_LABEL_MESSAGES[entry.job['type']].format(copies=result['copies'])
+                    entry.result = {'success': True, 'message': message}
+                else:
+                    entry.result = {'success': False, 'error': result['error']}
+        except Exception as e:
+            # The printer itself failed (DC or spooler), so none of the labels printed
+            print(f"Error printing coalesced labels on {printer_name}: {str(e)}")
+            for entry in batch:
+                entry.result = {'success': False, 'error': str(e)}
+        finally:
+            for entry in batch:
+                if entry.result is None:
+                    entry.result = {'success': False, 'error': 'Label was not printed'}
+                entry.done.set()
+
+    def status(self):
+        with self.cond:
+            return {
+                **self.stats,
+                'enabled': self.window_seconds > 0,
+                'window_ms': round(self.window_seconds * 1000),
+                'max_jobs': self.max_jobs,
+                'waiting': sum(len(batch) for batch in self.pending.values()),
+            }
+
+
+LABEL_COALESCER = LabelCoalescer(COALESCE_WINDOW_SECONDS, COALESCE_MAX_JOBS)
+
+
+# === Label previews ===
+# The batch draw functions only use a small part of the win32ui DC API, so
+# PreviewDC implements that part on a PIL image. A preview is drawn by the
+# same code that drives the printer, at the printer's native DPI, and then
+# scaled to the DPI the caller asked for.
+
+# Native resolution and page size (inches) of each printer's media
+PREVIEW_PAGES = {
+    ROLL_PRINTER: (300, 2.625, 1.0),   # Zebra GX430t, 2.625" x 1" roll labels
+    ROLLO_PRINTER: (203, 4.0, 6.0),    # Rollo, 4" x 6" shipping labels
+    SHEET_PRINTER: (600, 8.5, 11.0),   # RICOH, letter sheets of 30 labels
+}
+
+# (name, bold, italic) -> TrueType file GDI would pick for that font
+PREVIEW_FONT_FILES = {
+    ("Times New Roman", False, False): "times.ttf",
+    ("Times New Roman", True, False): "timesbd.ttf",
+    ("Times New Roman", False, True): "timesi.ttf",
+    ("Times New Roman", True, True): "timesbi.ttf",
+    ("Courier New", False, False): "cour.ttf",
+    ("Courier New", True, False): "courbd.ttf",
+    ("Courier New", False, True): "couri.ttf",
+    ("Book Antiqua", False, False): "ANTQUA.TTF",
+    ("Book Antiqua", True, False): "ANTQUAB.TTF",
+    ("Book Antiqua", False, True): "ANTQUAI.TTF",
+    ("Calibri", False, False): "calibri.ttf",
+    ("Calibri", True, False): "calibrib.ttf",
+    ("Calibri", False, True): "calibrii.ttf",
+}
+
+PREVIEW_CACHE = OrderedDict()
+PREVIEW_CACHE_LOCK = threading.Lock()
+
+
+def create_preview_font(name, size, bold=False, italic=False, fallback=True):
+    """
+    PIL counterpart of create_font: size is the em height in device pixels.
+    A font without a TrueType file falls back to PIL's default font, or
+    raises OSError when fallback is False.
+    """
+    file_name = PREVIEW_FONT_FILES.get((name, bold, italic)) or PREVIEW_FONT_FILES.get((name, False, False))
+    try:
+        return ImageFont.truetype(os.path.join(FONT_DIR, file_name), size)
+    except (OSError, TypeError):
+        if not fallback:
+            raise OSError(f"No TrueType file found for font {name}")
+        print(f"Preview font {name} not found, using the default font")
+        return ImageFont.load_default(size)
+
+
+def create_preview_pen(style, width, color):
+    # COLORREF is 0x00BBGGRR
+    return {'width': width, 'color': (color & 0xFF, (color >> 8) & 0xFF, (color >> 16) & 0xFF)}
+
+
+class PreviewDC:
+    """The subset of a win32ui printer DC the label draw functions use, drawn with PIL"""
+
+    def __init__(self, dpi, width_in, height_in):
+        self.dpi = dpi
+        self.image = Image.new("RGB", (int(width_in * dpi), int(height_in * dpi)), "white")
+        self.draw = ImageDraw.Draw(self.image)
+        self.font = create_preview_font("Times New Roman", 12)
+        self.pen = create_preview_pen(0, 1, 0x000000)
+        self.position = (0, 0)
+
+    def GetDeviceCaps(self, index):
+        # LOGPIXELSX, HORZRES, VERTRES
+        return {88: self.dpi, 8: self.image.width, 10: self.image.height}[index]
+
+    def SelectObject(self, obj):
+        if isinstance(obj, dict):
+            self.pen = obj
+        else:
+            self.font = obj
+
+    def GetTextExtent(self, text):
+        ascent, descent = self.font.getmetrics()
+        return int(round(self.font.getlength(text or ''))), ascent + descent
+
+    def TextOut(self, x, y, text):
+        # GDI's default alignment puts (x, y) at the top left of the text cell
+        self.draw.text((x, y), text or '', font=self.font, fill="black", anchor="la")
+
+    def MoveTo(self, x, y):
+        self.position = (x, y)
+
+    def LineTo(self, x, y):
+        self.draw.line([self.position, (x, y)], fill=self.pen['color'], width=self.pen['width'])
+        self.position = (x, y)
+
+    def DrawImage(self, image, box):
+        left, top, right, bottom = box
+        self.image.paste(image.resize((right - left, bottom - top)), (left, top))
+
+    def StartDoc(self, name):
+        pass
+
+    def StartPage(self):
+        pass
+
+    def EndPage(self):
+        pass
+
+    def EndDoc(self):
+        pass
+
+    def DeleteDC(self):
+        pass
+
+
+class FakePrinterDC(PreviewDC):
+    """
+    Printer DC for the fake backend: measures text like a preview but draws
+    nothing, and holds the printer for its fake page time at each EndPage.
+    """
+
+    def __init__(self, printer_name):
+        self.printer_name = printer_name
+        self.dpi, width_in, height_in = PREVIEW_PAGES[printer_name]
+        self.size = (int(width_in * self.dpi), int(height_in * self.dpi))
+        self.font = create_preview_font("Times New Roman", 12)
+        self.pen = create_preview_pen(0, 1, 0x000000)
+        self.position = (0, 0)
+        self.pages = 0
+
+    def GetDeviceCaps(self, index):
+        # LOGPIXELSX, HORZRES, VERTRES
+        return {88: self.dpi, 8: self.size[0], 10: self.size[1]}[index]
+
+    def TextOut(self, x, y, text):
+        pass
+
+    def LineTo(self, x, y):
+        self.position = (x, y)
+
+    def DrawImage(self, image, box):
+        pass
+
+    def EndPage(self):
+        self.pages += 1
+        fake_print_pages(self.printer_name, 1)
+
+
+class DryRunDC(FakePrinterDC):
+    """Printer DC for dry runs: lays pages out like the fake backend and counts them"""
+
+    def StartDoc(self, name):
+        current_dry_run().add(self.printer_name, documents=1)
+
+    def EndPage(self):
+        self.pages += 1
+        current_dry_run().add(self.printer_name, pages=1)
+
+
+PREVIEW_FONTS = FontCache(create_preview_font, create_preview_pen)
+# Bitmaps that get printed must use the real fonts, never the default one
+RASTER_FONTS = FontCache(functools.partial(create_preview_font, fallback=False), create_preview_pen)
+
+
+def render_label_png(label_type, data, dpi=None):
+    """Draw one label (or sheet) of label_type and return it as PNG bytes"""
+    job_type = BATCH_JOB_TYPES[label_type]
+    native_dpi, width_in, height_in = PREVIEW_PAGES[job_type['printer']]
+
+    prepare = job_type.get('prepare')
+    label = prepare(data) if prepare else data
+
+    dc = PreviewDC(native_dpi, width_in, height_in)
+    job_type['draw'](dc, PREVIEW_FONTS, label)
+
+    image = dc.image
+    if dpi and dpi != native_dpi:
+        scale = dpi / native_dpi
+        image = image.resize((max(1, int(image.width * scale)), max(1, int(image.height * scale))), Image.LANCZOS)
+
+    png = io.BytesIO()
+    image.save(png, format="PNG", dpi=(dpi or native_dpi, dpi or native_dpi))
+    return png.getvalue()
+
+
+def cached_label_png(label_type, data, dpi=None):
+    """
+    render_label_png through an LRU cache keyed by a hash of the label content.
+
+    Returns (png bytes, content hash, whether it was a cache hit).
+    """
+    key = hashlib.sha256(
+        json.dumps([label_type, data, dpi], sort_keys=True, default=str).encode('utf-8')
+    ).hexdigest()
+
+    with PREVIEW_CACHE_LOCK:
+        png = PREVIEW_CACHE.get(key)
+        if png is not None:
+            PREVIEW_CACHE.move_to_end(key)
+            return png, key, True
+
+    png = render_label_png(label_type, data, dpi)
+
+    with PREVIEW_CACHE_LOCK:
+        PREVIEW_CACHE[key] = png
+        PREVIEW_CACHE.move_to_end(key)
+        while len(PREVIEW_CACHE) > PREVIEW_CACHE_SIZE:
+            PREVIEW_CACHE.popitem(last=False)
+    return png, key, False
+
+
+@app.route('/preview/<label_type>', methods=['GET', 'POST'])
+def preview_label(label_type):
+    """
+    PNG preview of a label, drawn exactly as it would be printed.
+
+    label_type is any /print-batch job type (front, back, germ, stock_seed,
+    mix, order_label, sheet_front, sheet_back). POST the same JSON the print
+    endpoint takes, or GET with the fields as query parameters. ?dpi=N scales
+    the image (default: the printer's own resolution).
+    """
+    try:
+        if label_type not in BATCH_JOB_TYPES:
+            return jsonify({
+                'success': False,
+                'error': f"Unknown label type '{label_type}'"
+            }), 404
+
+        query, errors = VALIDATORS['preview'](request.args.to_dict())
+        if errors:
+            return validation_failed(errors)
+
+        if request.method == 'POST':
+            payload = request.get_json(silent=True)
+        else:
+            payload = {name: value for name, value in request.args.items() if name != 'dpi'}
+
+        data, errors = VALIDATORS[BATCH_JOB_TYPES[label_type]['schema']](payload)
+        if errors:
+            return validation_failed(errors)
+
+        png, key, hit = cached_label_png(label_type, data, query['dpi'])
+
+        response = send_file(io.BytesIO(png), mimetype='image/png', etag=key, max_age=0)
+        response.headers['X-Preview-Cache'] = 'hit' if hit else 'miss'
+        return response
+
+    except ValueError as e:
+        # e.g. a back label with no back lines
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+    except Exception as e:
+        print(f"Error rendering {label_type} preview: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+# === Label raster cache ===
+# The same front/back label (variety, lot, germ, year...) is printed over and
+# over. Instead of laying it out again and having the driver rasterize the
+# text every time, draw_cached_label renders it once with PreviewDC into a
+# 1-bit bitmap at the printer's DPI and sends that bitmap on later prints.
+# Bitmaps are keyed by a hash of the prepared label and the DPI, kept in
+# memory and as PNGs in RASTER_CACHE_DIR, both capped by size (oldest go
+# first). It is off unless PRINT_SERVICE_RASTER_CACHE=1. A label whose fonts
+# can't be found as TrueType files is drawn through GDI and never cached.
+
+class RasterCache:
+    """Size-capped memory + disk LRU of rendered label bitmaps"""
+
+    def __init__(self, directory, memory_bytes, disk_bytes):
+        self.directory = directory
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.memory = OrderedDict()  # key -> PIL image
+        self.memory_used = 0
+        self.disk_files = None       # key -> file size, oldest first; scanned on first use
+        self.lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0, 'render_seconds': 0.0}
+
+    @staticmethod
+    def image_bytes(image):
+        return image.width * image.height // 8 if image.mode == '1' else len(image.tobytes())
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.png")
+
+    def scan_disk(self):
+        # Caller holds self.lock
+        if self.disk_files is None:
+            os.makedirs(self.directory, exist_ok=True)
+            entries = []
+            for name in os.listdir(self.directory):
+                if name.endswith('.png'):
+                    stat = os.stat(os.path.join(self.directory, name))
+                    entries.append((stat.st_mtime, name[:-4], stat.st_size))
+            self.disk_files = OrderedDict((key, size) for _, key, size in sorted(entries))
+
+    def remember(self, key, image):
+        # Caller holds self.lock
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            return
+        self.memory[key] = image
+        self.memory_used += self.image_bytes(image)
+        while self.memory_used > self.memory_bytes and len(self.memory) > 1:
+            _, old = self.memory.popitem(last=False)
+            self.memory_used -= self.image_bytes(old)
+            self.stats['evictions'] += 1
+
+    def store(self, key, image):
+        # Caller holds self.lock
+        path = self.path(key)
+        image.save(path, format="PNG")
+        self.disk_files[key] = os.path.getsize(path)
+        while sum(self.disk_files.values()) > self.disk_bytes and len(self.disk_files) > 1:
+            old, _ = self.disk_files.popitem(last=False)
+            try:
+                os.remove(self.path(old))
+            except OSError:
+                pass
+            self.stats['evictions'] += 1
+
+    def get(self, key, render):
+        """The bitmap for key, calling render() to make it on a miss"""
+        with self.lock:
+            image = self.memory.get(key)
+            if image is not None:
+                self.memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return image
+
+            self.scan_disk()
+            if key in self.disk_files:
+                try:
+                    with Image.open(self.path(key)) as cached:
+                        image = cached.copy()
+                    self.disk_files.move_to_end(key)
+                    os.utime(self.path(key))
+                    self.stats['disk_hits'] += 1
+                    self.remember(key, image)
+                    return image
+                except OSError:
+                    del self.disk_files[key]
+
+        start = time.perf_counter()
+        with trace_span('label.raster'):
+            image = render()
+        elapsed = time.perf_counter() - start
+
+        with self.lock:
+            self.stats['misses'] += 1
+            self.stats['render_seconds'] += elapsed
+            self.remember(key, image)
+            try:
+                self.store(key, image)
+            except OSError as e:
+                print(f"Could not write raster cache file: {e}")
+        return image
+
+    def status(self):
+        with self.lock:
+            lookups = self.stats['memory_hits'] + self.stats['disk_hits'] + self.stats['misses']
+            return {
+                **self.stats,
+                'render_seconds': round(self.stats['render_seconds'], 3),
+                'hit_rate': round((lookups - self.stats['misses']) / lookups, 3) if lookups else None,
+                'memory_entries': len(self.memory),
+                'memory_bytes': self.memory_used,
+                'disk_entries': len(self.disk_files or ()),
+                'disk_bytes': sum((self.disk_files or {}).values()),
+            }
+
+
+LABEL_RASTERS = RasterCache(RASTER_CACHE_DIR, RASTER_CACHE_MEMORY_BYTES, RASTER_CACHE_DISK_BYTES)
+
+
+def render_label_bitmap(draw, label, dpi):
+    """Draw a roll label with PreviewDC and threshold it to the 1-bit image a thermal printer prints"""
+    dc = PreviewDC(dpi, *ROLL_LABEL_SIZE)
+    draw(dc, RASTER_FONTS, label)
+    return dc.image.convert('L').point(lambda value: 255 if value >= 128 else 0, mode='1')
+
+
+def draw_cached_label(dc, fonts, kind, label, draw):
+    """draw(dc, fonts, label) for a roll label, replayed from LABEL_RASTERS when possible"""
+    if not RASTER_CACHE_ENABLED or isinstance(dc, PreviewDC):
+        draw(dc, fonts, label)
+        return
+
+    dpi = dc.GetDeviceCaps(88)
+    key = hashlib.sha256(
+        json.dumps([kind, label, dpi], sort_keys=True, default=str).encode('utf-8')
+    ).hexdigest()
+    try:
+        bitmap = LABEL_RASTERS.get(key, lambda: render_label_bitmap(draw, label, dpi))
+    except OSError as e:
+        print(f"Can't rasterize {kind} label ({e}), drawing it through GDI")
+        draw(dc, fonts, label)
+        return
+    draw_image(dc, bitmap, (0, 0, bitmap.width, bitmap.height))
+
+
+@app.route('/raster-cache', methods=['GET'])
+def raster_cache_status():
+    """Hit/miss counts and size of the label raster cache"""
+    return jsonify({
+        'success': True,
+        'enabled': RASTER_CACHE_ENABLED,
+        'cache': LABEL_RASTERS.status()
+    })
+
+
+# === PDF documents over HTTP ===
+# POST /pdf/<kind> renders a document from the same JSON its print endpoint
+# takes and returns it inline. Rendered PDFs are cached by a hash of their
+# content (and the day, since invoices and pick lists are dated), so a
+# reprint or a second look skips ReportLab. The response names
+# /pdf/<kind>/<key> in Content-Location: GETs of that URL are served from
+# the cache with ETag revalidation, byte ranges and gzip.
+
+def pull_list_pdf(data):
+    items = data['items']
+    if data['aggregate']:
+        items, _ = aggregate_pull_items(items)
+    return render_pdf(create_pull_items_pdf, items, data['batch_date'])
+
+
+PDF_DOCUMENTS = {
+    'packing-slip': ('packing_slip', lambda data: render_pdf(
+        render_packing_slip, data['order']['order_number'], data['order'])),
+    'pick-list': ('pick_list', lambda data: render_pdf(
+        generate_pick_list_pdf, data['order_number'], data['store_name'], data['items'])),
+    'invoice': ('store_invoice', lambda data: render_pdf(
+        render_store_invoice, data['order'], data['store'], data['items'])),
+    'pull-list': ('pdf_pull_list', pull_list_pdf),
+}
+
+PDF_CACHE = OrderedDict()  # key -> {'kind', 'pdf', 'gzip'}
+PDF_CACHE_USED = 0
+PDF_CACHE_LOCK = threading.Lock()
+
+
+def render_pdf(build, *args):
+    """Run a PDF builder that writes to a path or file object and return the PDF bytes"""
+    output = io.BytesIO()
+    build(output, *args)
+    return output.getvalue()
+
+
+def cached_pdf(kind, data):
+    """
+    The PDF_DOCUMENTS[kind] document for validated data, rendered on a miss.
+
+    Returns (pdf bytes, content hash, whether it was a cache hit).
+    """
+    global PDF_CACHE_USED
+    key = hashlib.sha256(
+        json.dumps([kind, data, datetime.now().date()], sort_keys=True, default=str).encode('utf-8')
+    ).hexdigest()
+
+    with PDF_CACHE_LOCK:
+        entry = PDF_CACHE.get(key)
+        if entry is not None:
+            PDF_CACHE.move_to_end(key)
+            return entry['pdf'], key, True
+
+    with trace_span('pdf.render', **{'pdf.kind': kind}) as span:
+        pdf = PDF_DOCUMENTS[kind][1](data)
+        span.set_attribute('pdf.bytes', len(pdf))
+
+    with PDF_CACHE_LOCK:
+        if key not in PDF_CACHE:
+            PDF_CACHE[key] = {'kind': kind, 'pdf': pdf, 'gzip': None}
+            PDF_CACHE_USED += len(pdf)
+        PDF_CACHE.move_to_end(key)
+        while PDF_CACHE_USED > PDF_CACHE_BYTES and len(PDF_CACHE) > 1:
+            _, old = PDF_CACHE.popitem(last=False)
+            PDF_CACHE_USED -= len(old['pdf']) + len(old['gzip'] or b'')
+    return pdf, key, False
+
+
+def pdf_response(kind, key, hit):
+    """Send a cached PDF inline, gzipped when the client takes it and isn't asking for a byte range"""
+    global PDF_CACHE_USED
+    with PDF_CACHE_LOCK:
+        entry = PDF_CACHE.get(key)
+    if entry is None or entry['kind'] != kind:
+        return jsonify({
+            'success': False,
+            'error': f'No cached {kind} {key}; POST it to /pdf/{kind} again'
+        }), 404
+
+    body, etag = entry['pdf'], key
+    compress = request.accept_encodings['gzip'] > 0 and 'Range' not in request.headers
+    if compress:
+        compressed = entry['gzip']
+        if compressed is None:
+            compressed = gzip.compress(entry['pdf'], compresslevel=6)
+            with PDF_CACHE_LOCK:
+                if entry['gzip'] is None and PDF_CACHE.get(key) is entry:
+                    entry['gzip'] = compressed
+                    PDF_CACHE_USED += len(compressed)
+        body, etag = compressed, f"{key}-gzip"
+
+    response = send_file(io.BytesIO(body), mimetype='application/pdf', etag=etag, max_age=0,
+                         download_name=f"{kind}-{key[:12]}.pdf")
+    if compress and response.status_code != 304:
+        response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    response.headers['Content-Location'] = f'/pdf/{kind}/{key}'
+    response.headers['X-PDF-Cache'] = 'hit' if hit else 'miss'
+    return response
+
+
+@app.route('/pdf/<kind>', methods=['POST'])
+def render_pdf_document(kind):
+    """
+    Render a packing-slip, pick-list, invoice or pull-list from the JSON its
+    print endpoint takes, and return the PDF inline instead of printing it.
+    """
+    try:
+        if kind not in PDF_DOCUMENTS:
+            return jsonify({
+                'success': False,
+                'error': f"Unknown document '{kind}'; expected one of {', '.join(PDF_DOCUMENTS)}"
+            }), 404
+
+        data, errors = VALIDATORS[PDF_DOCUMENTS[kind][0]](request.get_json(silent=True))
+        if errors:
+            return validation_failed(errors)
+
+        _, key, hit = cached_pdf(kind, data)
+        return pdf_response(kind, key, hit)
+
+    except Exception as e:
+        print(f"Error rendering {kind} PDF: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/pdf/<kind>/<key>', methods=['GET'])
+def cached_pdf_document(kind, key):
+    """A PDF rendered earlier by POST /pdf/<kind> (or printed), for repeat views"""
+    return pdf_response(kind, key, True)
+
+
+# === Request profiling ===
+# Send a request with "X-Profile: 1" from this machine to run its handler
+# under cProfile, e.g. to find the hot spots in one slow invoice. The stats
+# are saved to PROFILE_DIR as <endpoint>.<timestamp>.prof (load them with
+# pstats or snakeviz) and named in the response's X-Profile-Name header.
+# Only the request thread is profiled, so start journaled jobs without
+# async. One request is profiled at a time: an X-Profile request that comes
+# in while another is being profiled is refused with 409.
+
+PROFILE_LOCK = threading.Lock()
+
+
+def is_local_request():
+    return request.remote_addr in LOCAL_ADDRESSES
+
+
+@app.before_request
+def start_profile():
+    if request.headers.get('X-Profile', '0') in ('', '0', 'false'):
+        return None
+    if not is_local_request():
+        return jsonify({'success': False, 'error': 'X-Profile is only accepted from localhost'}), 403
+    if not PROFILE_LOCK.acquire(blocking=False):
+        return jsonify({'success': False, 'error': 'A profile is already running; try again when it finishes'}), 409
+    PRINT_CONTEXT.profile = cProfile.Profile()
+    PRINT_CONTEXT.profile_started = datetime.now()
+    PRINT_CONTEXT.profile.enable()
+    return None
+
+
+@app.after_request
+def save_profile(response):
+    profile = getattr(PRINT_CONTEXT, 'profile', None)
+    if profile is None:
+        return response
+    profile.disable()
+    name = f"{request.endpoint or 'unknown'}.{PRINT_CONTEXT.profile_started.strftime('%Y%m%d-%H%M%S-%f')}.prof"
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        profile.dump_stats(os.path.join(PROFILE_DIR, name))
+        rotate_profiles()
+        response.headers['X-Profile-Name'] = name
+        print(f"Saved profile {name}")
+    except OSError as e:
+        print(f"Could not save profile {name}: {e}")
+    return response
+
+
+@app.teardown_request
+def stop_profile(exc):
+    profile = PRINT_CONTEXT.__dict__.pop('profile', None)
+    PRINT_CONTEXT.__dict__.pop('profile_started', None)
+    if profile is not None:
+        profile.disable()
+        PROFILE_LOCK.release()
+
+
+def saved_profiles():
+    """Profile file names in PROFILE_DIR, newest first"""
+    try:
+        names = [name for name in os.listdir(PROFILE_DIR) if PROFILE_NAME_PATTERN.fullmatch(name)]
+    except FileNotFoundError:
+        return []
+    # The timestamp in the name sorts in time order
+    return sorted(names, key=lambda name: name.split('.')[1], reverse=True)
+
+
+def rotate_profiles():
+    for name in saved_profiles()[PROFILE_KEEP:]:
+        remove_file(os.path.join(PROFILE_DIR, name))
+
+
+@app.route('/profiles', methods=['GET'])
+def list_profiles():
+    """Saved request profiles, newest first"""
+    if not is_local_request():
+        return jsonify({'success': False, 'error': 'Profiles are only served to localhost'}), 403
+
+    profiles = []
+    for name in saved_profiles():
+        path = os.path.join(PROFILE_DIR, name)
+        try:
+            stats = pstats.Stats(path)
+            size = os.path.getsize(path)
+        except (OSError, EOFError, TypeError, ValueError):
+            continue  # rotated away or still being written
+        endpoint, stamp, _ = name.split('.')
+        profiles.append({
+            'name': name,
+            'endpoint': endpoint,
+            'started': datetime.strptime(stamp, '%Y%m%d-%H%M%S-%f').isoformat(timespec='milliseconds'),
+            'total_seconds': round(stats.total_tt, 4),
+            'calls': stats.total_calls,
+            'bytes': size,
+            'url': f'/profiles/{name}',
+        })
+    return jsonify({'success': True, 'profiles': profiles})
+
+
+@app.route('/profiles/<name>', methods=['GET'])
+def download_profile(name):
+    """
+    A saved profile: the binary pstats file, or with ?format=text the top
+    functions (?sort=cumulative|tottime|calls, ?limit=50) as plain text.
+    """
+    if not is_local_request():
+        return jsonify({'success': False, 'error': 'Profiles are only served to localhost'}), 403
+    path = os.path.join(PROFILE_DIR, name)
+    if not PROFILE_NAME_PATTERN.fullmatch(name) or not os.path.exists(path):
+        return jsonify({'success': False, 'error': f'No profile {name}'}), 404
+
+    if request.args.get('format') != 'text':
+        return send_file(path, mimetype='application/octet-stream', as_attachment=True, download_name=name)
+
+    sort = request.args.get('sort', 'cumulative')
+    if sort not in ('cumulative', 'tottime', 'calls'):
+        return validation_failed([{'field': 'sort', 'error': 'must be one of cumulative, tottime, calls'}])
+    try:
+        limit = int(request.args.get('limit', 50))
+    except ValueError:
+        return validation_failed([{'field': 'limit', 'error': 'must be a whole number'}])
+
+    report = io.StringIO()
+    pstats.Stats(path, stream=report).sort_stats(sort).print_stats(limit)
+    return Response(report.getvalue(), mimetype='text/plain')
+
+
+def serve(host=SERVER_HOST, port=SERVER_PORT, threads=SERVER_THREADS):
+    """Run the service under the waitress production WSGI server"""
+    from waitress import serve as waitress_serve
+
+    print(f"Serving on http://{host}:{port} with {threads} threads")
+    start_file_sweeper()
+    if PRINTER_BACKEND == "fake":
+        print(f"Fake printer backend: nothing will be printed (time scale {FAKE_TIME_SCALE})")
+    waitress_serve(app, host=host, port=port, threads=threads)
+
+
 if __name__ == "__main__":
-    app.run(port=5000, debug=True)  # Debug=True helps while testing
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Uprising Seeds printing service")
+    parser.add_argument('--dev', action='store_true',
+                        help="run the Werkzeug dev server with debugger and reloader")
+    parser.add_argument('--host', default=SERVER_HOST)
+    parser.add_argument('--port', type=int, default=SERVER_PORT)
+    parser.add_argument('--threads', type=int, default=SERVER_THREADS,
+                        help="worker threads for the production server")
+    args = parser.parse_args()
+
+    if args.dev:
+        start_file_sweeper()
+        app.run(host=args.host, port=args.port, debug=True)  # Debug=True helps while testing
+    else:
+        serve(args.host, args.port, args.threads)
\ No newline at end of file
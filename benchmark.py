@@ -0,0 +1,397 @@
+"""
+Rendering benchmarks for the printing service.
+
+Times the PDF builders in app.py against synthetic payloads of increasing
+size and prints the total and per-row cost, so a change to a renderer can be
+checked for flat per-row cost before it goes to the shop floor.
+
+    python benchmark.py pick-list --sizes 250 1000 4000
+
+The load benchmark posts the same synthetic payloads to a running server
+(python app.py --threads N) from concurrent clients and reports throughput
+and latency percentiles:
+
+    python benchmark.py load --endpoint /print-pick-list --concurrency 8 --requests 200
+
+The peak-day benchmark replays a synthetic busiest day against a server on
+the fake printer backend: bursts of /print-orders, /print-range bulk runs,
+pick lists, invoices, germ and mix labels, following an hourly load curve.
+The day is compressed by --speedup, so start the server with printers sped
+up to match, then read off throughput, tail latency, printer queue growth
+and error rates:
+
+    set PRINT_SERVICE_PRINTER_BACKEND=fake
+    set PRINT_SERVICE_FAKE_TIME_SCALE=0.0167
+    python app.py --threads 8
+    python benchmark.py peak-day --speedup 60 --concurrency 8
+"""
+import argparse
+import io
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import app
+
+
+CROPS = ["Tomato", "Pepper", "Lettuce", "Kale", "Squash", "Bean", "Pea", "Carrot", "Beet", "Radish"]
+SKU_SUFFIXES = ["pkt", "1oz", "4oz", "1lb", "5lb"]
+
+
+def make_pick_list_items(count, seed=0):
+    """Synthetic store order lines, roughly a third needing photos"""
+    rng = random.Random(seed)
+    return [
+        {
+            'variety_name': f"Variety {i:05d}",
+            'crop': rng.choice(CROPS),
+            'quantity': rng.randint(1, 50),
+            'has_photo': rng.random() < 0.33,
+        }
+        for i in range(count)
+    ]
+
+
+def make_pull_items(count, unique=500, seed=0):
+    """Synthetic pull list rows drawn from a pool of unique variety/size rows"""
+    rng = random.Random(seed)
+    return [
+        {
+            'variety_name': f"Variety {rng.randrange(unique):05d}",
+            'crop': rng.choice(CROPS),
+            'sku_suffix': rng.choice(SKU_SUFFIXES),
+            'quantity': rng.randint(1, 10),
+        }
+        for _ in range(count)
+    ]
+
+
+def time_call(func, repeat):
+    """Best wall time of repeat calls to func, in seconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench_pick_list(sizes, repeat):
+    print(f"{'rows':>8} {'total ms':>10} {'us/row':>10}")
+    for size in sizes:
+        items = make_pick_list_items(size)
+        elapsed = time_call(
+            lambda: app.generate_pick_list_pdf(io.BytesIO(), "BENCH-1", "Bench Store", items),
+            repeat
+        )
+        print(f"{size:>8} {elapsed * 1000:>10.1f} {elapsed / size * 1e6:>10.1f}")
+
+
+def bench_pull_list(sizes, repeat):
+    print(f"{'rows':>8} {'total ms':>10} {'us/row':>10}")
+    for size in sizes:
+        items = make_pull_items(size)
+        elapsed = time_call(
+            lambda: app.create_pull_items_pdf(io.BytesIO(), items, "bench"),
+            repeat
+        )
+        print(f"{size:>8} {elapsed * 1000:>10.1f} {elapsed / size * 1e6:>10.1f}")
+
+
+LOAD_PAYLOADS = {
+    '/print-pick-list': lambda rows: {
+        'order_number': 'BENCH-1',
+        'store_name': 'Bench Store',
+        'items': make_pick_list_items(rows),
+    },
+    '/print-items-to-pull': lambda rows: {
+        'batch_date': 'bench',
+        'items': make_pull_items(rows),
+    },
+}
+
+
+def post_json(url, payload):
+    """POST payload as JSON and return (status code, seconds taken)"""
+    body = json.dumps(payload).encode('utf-8')
+    req = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except OSError:
+        status = 0  # connection refused, reset or timed out
+    return status, time.perf_counter() - start
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def bench_load(url, endpoint, rows, concurrency, requests):
+    payload = LOAD_PAYLOADS[endpoint](rows)
+    target = url.rstrip('/') + endpoint
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: post_json(target, payload), range(requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(seconds for _, seconds in results)
+    errors = sum(1 for status, _ in results if status >= 400)
+    print(f"{endpoint}: {requests} requests, {rows} rows each, concurrency {concurrency}")
+    print(f"  throughput {requests / elapsed:.1f} req/s, errors {errors}")
+    print(f"  latency ms p50 {percentile(latencies, 0.5) * 1000:.0f}"
+          f"  p95 {percentile(latencies, 0.95) * 1000:.0f}"
+          f"  max {latencies[-1] * 1000:.0f}")
+
+
+def make_orders(count, rng):
+    """Synthetic /print-orders payload: count orders, a few customers with two"""
+    order_data = {}
+    customer_orders = {}
+    for i in range(count):
+        order_number = f"PEAK-{rng.randrange(10 ** 6):06d}-{i}"
+        customer = f"Customer {rng.randrange(count * 2)}"
+        customer_orders.setdefault(customer, []).append(order_number)
+
+        def lines(n):
+            return [
+                {'qty': rng.randint(1, 5), 'lineitem': f"Variety {rng.randrange(500):05d}", 'price': 3.5}
+                for _ in range(n)
+            ]
+
+        order_data[order_number] = {
+            'order_number': order_number,
+            'customer_name': customer,
+            'date': '2026-03-02',
+            'address': '1 Farm Rd',
+            'city': 'Bellingham',
+            'state': 'WA',
+            'postal_code': '98225',
+            'country': 'US',
+            'pkt_items': lines(rng.randint(1, 12)),
+            'bulk_items': lines(1) if rng.random() < 0.2 else [],
+            'misc_items': lines(1) if rng.random() < 0.1 else [],
+            'subtotal': 20,
+            'total': 25,
+        }
+    return {'customer_orders': customer_orders, 'order_data': order_data}
+
+
+def make_range_items(count, rng):
+    """Synthetic /print-range rows: bulk front labels, some with backs"""
+    return {
+        'current_order_year': '26',
+        'items': [
+            {
+                'sku': f"{rng.randrange(500):05d}-{rng.choice(SKU_SUFFIXES)}",
+                'variety_name': f"Variety {rng.randrange(500):05d}",
+                'crop': rng.choice(CROPS),
+                'lot': f"{rng.choice('ABCDEFG')}{rng.randint(1, 9)}",
+                'germination': str(rng.randint(80, 99)),
+                'for_year': '26',
+                'quantity': rng.randint(1, 6),
+                'print_back': rng.random() < 0.3,
+                'back1': 'Sow 1/4 inch deep',
+                'back2': 'Full sun',
+            }
+            for _ in range(count)
+        ],
+    }
+
+
+def make_invoice(count, rng):
+    return {
+        'order': {'order_number': f"W{rng.randrange(10 ** 5):05d}", 'shipping': 12, 'fulfilled_date': '2026-03-02'},
+        'store': {'store_name': 'Bench Store', 'address': '1 Main St', 'city': 'Bellingham', 'state': 'WA', 'zip': '98225'},
+        'items': [
+            {'variety_name': f"Variety {i:05d}", 'crop': rng.choice(CROPS), 'quantity': rng.randint(1, 50), 'price': 1.25}
+            for i in range(count)
+        ],
+    }
+
+
+def make_germ_label(rng):
+    return {
+        'variety_name': f"Variety {rng.randrange(500):05d}",
+        'sku_prefix': f"{rng.randrange(500):05d}",
+        'species': rng.choice(CROPS),
+        'lot_code': f"{rng.choice('ABCDEFG')}{rng.randint(1, 9)}",
+        'germ_year': '26',
+    }
+
+
+def make_mix_label(rng):
+    return {
+        'mix_name': 'Salad Mix',
+        'lot_code': f"M{rng.randint(1, 9)}",
+        'components': [
+            {'parts': str(rng.randint(1, 3)), 'variety': f"Variety {rng.randrange(500):05d}", 'lot': 'A1'}
+            for _ in range(rng.randint(2, 6))
+        ],
+    }
+
+
+# What a peak fulfilment day sends, per shop hour at a load factor of 1.0:
+# requests per hour, requests per burst, and a payload builder
+PEAK_DAY_WORKLOADS = {
+    '/print-orders': (4, (2, 4), lambda rng: make_orders(rng.randint(10, 60), rng)),
+    '/print-range': (3, (1, 1), lambda rng: make_range_items(rng.randint(20, 120), rng)),
+    '/print-pick-list': (6, (1, 2), lambda rng: {
+        'order_number': f"S{rng.randrange(10 ** 5):05d}",
+        'store_name': 'Bench Store',
+        'items': make_pick_list_items(rng.randint(50, 400), seed=rng.random()),
+    }),
+    '/print-store-order-invoice': (6, (1, 1), lambda rng: make_invoice(rng.randint(20, 200), rng)),
+    '/print-germ-label': (20, (1, 5), make_germ_label),
+    '/print-mix-label': (4, (1, 2), make_mix_label),
+}
+
+# Relative load in each hour of the shop day
+PEAK_DAY_PROFILE = [0.6, 1.0, 1.5, 1.5, 1.0, 1.2, 0.9, 0.5]
+
+
+def peak_day_schedule(load, seed):
+    """[(simulated seconds into the day, endpoint, payload)] sorted by time"""
+    rng = random.Random(seed)
+    events = []
+    for hour, factor in enumerate(PEAK_DAY_PROFILE):
+        for endpoint, (per_hour, (burst_min, burst_max), make_payload) in PEAK_DAY_WORKLOADS.items():
+            rate = per_hour * factor * load / 3600.0
+            t = hour * 3600.0
+            while rate > 0:
+                t += rng.expovariate(rate)
+                if t >= (hour + 1) * 3600.0:
+                    break
+                for i in range(rng.randint(burst_min, burst_max)):
+                    events.append((t + i * rng.uniform(1, 20), endpoint, make_payload(rng)))
+    events.sort(key=lambda event: event[0])
+    return events
+
+
+def get_json(url):
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            return json.loads(response.read())
+    except (OSError, ValueError):
+        return None
+
+
+def sample_queues(url, interval, samples, stop):
+    """Append (seconds, {printer: jobs printing or waiting}) every interval until stop is set"""
+    start = time.perf_counter()
+    while not stop.wait(interval):
+        status = get_json(url.rstrip('/') + '/printers/queue')
+        if not status:
+            continue
+        depths = {
+            name: int(printer['busy']) + sum(printer['waiting'].values())
+            for name, printer in status['printers'].items()
+        }
+        samples.append((time.perf_counter() - start, depths))
+
+
+def bench_peak_day(url, speedup, concurrency, load, seed, sample_interval):
+    events = peak_day_schedule(load, seed)
+    day_seconds = len(PEAK_DAY_PROFILE) * 3600 / speedup
+    print(f"Peak day: {len(events)} requests over {len(PEAK_DAY_PROFILE)} shop hours "
+          f"replayed in {day_seconds:.0f}s (speedup {speedup:g}, load {load:g}, concurrency {concurrency})")
+    print(f"  server should run with PRINT_SERVICE_FAKE_TIME_SCALE={1 / speedup:.4f}")
+
+    results = []  # (endpoint, status, seconds from scheduled time, seconds in flight)
+    results_lock = threading.Lock()
+    samples = []
+    stop = threading.Event()
+    sampler = threading.Thread(target=sample_queues, args=(url, sample_interval, samples, stop), daemon=True)
+    sampler.start()
+
+    def send(scheduled, endpoint, payload):
+        status, seconds = post_json(url.rstrip('/') + endpoint, payload)
+        with results_lock:
+            results.append((endpoint, status, time.perf_counter() - scheduled, seconds))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for t, endpoint, payload in events:
+            scheduled = start + t / speedup
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(send, scheduled, endpoint, payload)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    sampler.join()
+
+    completed = sum(1 for _, status, _, _ in results if 0 < status < 400)
+    print(f"  sustained throughput {completed / elapsed:.2f} req/s over {elapsed:.0f}s "
+          f"({elapsed / day_seconds:.2f}x the scheduled day)")
+    print()
+    print(f"{'endpoint':<28} {'reqs':>5} {'err %':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for endpoint in PEAK_DAY_WORKLOADS:
+        rows = [row for row in results if row[0] == endpoint]
+        if not rows:
+            continue
+        # Latency counts from the scheduled send time, so client-side backlog shows up too
+        latencies = sorted(row[2] for row in rows)
+        errors = sum(1 for row in rows if not 0 < row[1] < 400)
+        print(f"{endpoint:<28} {len(rows):>5} {errors / len(rows) * 100:>6.1f}"
+              f" {percentile(latencies, 0.5) * 1000:>8.0f} {percentile(latencies, 0.95) * 1000:>8.0f}"
+              f" {percentile(latencies, 0.99) * 1000:>8.0f} {latencies[-1] * 1000:>8.0f}")
+
+    if not samples:
+        print("\nNo /printers/queue samples (is the server running?)")
+        return
+    print()
+    print(f"{'printer queue depth':<28} {'max':>5} {'mean':>6} {'end':>5} {'growth/min':>11}")
+    for name in samples[-1][1]:
+        series = [(t, depths.get(name, 0)) for t, depths in samples]
+        depths = [depth for _, depth in series]
+        # Least-squares slope of depth over time: > 0 means the printer is falling behind
+        mean_t = sum(t for t, _ in series) / len(series)
+        mean_d = sum(depths) / len(depths)
+        spread = sum((t - mean_t) ** 2 for t, _ in series)
+        slope = sum((t - mean_t) * (d - mean_d) for t, d in series) / spread if spread else 0.0
+        print(f"{name:<28} {max(depths):>5} {mean_d:>6.2f} {depths[-1]:>5} {slope * 60:>11.2f}")
+
+
+BENCHMARKS = {
+    'pick-list': bench_pick_list,
+    'pull-list': bench_pull_list,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS) + ['load', 'peak-day'])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[250, 500, 1000, 2000, 4000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--endpoint', choices=sorted(LOAD_PAYLOADS), default='/print-pick-list')
+    parser.add_argument('--rows', type=int, default=200, help="items per load request")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--speedup', type=float, default=60,
+                        help="simulated seconds of the peak day per real second")
+    parser.add_argument('--load', type=float, default=1.0,
+                        help="multiplier on the peak day's request rates")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--sample', type=float, default=1.0,
+                        help="seconds between printer queue samples")
+    args = parser.parse_args()
+
+    if args.benchmark == 'load':
+        bench_load(args.url, args.endpoint, args.rows, args.concurrency, args.requests)
+    elif args.benchmark == 'peak-day':
+        bench_peak_day(args.url, args.speedup, args.concurrency, args.load, args.seed, args.sample)
+    else:
+        BENCHMARKS[args.benchmark](args.sizes, args.repeat)
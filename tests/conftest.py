@@ -0,0 +1,66 @@
+"""
+Runs app.py on the fake printer backend: no pywin32 and no printers needed.
+Fonts, caches, the journal and every file the app keeps go to a scratch
+directory. ReportLab's bundled Vera font stands in for the Windows fonts.
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+import reportlab
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRATCH_DIR = tempfile.mkdtemp(prefix="print_service_tests_")
+FONT_DIR = os.path.join(SCRATCH_DIR, "fonts")
+
+# Every file name in PDF_FONT_FILES and PREVIEW_FONT_FILES
+FONT_FILES = [
+    "calibri.ttf", "calibrib.ttf", "calibrii.ttf",
+    "times.ttf", "timesbd.ttf", "timesi.ttf", "timesbi.ttf",
+    "cour.ttf", "courbd.ttf", "couri.ttf",
+    "ANTQUA.TTF", "ANTQUAB.TTF", "ANTQUAI.TTF",
+]
+
+os.makedirs(FONT_DIR)
+vera = os.path.join(os.path.dirname(reportlab.__file__), "fonts", "Vera.ttf")
+for file_name in FONT_FILES:
+    shutil.copy(vera, os.path.join(FONT_DIR, file_name))
+
+os.environ.update({
+    "PRINT_SERVICE_PRINTER_BACKEND": "fake",
+    "PRINT_SERVICE_FAKE_TIME_SCALE": "0",
+    "PRINT_SERVICE_FONT_DIR": FONT_DIR,
+    "PRINT_SERVICE_FONT_CACHE_DIR": os.path.join(SCRATCH_DIR, "font_cache"),
+    "PRINT_SERVICE_JOURNAL": os.path.join(SCRATCH_DIR, "print_journal.db"),
+    "PRINT_SERVICE_SPOOL_DIR": os.path.join(SCRATCH_DIR, "spool"),
+    "PRINT_SERVICE_RASTER_CACHE_DIR": os.path.join(SCRATCH_DIR, "raster_cache"),
+    "PRINT_SERVICE_PROFILE_DIR": os.path.join(SCRATCH_DIR, "profiles"),
+    "PRINT_SERVICE_TRACE_FILE": "",
+})
+
+# app.py writes its error log and kept PDFs relative to the working directory
+os.chdir(SCRATCH_DIR)
+sys.path.insert(0, REPO_DIR)
+
+import app  # noqa: E402
+
+
+def pytest_unconfigure(config):
+    os.chdir(REPO_DIR)
+    shutil.rmtree(SCRATCH_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+def client():
+    app.app.config['TESTING'] = True
+    return app.app.test_client()
+
+
+@pytest.fixture
+def journal(tmp_path, monkeypatch):
+    """A fresh print journal in place of the app's own"""
+    print_journal = app.PrintJournal(str(tmp_path / "print_journal.db"))
+    monkeypatch.setattr(app, 'JOURNAL', print_journal)
+    return print_journal
@@ -0,0 +1,98 @@
+import pytest
+
+import app
+
+
+@pytest.fixture(autouse=True)
+def throughput(monkeypatch):
+    """Rated costs only (1.5s a roll label, 12s a sheet) and idle printers"""
+    monkeypatch.setitem(app.PRINT_RATED_SECONDS, 'roll_label', 1.5)
+    monkeypatch.setitem(app.PRINT_RATED_SECONDS, 'sheet', 12.0)
+    monkeypatch.setattr(app, 'PRINT_COSTS', {kind: None for kind in app.PRINT_RATED_SECONDS})
+    monkeypatch.setattr(app, 'PRINT_COST_SAMPLES', {kind: 0 for kind in app.PRINT_RATED_SECONDS})
+    monkeypatch.setattr(app, 'PRINTER_LOCKS', {})
+
+
+def busy(printer_name, job_seconds):
+    """Hold printer_name's lock as a running job that averages job_seconds"""
+    lock = app.get_printer_lock(printer_name)
+    lock.acquire(app.PRINT_PRIORITIES['bulk'])
+    lock.job_seconds = job_seconds
+    return lock
+
+
+@pytest.mark.parametrize('quantity, route', [
+    (1, 'roll'),
+    (8, 'roll'),      # 12s either way: ties stay on roll
+    (9, 'sheet'),
+    (300, 'sheet'),
+])
+def test_idle_printers_route_by_print_time(quantity, route):
+    assert app.plan_label_route(quantity)['route'] == route
+
+
+def test_plan_reports_each_printers_estimate():
+    plan = app.plan_label_route(31)
+
+    assert plan['roll'] == {
+        'printer': app.ROLL_PRINTER, 'queue_depth': 0, 'queue_seconds': 0.0,
+        'print_seconds': 46.5, 'finish_seconds': 46.5,
+    }
+    assert plan['sheet'] == {
+        'printer': app.SHEET_PRINTER, 'sheets': 2, 'queue_depth': 0, 'queue_seconds': 0.0,
+        'print_seconds': 24.0, 'finish_seconds': 24.0,
+    }
+
+
+def test_measured_cost_only_ever_raises_the_rated_one(monkeypatch):
+    monkeypatch.setitem(app.PRINT_COSTS, 'roll_label', 3.0)
+    assert app.plan_label_route(4)['route'] == 'roll'
+    assert app.plan_label_route(5)['route'] == 'sheet'
+
+    monkeypatch.setitem(app.PRINT_COSTS, 'roll_label', 0.1)
+    assert app.plan_label_route(8)['route'] == 'roll'
+
+
+def test_a_busy_roll_printer_sends_small_jobs_to_sheets():
+    lock = busy(app.ROLL_PRINTER, 100.0)
+    try:
+        plan = app.plan_label_route(1)
+    finally:
+        lock.release()
+
+    assert plan['route'] == 'sheet'
+    assert (plan['roll']['queue_depth'], plan['roll']['queue_seconds']) == (1, 100.0)
+
+
+def test_a_busy_sheet_printer_keeps_large_jobs_on_the_roll():
+    lock = busy(app.SHEET_PRINTER, 1000.0)
+    try:
+        plan = app.plan_label_route(300)
+    finally:
+        lock.release()
+
+    assert plan['route'] == 'roll'
+    assert plan['sheet']['finish_seconds'] == 1120.0
+
+
+def test_route_only_returns_the_plan_without_printing(client):
+    response = client.post('/print-auto', json={
+        'variety_name': 'Sungold', 'sku_suffix': 'pkt', 'quantity': 300, 'route_only': True,
+    })
+
+    assert response.status_code == 200
+    assert response.get_json()['routing']['route'] == 'sheet'
+    assert app.get_printer_lock(app.SHEET_PRINTER).queue_depth() == 0
+
+
+def test_a_sheet_routed_job_checkpoints_after_every_sheet(client, monkeypatch):
+    checkpoints = []
+    monkeypatch.setattr(app, 'printer_checkpoint', checkpoints.append)
+
+    response = client.post('/print-auto', json={'variety_name': 'Sungold', 'sku_suffix': 'pkt', 'quantity': 75})
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['routing']['route'] == 'sheet'
+    assert len(body['sheets']) == 3
+    assert checkpoints == [app.SHEET_PRINTER] * 3
@@ -0,0 +1,129 @@
+import threading
+import time
+
+import pytest
+
+import app
+
+
+LABEL = {'variety_name': 'Sungold', 'sku_suffix': 'pkt', 'quantity': 2, 'env_multiplier': 1}
+
+
+@pytest.fixture
+def documents(monkeypatch):
+    """Each spooler document print_batch_group is asked for, as a list of job types"""
+    documents = []
+
+    def print_batch_group(printer_name, jobs):
+        documents.append([job['type'] for job in jobs])
+        return [
+            {'success': False, 'error': 'Bad label'} if job['data'].get('bad') else {'success': True, 'copies': 2}
+            for job in jobs
+        ]
+
+    monkeypatch.setattr(app, 'print_batch_group', print_batch_group)
+    monkeypatch.setattr(app, 'record_print_cost', lambda kind, units, seconds: None)
+    return documents
+
+
+def submit_in_threads(coalescer, requests):
+    """Submit (job_type, data, priority) requests from one thread each, in order; returns their results"""
+    results = [None] * len(requests)
+    threads = []
+    for index, (job_type, data, priority) in enumerate(requests):
+        def run(index=index, job_type=job_type, data=data, priority=priority):
+            app.PRINT_CONTEXT.priority = priority
+            results[index] = coalescer.submit(job_type, data)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        threads.append(thread)
+        # The first request opens the window; wait for it so it leads
+        deadline = time.monotonic() + 5
+        while index == 0 and not coalescer.pending and time.monotonic() < deadline:
+            time.sleep(0.001)
+    for thread in threads:
+        thread.join(10)
+    return results
+
+
+def test_requests_inside_the_window_print_as_one_document(documents):
+    coalescer = app.LabelCoalescer(window_seconds=0.5, max_jobs=20)
+
+    results = submit_in_threads(coalescer, [
+        ('front', LABEL, 'interactive'),
+        ('back', LABEL, 'interactive'),
+        ('front', LABEL, 'interactive'),
+    ])
+
+    assert documents == [['front', 'back', 'front']]
+    assert results == [
+        {'success': True, 'message': 'Front Single Label printed successfully (2 copies)'},
+        {'success': True, 'message': 'Back Single Label printed successfully (2 copies)'},
+        {'success': True, 'message': 'Front Single Label printed successfully (2 copies)'},
+    ]
+    assert coalescer.status()['documents'] == 1
+    assert coalescer.status()['largest_document'] == 3
+
+
+def test_max_jobs_closes_the_window_early(documents):
+    coalescer = app.LabelCoalescer(window_seconds=30, max_jobs=2)
+
+    start = time.monotonic()
+    submit_in_threads(coalescer, [('front', LABEL, 'interactive'), ('front', LABEL, 'interactive')])
+
+    assert time.monotonic() - start < 10
+    assert documents == [['front', 'front']]
+
+
+def test_a_request_after_the_window_starts_a_new_document(documents):
+    coalescer = app.LabelCoalescer(window_seconds=0.01, max_jobs=20)
+
+    coalescer.submit('front', LABEL)
+    coalescer.submit('back', LABEL)
+
+    assert documents == [['front'], ['back']]
+    assert coalescer.status()['waiting'] == 0
+
+
+def test_priorities_are_not_merged(documents):
+    coalescer = app.LabelCoalescer(window_seconds=0.3, max_jobs=20)
+
+    submit_in_threads(coalescer, [('front', LABEL, 'interactive'), ('front', LABEL, 'bulk')])
+
+    assert sorted(documents) == [['front'], ['front']]
+
+
+def test_a_bad_label_only_fails_its_own_request(documents):
+    coalescer = app.LabelCoalescer(window_seconds=0.5, max_jobs=2)
+
+    results = submit_in_threads(coalescer, [
+        ('front', LABEL, 'interactive'),
+        ('front', {**LABEL, 'bad': True}, 'interactive'),
+    ])
+
+    assert results[0]['success'] is True
+    assert results[1] == {'success': False, 'error': 'Bad label'}
+
+
+def test_a_printer_failure_fails_every_request_in_the_document(monkeypatch):
+    def print_batch_group(printer_name, jobs):
+        raise RuntimeError("Spooler stopped")
+
+    monkeypatch.setattr(app, 'print_batch_group', print_batch_group)
+    coalescer = app.LabelCoalescer(window_seconds=0.5, max_jobs=2)
+
+    results = submit_in_threads(coalescer, [('front', LABEL, 'interactive'), ('back', LABEL, 'interactive')])
+
+    assert results == [{'success': False, 'error': 'Spooler stopped'}] * 2
+
+
+def test_single_label_route_uses_the_coalescer_when_enabled(client, documents, monkeypatch):
+    monkeypatch.setattr(app, 'COALESCE_WINDOW_SECONDS', 0.01)
+    monkeypatch.setattr(app, 'LABEL_COALESCER', app.LabelCoalescer(0.01, 20))
+
+    response = client.post('/print-single-back', json={'variety_name': 'Sungold'})
+
+    assert response.status_code == 200
+    assert response.get_json()['message'] == 'Back Single Label printed successfully (2 copies)'
+    assert documents == [['back']]
@@ -0,0 +1,85 @@
+import pytest
+
+import app
+
+
+FRONT_LABEL = {'variety_name': 'Sungold', 'sku_suffix': 'pkt'}
+ORDER = {'order_number': '1001', 'customer_name': 'Ann', 'date': '2025-03-01', 'pkt_items': []}
+
+
+@pytest.fixture(autouse=True)
+def throughput(monkeypatch):
+    """Rated costs only (1.5s a roll label, 12s a sheet) and idle printers"""
+    monkeypatch.setitem(app.PRINT_RATED_SECONDS, 'roll_label', 1.5)
+    monkeypatch.setitem(app.PRINT_RATED_SECONDS, 'sheet', 12.0)
+    monkeypatch.setattr(app, 'PRINT_COSTS', {kind: None for kind in app.PRINT_RATED_SECONDS})
+    monkeypatch.setattr(app, 'PRINT_COST_SAMPLES', {kind: 0 for kind in app.PRINT_RATED_SECONDS})
+    monkeypatch.setattr(app, 'PRINTER_LOCKS', {})
+    monkeypatch.setattr(app, 'CURRENT_USER', 'tester')
+
+
+def test_a_dry_run_counts_labels_without_printing(client):
+    response = client.post('/print-single-front', json={**FRONT_LABEL, 'quantity': 3, 'dry_run': True})
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['dry_run'] is True
+    estimate = body['estimate']
+    assert (estimate['labels'], estimate['sheets'], estimate['pages']) == (3, 0, 3)
+    assert estimate['print_seconds'] == 4.5
+    assert estimate['estimated_seconds'] == 4.5
+    assert app.PRINT_COST_SAMPLES['roll_label'] == 0
+    assert app.get_printer_lock(app.ROLL_PRINTER).job_seconds is None
+
+
+def test_dry_run_can_be_asked_for_in_the_query_string(client):
+    response = client.post('/print-sheet-front?dry_run=1', json={**FRONT_LABEL, 'quantity': 2})
+
+    estimate = response.get_json()['estimate']
+    assert (estimate['labels'], estimate['sheets']) == (0, 2)
+    assert estimate['printers'][app.SHEET_PRINTER]['print_seconds'] == 24.0
+
+
+def test_the_estimate_includes_the_printers_queue(client):
+    lock = app.get_printer_lock(app.ROLL_PRINTER)
+    lock.acquire(app.PRINT_PRIORITIES['bulk'])
+    lock.job_seconds = 60.0
+    try:
+        response = client.post('/print-single-front', json={**FRONT_LABEL, 'dry_run': True})
+    finally:
+        lock.release()
+
+    estimate = response.get_json()['estimate']
+    assert estimate['queue_seconds'] == 60.0
+    assert estimate['estimated_seconds'] == 61.5
+    assert estimate['printers'][app.ROLL_PRINTER]['queue_depth'] == 1
+
+
+def test_a_dry_run_of_orders_journals_nothing(client, journal, monkeypatch):
+    monkeypatch.setattr(app, 'fake_print_pages', lambda *args: pytest.fail("printed during a dry run"))
+    response = client.post('/print-orders', json={
+        'dry_run': True,
+        'customer_orders': {'Ann': ['1001'], 'Bob': ['1002']},
+        'order_data': {'1001': ORDER, '1002': {**ORDER, 'order_number': '1002', 'customer_name': 'Bob'}},
+    })
+
+    assert response.status_code == 200
+    estimate = response.get_json()['estimate']
+    assert estimate['spool_jobs'] == 2
+    assert estimate['sheets'] >= 2
+    assert journal.job_summary() == []
+
+
+def test_printing_for_real_has_no_estimate(client):
+    body = client.post('/print-single-front', json={**FRONT_LABEL, 'dry_run': False}).get_json()
+
+    assert body['success'] is True
+    assert 'estimate' not in body
+    assert 'dry_run' not in body
+
+
+def test_dry_run_flag_is_validated(client):
+    response = client.post('/print-single-front', json={**FRONT_LABEL, 'dry_run': 'maybe'})
+
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == [{'field': 'dry_run', 'error': 'must be true or false'}]
@@ -0,0 +1,45 @@
+import app
+
+
+def test_matrix_sums_counts_per_year_and_type():
+    matrix = app.build_envelope_matrix(
+        ['2024', '2025', 2024, '2025'],
+        ['Standard', 'Standard', 'Large', 'Standard'],
+        [3, 1, '2', 4],
+    )
+
+    assert matrix['years'] == ['2024', '2025']
+    assert matrix['envelope_types'] == ['Large', 'Standard']
+    assert matrix['rows'] == [[2, 0], [3, 5]]
+    assert matrix['row_totals'] == [2, 8]
+    assert matrix['year_totals'] == [5, 5]
+    assert matrix['grand_total'] == 10
+
+
+def test_matrix_sorts_years_numerically_with_text_years_last():
+    matrix = app.build_envelope_matrix(['n/a', '2025', '999'], ['A', 'A', 'A'], [1, 1, 1])
+
+    assert matrix['years'] == ['999', '2025', 'n/a']
+
+
+def test_matrix_reports_only_requested_years_and_adds_unused_types():
+    matrix = app.build_envelope_matrix(
+        ['2024', '2025'],
+        ['Standard', 'Standard'],
+        [3, 4],
+        years=['2025', '2026'],
+        envelope_types=['Large'],
+    )
+
+    assert matrix['years'] == ['2025', '2026']
+    assert matrix['envelope_types'] == ['Large', 'Standard']
+    assert matrix['rows'] == [[0, 0], [4, 0]]
+    assert matrix['grand_total'] == 4
+
+
+def test_matrix_of_no_usage():
+    matrix = app.build_envelope_matrix([], [], [], years=['2025'])
+
+    assert matrix['rows'] == []
+    assert matrix['year_totals'] == [0]
+    assert matrix['grand_total'] == 0
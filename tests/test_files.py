@@ -0,0 +1,75 @@
+import os
+import time
+
+import app
+
+
+DAY = 86400
+
+
+def write(path, age_seconds=0, content=b'x' * 10):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+    stamp = time.time() - age_seconds
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def test_an_owners_directory_goes_when_its_last_user_leaves(tmp_path):
+    spool = app.SpoolDirectory(str(tmp_path), ttl_seconds=DAY)
+
+    with spool.owner('job-1') as outer:
+        with spool.owner('job-1') as inner:
+            assert inner == outer
+            write(os.path.join(inner, 'slip.pdf'))
+        assert os.path.exists(os.path.join(outer, 'slip.pdf'))
+        assert spool.status()['active_owners'] == ['job-1']
+
+    assert not os.path.exists(outer)
+    assert spool.status()['active_owners'] == []
+
+
+def test_sweep_removes_only_files_past_the_ttl(tmp_path):
+    spool = app.SpoolDirectory(str(tmp_path), ttl_seconds=DAY)
+    stale = write(str(tmp_path / 'stale.pdf'), age_seconds=2 * DAY)
+    fresh = write(str(tmp_path / 'fresh.pdf'), age_seconds=60)
+    crashed_job = write(str(tmp_path / 'job-1' / 'orders.ndjson'), age_seconds=2 * DAY)
+
+    assert spool.sweep() == 2
+
+    assert not os.path.exists(stale)
+    assert os.path.exists(fresh)
+    assert not os.path.exists(os.path.dirname(crashed_job))
+    assert spool.status()['files_removed'] == 2
+    assert spool.status()['bytes_removed'] == 20
+
+
+def test_sweep_leaves_running_owners_alone(tmp_path):
+    spool = app.SpoolDirectory(str(tmp_path), ttl_seconds=DAY)
+
+    with spool.owner('job-1') as path:
+        old = write(os.path.join(path, 'orders.ndjson'), age_seconds=2 * DAY)
+        assert spool.sweep() == 0
+        assert os.path.exists(old)
+
+
+def test_retention_is_per_kept_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(app, 'FILE_RETENTION_DAYS', {'packing_slips': 7, 'store_invoices': 0})
+    expired = write('packing_slips/1001_a.pdf', age_seconds=8 * DAY)
+    recent = write('packing_slips/1002_b.pdf', age_seconds=6 * DAY)
+    invoice = write('store_invoices/2024_invoice.pdf', age_seconds=400 * DAY)
+
+    assert app.apply_retention() == {'packing_slips': 1}
+
+    assert not os.path.exists(expired)
+    assert os.path.exists(recent)
+    assert os.path.exists(invoice)
+
+
+def test_files_route_reports_the_spool_and_retention(client):
+    body = client.get('/files').get_json()
+
+    assert body['spool']['root'] == app.SPOOL_DIR
+    assert body['retention_days'] == app.FILE_RETENTION_DAYS
@@ -0,0 +1,90 @@
+import io
+import os
+import shutil
+
+import pytest
+import reportlab
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+import app
+
+
+REPORTLAB_FONTS = os.path.join(os.path.dirname(reportlab.__file__), "fonts")
+
+
+@pytest.fixture
+def font_path(tmp_path, monkeypatch):
+    """A copy of Vera.ttf, with the font cache in a fresh directory"""
+    monkeypatch.setattr(app, 'FONT_CACHE_DIR', str(tmp_path / 'font_cache'))
+    path = str(tmp_path / 'calibri.ttf')
+    shutil.copy(os.path.join(REPORTLAB_FONTS, 'Vera.ttf'), path)
+    return path
+
+
+@pytest.fixture
+def parsed(monkeypatch):
+    """Names of the fonts ReportLab parsed from their TrueType files"""
+    parsed = []
+
+    class CountingTTFont(app.TTFont):
+        def __init__(self, name, *args, **kwargs):
+            parsed.append(name)
+            super().__init__(name, *args, **kwargs)
+
+    monkeypatch.setattr(app, 'TTFont', CountingTTFont)
+    return parsed
+
+
+def test_a_font_is_parsed_once_then_restored_from_the_cache(font_path, parsed):
+    first = app.load_ttfont('Cache-Test', font_path)
+    assert parsed == ['Cache-Test']
+    assert os.listdir(app.FONT_CACHE_DIR) == [os.path.basename(app.font_cache_path(font_path))]
+
+    restored = app.load_ttfont('Cache-Test-Restored', font_path)
+
+    assert parsed == ['Cache-Test']
+    assert restored.fontName == 'Cache-Test-Restored'
+    assert restored.face.charWidths == first.face.charWidths
+    assert restored.stringWidth('Sungold Tomato', 12) == first.stringWidth('Sungold Tomato', 12)
+
+
+def test_a_restored_font_draws_into_a_pdf(font_path):
+    app.load_ttfont('Cache-Test-Draw', font_path)  # parse and cache
+    pdfmetrics.registerFont(app.load_ttfont('Cache-Test-Draw', font_path))
+
+    output = io.BytesIO()
+    pdf = canvas.Canvas(output)
+    pdf.setFont('Cache-Test-Draw', 12)
+    pdf.drawString(72, 720, 'Sungold Tomato')
+    pdf.save()
+
+    assert output.getvalue().startswith(b'%PDF')
+    assert b'/FontFile2' in output.getvalue()  # the font was embedded
+
+
+def test_a_changed_font_file_is_parsed_again(font_path, parsed):
+    app.load_ttfont('Cache-Test', font_path)
+    old_cache = app.font_cache_path(font_path)
+
+    shutil.copy(os.path.join(REPORTLAB_FONTS, 'VeraBd.ttf'), font_path)
+    font = app.load_ttfont('Cache-Test', font_path)
+
+    assert parsed == ['Cache-Test', 'Cache-Test']
+    assert app.font_cache_path(font_path) != old_cache
+    assert font.face.name == TTFont('Bold', os.path.join(REPORTLAB_FONTS, 'VeraBd.ttf')).face.name
+
+
+def test_an_unreadable_cache_file_falls_back_to_parsing(font_path, parsed):
+    app.load_ttfont('Cache-Test', font_path)
+    with open(app.font_cache_path(font_path), 'wb') as f:
+        f.write(b'not a pickle')
+
+    font = app.load_ttfont('Cache-Test', font_path)
+
+    assert parsed == ['Cache-Test', 'Cache-Test']
+    assert font.stringWidth('Sungold', 12) > 0
+    # The bad file was replaced with a good one
+    assert app.load_ttfont('Cache-Test', font_path) is not None
+    assert parsed == ['Cache-Test', 'Cache-Test']
@@ -0,0 +1,149 @@
+import pytest
+
+import app
+
+
+ORDER = {'customer_name': 'Ann', 'date': '2025-03-01', 'pkt_items': []}
+
+
+def finished_items(journal, job_id):
+    return [row['item_key'] for row in journal.query(
+        "SELECT item_key FROM job_items WHERE job_id = ? ORDER BY item_key", (job_id,)
+    )]
+
+
+def test_recorded_items_are_committed_with_the_final_status(journal):
+    job = journal.start_job('print_range', {'items': []}, 2, 'job-1')
+    job.checkpoint()
+    job.record('0:1', sku='TOM-SG-pkt', lot='A1')
+    job.checkpoint()
+    job.record('1:1')
+    job.finish('done')
+
+    assert finished_items(journal, 'job-1') == ['0:1', '1:1']
+    summary = journal.job_summary('job-1')[0]
+    assert (summary['status'], summary['finished_items']) == ('done', 2)
+    assert journal.query("SELECT sku, lot FROM job_items WHERE item_key = '0:1'") == [{'sku': 'TOM-SG-pkt', 'lot': 'A1'}]
+
+
+def test_duplicate_job_id_is_rejected(journal):
+    journal.start_job('print_range', {}, 0, 'job-1')
+
+    with pytest.raises(app.sqlite3.IntegrityError):
+        journal.start_job('print_range', {}, 0, 'job-1')
+
+
+def test_a_job_left_running_by_a_dead_process_resumes_past_its_finished_items(journal):
+    job = journal.start_job('print_range', {'items': []}, 3, 'job-1')
+    job.record('0:1')
+    job.flush()
+
+    restarted = app.PrintJournal(journal.path)
+    assert restarted.job_summary('job-1')[0]['status'] == 'interrupted'
+
+    row, resumed = restarted.resume_job('job-1')
+    assert row['endpoint'] == 'print_range'
+    assert resumed.is_done('0:1')
+    assert not resumed.is_done('1:1')
+    assert restarted.job_summary('job-1')[0]['status'] == 'running'
+
+
+def test_only_one_resume_claims_a_job(journal):
+    job = journal.start_job('print_range', {}, 1, 'job-1')
+    job.finish('failed', 'Printer offline')
+
+    _, first = journal.resume_job('job-1')
+    row, second = journal.resume_job('job-1')
+
+    assert first is not None
+    assert second is None
+    assert row['status'] == 'running'
+
+
+def test_finished_and_unknown_jobs_are_not_resumed(journal):
+    journal.start_job('print_range', {}, 0, 'job-1').finish('done')
+
+    row, job = journal.resume_job('job-1')
+    assert (row['status'], job) == ('done', None)
+    assert journal.resume_job('no-such-job') == (None, None)
+
+
+def test_run_journaled_marks_error_responses_and_exceptions_failed(journal):
+    failed = journal.start_job('print_range', {}, 1, 'job-1')
+    body, status = app.run_journaled(lambda data, job: ({'success': False, 'error': 'Printer offline'}, 500), {}, failed)
+
+    assert (status, body['job_id']) == (500, 'job-1')
+    assert journal.job_summary('job-1')[0]['error'] == 'Printer offline'
+
+    def runner(data, job):
+        job.record('0:1')
+        raise RuntimeError("Spooler stopped")
+
+    crashed = journal.start_job('print_range', {}, 2, 'job-2')
+    with pytest.raises(RuntimeError):
+        app.run_journaled(runner, {}, crashed)
+
+    summary = journal.job_summary('job-2')[0]
+    assert (summary['status'], summary['error'], summary['finished_items']) == ('failed', 'Spooler stopped', 1)
+
+
+def test_cancel_stops_the_job_at_the_next_checkpoint(journal):
+    job = journal.start_job('print_range', {}, 3, 'job-1')
+
+    def runner(data, job):
+        for item in range(3):
+            job.checkpoint()
+            job.record(str(item))
+            if item == 0:
+                job.cancel()
+        return {'success': True}, 200
+
+    body, status = app.run_journaled(runner, {}, job)
+
+    assert status == 200
+    assert body['cancelled'] is True
+    assert finished_items(journal, 'job-1') == ['0']
+    assert journal.job_summary('job-1')[0]['status'] == 'cancelled'
+
+
+def test_cancel_route_only_cancels_running_jobs(client, journal):
+    assert client.post('/jobs/no-such-job/cancel').status_code == 404
+
+    journal.start_job('print_range', {}, 0, 'job-done').finish('done')
+    assert client.post('/jobs/job-done/cancel').status_code == 409
+
+    job = journal.start_job('print_range', {}, 0, 'job-running')
+    response = client.post('/jobs/job-running/cancel')
+    assert response.status_code == 200
+    assert job.cancel_requested.is_set()
+
+
+def test_an_order_that_fails_to_print_is_retried_on_resume(client, journal, monkeypatch):
+    printed = []
+
+    def send_pdf_to_printer(pdf, *args, **kwargs):
+        if len(printed) == 1:
+            raise RuntimeError("Printer offline")
+        printed.append(pdf)
+
+    monkeypatch.setattr(app, 'CURRENT_USER', 'tester')
+    monkeypatch.setattr(app, 'send_pdf_to_printer', send_pdf_to_printer)
+    response = client.post('/print-orders', json={
+        'job_id': 'orders-1',
+        'customer_orders': {'Ann': ['1001'], 'Bob': ['1002']},
+        'order_data': {'1001': ORDER, '1002': {**ORDER, 'customer_name': 'Bob'}},
+    })
+
+    assert response.status_code == 500
+    assert response.get_json()['failed_orders'] == ['1002']
+    assert finished_items(journal, 'orders-1') == ['1001']
+    assert journal.job_summary('orders-1')[0]['status'] == 'failed'
+
+    monkeypatch.setattr(app, 'send_pdf_to_printer', lambda pdf, *args, **kwargs: printed.append(pdf))
+    response = client.post('/jobs/orders-1/resume')
+
+    assert response.status_code == 200
+    assert response.get_json()['skipped_items'] == 1
+    assert len(printed) == 2
+    assert finished_items(journal, 'orders-1') == ['1001', '1002']
+    assert journal.job_summary('orders-1')[0]['status'] == 'done'
@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+import app
+
+
+def order(order_number, customer_name, **fields):
+    return {'order_number': order_number, 'customer_name': customer_name, 'date': '2025-03-01', **fields}
+
+
+BULK_ITEM = {'qty': 1, 'lineitem': 'Sungold 1oz', 'price': 12.5}
+
+
+def ndjson(*lines):
+    return "\n".join(line if isinstance(line, str) else json.dumps(line) for line in lines) + "\n"
+
+
+@pytest.fixture
+def printed(monkeypatch):
+    """Order numbers in the order their packing slips were printed"""
+    printed = []
+
+    def generate_pdf(order_number, order, action):
+        printed.append(order_number)
+        return True
+
+    monkeypatch.setattr(app, 'generate_pdf', generate_pdf)
+    return printed
+
+
+def post_stream(client, body, query=''):
+    return client.post('/print-orders/stream' + query, data=body, content_type='application/x-ndjson')
+
+
+def test_orders_print_duplicates_first_then_packet_only_then_bulk(client, journal, printed):
+    response = post_stream(client, ndjson(
+        {'customer_orders': {'Ann': ['1001', '1004'], 'Bob': ['1002'], 'Cy': ['1003']}},
+        order('1002', 'Bob', bulk_items=[BULK_ITEM]),
+        order('1001', 'Ann'),
+        order('1003', 'Cy'),
+        '',
+        order('1004', 'Ann', bulk_items=[BULK_ITEM]),
+    ), '?job_id=stream-1')
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['orders_received'] == 4
+    assert body['multiple_order_customers'] == {'Ann': ['1001', '1004']}
+    assert printed == ['1001', '1004', '1003', '1002']
+
+    summary = journal.job_summary('stream-1')[0]
+    assert (summary['status'], summary['total_items'], summary['finished_items']) == ('done', 4, 4)
+
+
+def test_bad_lines_are_reported_by_line_number_and_the_rest_still_print(client, journal, printed):
+    response = post_stream(client, ndjson(
+        {'customer_orders': {'Ann': ['1001'], 'Bob': ['1002']}},
+        '{"order_number": "1001", ',
+        order('1002', 'Bob'),
+        {'order_number': '1003', 'date': 'March'},
+    ))
+
+    assert response.status_code == 400
+    body = response.get_json()
+    assert body['orders_received'] == 1
+    assert body['invalid_lines'] == [
+        {'line': 2, 'errors': [{'field': 'body', 'error': 'is not valid JSON'}]},
+        {'line': 4, 'order_number': '1003', 'errors': [
+            {'field': 'customer_name', 'error': 'is required'},
+            {'field': 'date', 'error': 'must be an ISO date'},
+        ]},
+    ]
+    assert printed == ['1002']
+    assert journal.job_summary(body['job_id'])[0]['status'] == 'failed'
+
+
+def test_the_first_line_must_be_the_customer_orders_header(client, journal, printed):
+    response = post_stream(client, ndjson(order('1001', 'Ann')))
+
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == [{'field': 'customer_orders', 'error': 'is required'}]
+
+    response = post_stream(client, '')
+    assert response.status_code == 400
+    assert printed == []
+
+
+def test_a_resent_stream_skips_the_orders_already_printed(client, journal, printed):
+    lines = [{'customer_orders': {'Ann': ['1001'], 'Bob': ['1002']}}, order('1001', 'Ann'), order('1002', 'Bob')]
+    post_stream(client, ndjson(*lines[:2], '{'), '?job_id=stream-1')
+    assert printed == ['1001']
+
+    response = post_stream(client, ndjson(*lines), '?job_id=stream-1&resume=1')
+
+    assert response.status_code == 200
+    assert printed == ['1001', '1002']
+    assert journal.job_summary('stream-1')[0]['finished_items'] == 2
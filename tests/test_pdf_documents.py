@@ -0,0 +1,78 @@
+import gzip
+
+import pytest
+
+import app
+
+
+PULL_LIST = {
+    'batch_date': '2025-03-01',
+    'items': [{'variety_name': 'Sungold', 'crop': 'Tomato', 'sku_suffix': 'pkt', 'quantity': 4}],
+}
+
+
+@pytest.fixture
+def pull_list_url(client):
+    """POST a pull list to /pdf/pull-list and return the cached copy's URL"""
+    response = client.post('/pdf/pull-list', json=PULL_LIST)
+    assert response.status_code == 200
+    return response.headers['Content-Location']
+
+
+def test_post_renders_the_pdf_inline_and_caches_it(client):
+    response = client.post('/pdf/pull-list', json={**PULL_LIST, 'batch_date': 'first'})
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/pdf'
+    assert response.data.startswith(b'%PDF')
+    assert response.headers['X-PDF-Cache'] == 'miss'
+
+    again = client.post('/pdf/pull-list', json={**PULL_LIST, 'batch_date': 'first'})
+    assert again.headers['X-PDF-Cache'] == 'hit'
+    assert again.headers['Content-Location'] == response.headers['Content-Location']
+    assert again.data == response.data
+
+
+def test_get_with_a_matching_etag_is_not_modified(client, pull_list_url):
+    response = client.get(pull_list_url)
+    assert response.status_code == 200
+    assert response.headers['X-PDF-Cache'] == 'hit'
+
+    revalidated = client.get(pull_list_url, headers={'If-None-Match': response.headers['ETag']})
+
+    assert revalidated.status_code == 304
+    assert revalidated.data == b''
+
+
+def test_get_with_a_range_returns_part_of_the_pdf(client, pull_list_url):
+    full = client.get(pull_list_url).data
+
+    response = client.get(pull_list_url, headers={'Range': 'bytes=0-9', 'Accept-Encoding': 'gzip'})
+
+    assert response.status_code == 206
+    assert response.data == full[:10]
+    assert response.headers['Content-Range'] == f'bytes 0-9/{len(full)}'
+    assert 'Content-Encoding' not in response.headers
+
+
+def test_get_is_gzipped_for_clients_that_accept_it(client, pull_list_url):
+    full = client.get(pull_list_url).data
+
+    response = client.get(pull_list_url, headers={'Accept-Encoding': 'gzip'})
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.data) == full
+    assert response.headers['ETag'] != client.get(pull_list_url).headers['ETag']
+
+
+def test_unknown_documents_and_keys_are_not_found(client, pull_list_url):
+    assert client.post('/pdf/receipt', json=PULL_LIST).status_code == 404
+    assert client.get('/pdf/pull-list/' + '0' * 64).status_code == 404
+    assert client.get(pull_list_url.replace('/pull-list/', '/invoice/')).status_code == 404
+
+
+def test_post_validates_the_document_data(client):
+    response = client.post('/pdf/pull-list', json={'items': 'none'})
+
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == [{'field': 'items', 'error': 'must be a list'}]
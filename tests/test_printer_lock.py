@@ -0,0 +1,97 @@
+import threading
+import time
+
+import app
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def queue_jobs(lock, jobs, granted):
+    """Start one thread per (name, priority), each queued before the next starts"""
+    threads = []
+    for name, priority in jobs:
+        def run(name=name, priority=priority):
+            lock.acquire(priority)
+            granted.append(name)
+            lock.release()
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        threads.append(thread)
+        wait_until(lambda: len(lock.waiting) == len(threads))
+    return threads
+
+
+def test_waiters_get_the_printer_by_priority_then_arrival():
+    lock = app.PrinterLock('test')
+    granted = []
+    lock.acquire(app.PRINT_PRIORITIES['interactive'])
+
+    threads = queue_jobs(lock, [
+        ('bulk-1', app.PRINT_PRIORITIES['bulk']),
+        ('fulfilment-1', app.PRINT_PRIORITIES['fulfilment']),
+        ('bulk-2', app.PRINT_PRIORITIES['bulk']),
+        ('interactive-1', app.PRINT_PRIORITIES['interactive']),
+        ('fulfilment-2', app.PRINT_PRIORITIES['fulfilment']),
+    ], granted)
+    assert lock.queue_depth() == 6
+    assert lock.status()['waiting'] == {'interactive': 1, 'fulfilment': 2, 'bulk': 2}
+
+    lock.release()
+    for thread in threads:
+        thread.join(5)
+
+    assert granted == ['interactive-1', 'fulfilment-1', 'fulfilment-2', 'bulk-1', 'bulk-2']
+    assert lock.queue_depth() == 0
+
+
+def test_lock_is_re_entrant_for_its_owner():
+    lock = app.PrinterLock('test')
+    granted = []
+
+    lock.acquire(app.PRINT_PRIORITIES['bulk'])
+    assert lock.acquire(app.PRINT_PRIORITIES['bulk']) == 0.0
+    assert lock.depth == 2
+
+    threads = queue_jobs(lock, [('other', app.PRINT_PRIORITIES['interactive'])], granted)
+    lock.release()
+    time.sleep(0.05)
+    assert granted == []
+    assert lock.owner == threading.get_ident()
+
+    lock.release()
+    threads[0].join(5)
+    assert granted == ['other']
+
+
+def test_bulk_job_yields_to_a_higher_priority_waiter_and_resumes():
+    lock = app.PrinterLock('test')
+    granted = []
+    lock.acquire(app.PRINT_PRIORITIES['bulk'])
+    lock.acquire(app.PRINT_PRIORITIES['bulk'])
+
+    assert lock.yield_to_waiters() is False
+
+    threads = queue_jobs(lock, [('interactive', app.PRINT_PRIORITIES['interactive'])], granted)
+    assert lock.yield_to_waiters() is True
+    threads[0].join(5)
+
+    assert granted == ['interactive']
+    assert lock.owner == threading.get_ident()
+    assert lock.depth == 2
+    assert lock.status()['yields'] == 1
+    lock.release()
+    lock.release()
+    assert lock.owner is None
+
+
+def test_printer_lock_skips_locking_in_a_dry_run(monkeypatch):
+    monkeypatch.setattr(app, 'current_dry_run', lambda: object())
+
+    with app.printer_lock('dry-run-printer'):
+        assert 'dry-run-printer' not in app.PRINTER_LOCKS
@@ -0,0 +1,44 @@
+import os
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(app, 'PROFILE_DIR', str(tmp_path))
+    return tmp_path
+
+
+def test_a_profiled_request_saves_its_stats(client, profile_dir):
+    response = client.get('/health', headers={'X-Profile': '1'})
+
+    name = response.headers['X-Profile-Name']
+    assert app.PROFILE_NAME_PATTERN.fullmatch(name)
+    assert os.listdir(profile_dir) == [name]
+    [profile] = client.get('/profiles').get_json()['profiles']
+    assert (profile['name'], profile['endpoint']) == (name, 'health_check')
+
+
+def test_a_second_profile_is_refused_while_one_is_running(client, profile_dir):
+    assert app.PROFILE_LOCK.acquire(blocking=False)
+    try:
+        refused = client.get('/health', headers={'X-Profile': '1'})
+        unprofiled = client.get('/health')
+    finally:
+        app.PROFILE_LOCK.release()
+
+    assert refused.status_code == 409
+    assert refused.get_json() == {'success': False, 'error': 'A profile is already running; try again when it finishes'}
+    assert unprofiled.status_code == 200
+    assert os.listdir(profile_dir) == []
+
+    assert 'X-Profile-Name' in client.get('/health', headers={'X-Profile': '1'}).headers
+
+
+def test_profiling_is_only_for_local_requests(client, profile_dir):
+    response = client.get('/health', headers={'X-Profile': '1'}, environ_base={'REMOTE_ADDR': '10.0.0.5'})
+
+    assert response.status_code == 403
+    assert os.listdir(profile_dir) == []
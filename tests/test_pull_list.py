@@ -0,0 +1,42 @@
+import app
+
+
+def test_aggregate_merges_rows_with_the_same_variety_crop_and_size():
+    items = [
+        {'variety_name': 'Sungold', 'crop': 'Tomato', 'sku_suffix': 'pkt', 'quantity': 2},
+        {'variety_name': 'Sungold', 'crop': 'Tomato', 'sku_suffix': 'pkt', 'quantity': '3'},
+        {'variety_name': 'Sungold', 'crop': 'Tomato', 'sku_suffix': '1oz', 'quantity': 1},
+    ]
+
+    rows, input_count = app.aggregate_pull_items(items)
+
+    assert input_count == 3
+    assert rows == [
+        {'variety_name': 'Sungold', 'crop': 'Tomato', 'sku_suffix': '1oz', 'quantity': 1},
+        {'variety_name': 'Sungold', 'crop': 'Tomato', 'sku_suffix': 'pkt', 'quantity': 5},
+    ]
+
+
+def test_aggregate_returns_rows_in_pick_order():
+    items = [
+        {'variety_name': 'Zinnia', 'crop': 'flower', 'sku_suffix': 'pkt', 'quantity': 1},
+        {'variety_name': 'Bloomsdale', 'crop': 'Spinach', 'sku_suffix': 'pkt', 'quantity': 1},
+        {'variety_name': 'aster', 'crop': 'Flower', 'sku_suffix': 'pkt', 'quantity': 1},
+    ]
+
+    rows, _ = app.aggregate_pull_items(items)
+
+    assert [row['variety_name'] for row in rows] == ['aster', 'Zinnia', 'Bloomsdale']
+
+
+def test_aggregate_consumes_a_generator_and_treats_missing_quantity_as_zero():
+    items = ({'variety_name': 'Kale', 'crop': 'Kale', 'sku_suffix': 'pkt'} for _ in range(4))
+
+    rows, input_count = app.aggregate_pull_items(items)
+
+    assert input_count == 4
+    assert rows == [{'variety_name': 'Kale', 'crop': 'Kale', 'sku_suffix': 'pkt', 'quantity': 0}]
+
+
+def test_aggregate_of_nothing():
+    assert app.aggregate_pull_items([]) == ([], 0)
@@ -0,0 +1,99 @@
+import os
+
+import pytest
+from PIL import Image
+
+import app
+
+
+def bitmap(shade=0):
+    """An 80 x 80 1-bit image: 800 bytes in memory"""
+    return Image.new('1', (80, 80), shade)
+
+
+def renderer(calls, shade=0):
+    def render():
+        calls.append(shade)
+        return bitmap(shade)
+    return render
+
+
+def disk_bytes(directory):
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+
+def test_memory_stays_within_its_byte_bound(tmp_path):
+    cache = app.RasterCache(str(tmp_path), memory_bytes=2000, disk_bytes=10 ** 6)
+    calls = []
+
+    for key in ('a', 'b', 'c', 'd'):
+        cache.get(key, renderer(calls))
+
+    assert list(cache.memory) == ['c', 'd']
+    assert cache.memory_used == 1600
+    assert cache.status()['evictions'] == 2
+
+    # Evicted from memory but still on disk
+    cache.get('a', renderer(calls))
+    assert len(calls) == 4
+    assert cache.status()['disk_hits'] == 1
+    assert cache.memory_used <= 2000
+
+
+def test_disk_stays_within_its_byte_bound(tmp_path):
+    directory = str(tmp_path)
+    calls = []
+    probe = app.RasterCache(directory, memory_bytes=0, disk_bytes=10 ** 6)
+    probe.get('probe', renderer(calls))
+    file_size = disk_bytes(directory)
+    os.remove(probe.path('probe'))
+
+    cache = app.RasterCache(directory, memory_bytes=0, disk_bytes=3 * file_size)
+    for key in ('a', 'b', 'c', 'd', 'e'):
+        cache.get(key, renderer(calls))
+
+    assert sorted(os.listdir(directory)) == ['c.png', 'd.png', 'e.png']
+    assert disk_bytes(directory) <= 3 * file_size
+    assert cache.status()['disk_entries'] == 3
+
+
+def test_least_recently_used_entry_is_evicted_first(tmp_path):
+    cache = app.RasterCache(str(tmp_path), memory_bytes=2000, disk_bytes=10 ** 6)
+    calls = []
+
+    cache.get('a', renderer(calls))
+    cache.get('b', renderer(calls))
+    cache.get('a', renderer(calls))
+    cache.get('c', renderer(calls))
+
+    assert list(cache.memory) == ['a', 'c']
+    assert cache.status()['memory_hits'] == 1
+
+
+def test_an_entry_bigger_than_the_bound_is_still_kept(tmp_path):
+    cache = app.RasterCache(str(tmp_path), memory_bytes=100, disk_bytes=10)
+    calls = []
+
+    cache.get('a', renderer(calls))
+    cache.get('a', renderer(calls))
+
+    assert calls == [0]
+    assert list(cache.memory) == ['a']
+
+
+def test_a_restarted_cache_finds_the_files_on_disk(tmp_path):
+    calls = []
+    app.RasterCache(str(tmp_path), memory_bytes=10 ** 6, disk_bytes=10 ** 6).get('a', renderer(calls, 1))
+
+    restarted = app.RasterCache(str(tmp_path), memory_bytes=10 ** 6, disk_bytes=10 ** 6)
+    image = restarted.get('a', renderer(calls))
+
+    assert calls == [1]
+    assert image.getpixel((0, 0)) == 255
+    assert restarted.status()['disk_hits'] == 1
+
+
+def test_raster_fonts_never_fall_back_to_the_default_font():
+    with pytest.raises(OSError):
+        app.create_preview_font("No Such Font", 20, fallback=False)
+    assert app.create_preview_font("No Such Font", 20) is not None
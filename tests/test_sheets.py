@@ -0,0 +1,162 @@
+import pytest
+
+import app
+
+
+CELLS_PER_SHEET = app.SHEET_ROWS * app.SHEET_COLS
+
+
+def test_pack_fills_cells_in_label_order():
+    sheets = app.pack_sheet_labels([2, 1, 3])
+
+    assert sheets == [[(0, 0), (1, 0), (2, 1), (3, 2), (4, 2), (5, 2)]]
+
+
+def test_pack_starts_at_start_cell_and_spills_onto_new_sheets():
+    sheets = app.pack_sheet_labels([CELLS_PER_SHEET, 5], start_cell=CELLS_PER_SHEET - 2)
+
+    assert [len(sheet) for sheet in sheets] == [2, CELLS_PER_SHEET, 3]
+    assert sheets[0] == [(CELLS_PER_SHEET - 2, 0), (CELLS_PER_SHEET - 1, 0)]
+    assert sheets[1][-2:] == [(CELLS_PER_SHEET - 2, 1), (CELLS_PER_SHEET - 1, 1)]
+    assert sheets[2] == [(0, 1), (1, 1), (2, 1)]
+
+
+def test_pack_skips_labels_with_no_copies():
+    assert app.pack_sheet_labels([0, 1, 0]) == [[(0, 1)]]
+    assert app.pack_sheet_labels([]) == []
+
+
+def test_manifest_lists_runs_and_empty_cells_per_sheet():
+    sheets = app.pack_sheet_labels([2, 1, 2])
+
+    assert app.sheet_manifest(sheets, ['Sungold', 'Kale', 'Sungold']) == [{
+        'sheet': 1,
+        'labels': [
+            {'label': 0, 'name': 'Sungold', 'count': 2, 'first_cell': 1, 'last_cell': 2},
+            {'label': 1, 'name': 'Kale', 'count': 1, 'first_cell': 3, 'last_cell': 3},
+            {'label': 2, 'name': 'Sungold', 'count': 2, 'first_cell': 4, 'last_cell': 5},
+        ],
+        'skipped_cells': 0,
+        'empty_cells': CELLS_PER_SHEET - 5,
+    }]
+
+
+def test_sheet_pack_route_prints_on_the_fake_backend(client):
+    response = client.post('/print-sheet-pack', json={
+        'start_cell': 29,
+        'labels': [
+            {'data': {'variety_name': 'Sungold', 'sku_suffix': 'pkt'}, 'count': 3},
+            {'data': {'variety_name': 'Kale', 'sku_suffix': 'pkt'}, 'count': 1},
+        ],
+    })
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['success'] is True
+    assert [sheet['sheet'] for sheet in body['sheets']] == [1, 2]
+
+
+def test_sheet_pack_route_reports_errors_in_each_label(client):
+    response = client.post('/print-sheet-pack', json={
+        'labels': [{'data': {'variety_name': 'Sungold'}, 'count': 0}],
+    })
+
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == [{'field': 'labels[0].count', 'error': 'must be at least 1'}]
+
+
+def cancel_after_first_sheet(journal, monkeypatch):
+    """A journaled job that asks to be cancelled as its first sheet is drawn; returns (job, sheets drawn)"""
+    job = journal.start_job('print_range', {}, 1, 'job-1')
+    drawn = []
+
+    def draw_packed_sheet_page(dc, fonts, side, labels, placements, footer):
+        drawn.append(footer)
+        job.cancel()
+
+    monkeypatch.setattr(app, 'draw_packed_sheet_page', draw_packed_sheet_page)
+    return job, drawn
+
+
+def test_a_cancelled_pack_job_stops_at_the_next_sheet(journal, monkeypatch):
+    job, drawn = cancel_after_first_sheet(journal, monkeypatch)
+    data, _ = app.VALIDATORS['front_label']({'variety_name': 'Sungold', 'sku_suffix': 'pkt'})
+
+    def runner(data, job):
+        job.checkpoint()
+        return app.print_sheet_pack_logic('front', [(data, 3 * CELLS_PER_SHEET)]), 200
+
+    body, status = app.run_journaled(runner, data, job)
+
+    assert (status, body['cancelled']) == (200, True)
+    assert len(drawn) == 1
+    assert drawn[0].startswith('Sheet 1 of 3')
+    assert journal.job_summary('job-1')[0]['status'] == 'cancelled'
+
+
+def test_full_sheet_request_is_not_partial():
+    assert app.partial_sheet_request({'start_cell': 1}, 2) is None
+    assert app.partial_sheet_request({}, 2) is None
+
+
+def test_partial_sheet_from_start_cell_finishes_on_the_last_sheet():
+    assert app.partial_sheet_request({'start_cell': 11}, 1) == (10, CELLS_PER_SHEET - 10)
+    assert app.partial_sheet_request({'start_cell': 11}, 2) == (10, 2 * CELLS_PER_SHEET - 10)
+
+
+def test_partial_sheet_with_a_count():
+    assert app.partial_sheet_request({'count': 7}, 3) == (0, 7)
+    assert app.partial_sheet_request({'start_cell': 25, 'count': 12}, 1) == (24, 12)
+
+
+def test_manifest_counts_the_skipped_cells_of_a_part_used_sheet():
+    sheets = app.pack_sheet_labels([2, 1], start_cell=3)
+
+    assert app.sheet_manifest(sheets, ['Sungold', 'Kale'], start_cell=3) == [{
+        'sheet': 1,
+        'labels': [
+            {'label': 0, 'name': 'Sungold', 'count': 2, 'first_cell': 4, 'last_cell': 5},
+            {'label': 1, 'name': 'Kale', 'count': 1, 'first_cell': 6, 'last_cell': 6},
+        ],
+        'skipped_cells': 3,
+        'empty_cells': CELLS_PER_SHEET - 6,
+    }]
+
+
+def test_sheet_front_route_prints_a_part_used_sheet(client):
+    response = client.post('/print-sheet-front', json={
+        'variety_name': 'Sungold', 'sku_suffix': 'pkt', 'start_cell': 25, 'count': 12,
+    })
+
+    assert response.status_code == 200
+    sheets = response.get_json()['sheets']
+    assert [sheet['skipped_cells'] for sheet in sheets] == [24, 0]
+    assert sum(run['count'] for sheet in sheets for run in sheet['labels']) == 12
+
+
+@pytest.mark.parametrize('schema, print_logic, data', [
+    ('sheet_front', 'print_sheet_front_logic', {'variety_name': 'Sungold', 'sku_suffix': 'pkt'}),
+    ('sheet_back', 'print_sheet_back_logic', {'variety_name': 'Sungold', 'back1': 'Sow indoors'}),
+])
+def test_a_cancelled_partial_sheet_job_stops_at_the_next_sheet(journal, monkeypatch, schema, print_logic, data):
+    job, drawn = cancel_after_first_sheet(journal, monkeypatch)
+    data, _ = app.VALIDATORS[schema]({**data, 'start_cell': 25, 'count': 2 * CELLS_PER_SHEET})
+
+    def runner(data, job):
+        job.checkpoint()
+        return getattr(app, print_logic)(data), 200
+
+    body, status = app.run_journaled(runner, data, job)
+
+    assert (status, body['cancelled']) == (200, True)
+    assert len(drawn) == 1
+    assert drawn[0].startswith('Sheet 1 of 3')
+
+
+def test_sheet_front_route_rejects_a_start_cell_off_the_sheet(client):
+    response = client.post('/print-sheet-front', json={
+        'variety_name': 'Sungold', 'sku_suffix': 'pkt', 'start_cell': CELLS_PER_SHEET + 1,
+    })
+
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == [{'field': 'start_cell', 'error': f'must be at most {CELLS_PER_SHEET}'}]
@@ -0,0 +1,93 @@
+import json
+
+import pytest
+
+import app
+
+
+CALLER_TRACE_ID = '4bf92f3577b34da6a3ce929d0e0e4736'
+CALLER_SPAN_ID = '00f067aa0ba902b7'
+
+
+@pytest.fixture
+def exported(tmp_path, monkeypatch):
+    """Reads back the OTLP/JSON lines written to a fresh TRACE_FILE, as lists of spans"""
+    trace_file = tmp_path / 'spans.jsonl'
+    monkeypatch.setattr(app, 'TRACE_FILE', str(trace_file))
+
+    def read():
+        if not trace_file.exists():
+            return []
+        return [
+            json.loads(line)['resourceSpans'][0]['scopeSpans'][0]['spans']
+            for line in trace_file.read_text().splitlines()
+        ]
+    return read
+
+
+def test_nested_spans_are_exported_together_when_the_outer_one_ends(exported):
+    with app.trace_span('outer', **{'print.items': 3}) as outer:
+        with app.trace_span('inner') as inner:
+            pass
+        assert exported() == []
+
+    assert inner.trace_id == outer.trace_id
+    assert inner.parent_id == outer.span_id
+    [spans] = exported()
+    assert [span['name'] for span in spans] == ['inner', 'outer']
+    assert spans[0]['parentSpanId'] == outer.span_id
+    assert 'parentSpanId' not in spans[1]
+    assert spans[1]['attributes'] == [{'key': 'print.items', 'value': {'intValue': '3'}}]
+    assert int(spans[1]['startTimeUnixNano']) <= int(spans[0]['startTimeUnixNano'])
+    assert int(spans[0]['endTimeUnixNano']) <= int(spans[1]['endTimeUnixNano'])
+
+
+def test_an_exception_marks_the_span_as_an_error(exported):
+    @app.traced()
+    def spool():
+        raise RuntimeError("Printer offline")
+
+    with pytest.raises(RuntimeError):
+        spool()
+
+    [[span]] = exported()
+    assert span['name'] == 'spool'
+    assert span['status'] == {'code': app.SPAN_STATUS_ERROR, 'message': 'RuntimeError: Printer offline'}
+
+
+def test_a_request_joins_the_callers_trace(client, exported):
+    response = client.post(
+        '/print-single-front',
+        json={'variety_name': 'Sungold', 'sku_suffix': 'pkt'},
+        headers={'traceparent': f'00-{CALLER_TRACE_ID}-{CALLER_SPAN_ID}-01'},
+    )
+
+    assert response.status_code == 200
+    assert response.headers['X-Trace-Id'] == CALLER_TRACE_ID
+    [spans] = exported()
+    by_name = {span['name']: span for span in spans}
+    server = by_name['POST /print-single-front']
+    assert server['kind'] == app.SPAN_KIND_SERVER
+    assert server['parentSpanId'] == CALLER_SPAN_ID
+    assert server['status'] == {'code': app.SPAN_STATUS_OK}
+    assert response.headers['traceparent'] == f"00-{CALLER_TRACE_ID}-{server['spanId']}-01"
+    assert by_name['print_single_front_label_logic']['parentSpanId'] == server['spanId']
+    assert {span['traceId'] for span in spans} == {CALLER_TRACE_ID}
+
+
+def test_a_request_without_a_valid_traceparent_starts_a_new_trace(client, exported):
+    response = client.get('/health', headers={'traceparent': 'not-a-traceparent'})
+
+    [spans] = exported()
+    assert response.headers['X-Trace-Id'] == spans[-1]['traceId'] != CALLER_TRACE_ID
+    assert 'parentSpanId' not in spans[-1]
+
+
+def test_an_empty_trace_file_turns_export_off(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(app, 'TRACE_FILE', '')
+
+    with app.trace_span('untraced'):
+        pass
+
+    assert list(tmp_path.iterdir()) == []
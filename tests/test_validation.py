@@ -0,0 +1,103 @@
+import app
+
+
+FRONT_LABEL = {'variety_name': 'Sungold', 'sku_suffix': 'pkt'}
+
+
+def test_defaults_fill_missing_and_blank_fields():
+    data, errors = app.VALIDATORS['front_label']({**FRONT_LABEL, 'crop': ''})
+
+    assert errors == []
+    assert data['crop'] == ''
+    assert data['quantity'] == 1
+    assert data['env_multiplier'] == 1
+    assert data['desc3'] is None
+
+
+def test_values_are_coerced_and_unknown_fields_pass_through():
+    data, errors = app.VALIDATORS['front_label']({**FRONT_LABEL, 'quantity': '3', 'env_multiplier': 2.0, 'extra': [1]})
+
+    assert errors == []
+    assert data['quantity'] == 3
+    assert data['env_multiplier'] == 2
+    assert data['extra'] == [1]
+
+
+def test_every_field_error_is_reported():
+    data, errors = app.VALIDATORS['front_label']({'variety_name': 'Sungold', 'quantity': 0, 'env_multiplier': 'two'})
+
+    assert {error['field']: error['error'] for error in errors} == {
+        'sku_suffix': 'is required',
+        'quantity': 'must be at least 1',
+        'env_multiplier': 'must be a whole number',
+    }
+
+
+def test_non_object_body_is_rejected():
+    assert app.VALIDATORS['front_label'](None) == (None, [{'field': 'body', 'error': 'must be a JSON object'}])
+    assert app.VALIDATORS['front_label']([FRONT_LABEL])[1] == [{'field': 'body', 'error': 'must be a JSON object'}]
+
+
+def test_bool_coercion():
+    validate = app.compile_schema({'flag': {'type': 'bool'}})
+
+    for value, expected in ((True, True), (1, True), ('0', False), ('TRUE', True), ('false', False)):
+        assert validate({'flag': value}) == ({'flag': expected}, [])
+    assert validate({'flag': 'yes'})[1] == [{'field': 'flag', 'error': 'must be true or false'}]
+
+
+def test_nested_errors_carry_the_field_path():
+    order = {'customer_name': 'Ann', 'date': '2025-03-01', 'pkt_items': []}
+    data, errors = app.VALIDATORS['print_orders']({
+        'customer_orders': {'Ann': [1001]},
+        'order_data': {
+            '1001': order,
+            '1002': {**order, 'date': 'March', 'total': 'lots'},
+        },
+    })
+
+    assert errors == [
+        {'field': "order_data['1002'].date", 'error': 'must be an ISO date'},
+        {'field': "order_data['1002'].total", 'error': 'must be a number'},
+    ]
+    assert data['order_data']['1001']['total'] == 0
+
+
+def test_each_and_items_check_every_element():
+    data, errors = app.VALIDATORS['envelope_table']({
+        'envelope_data_by_year': {'2025': {'envelope_counts': {'Standard': '4', 'Large': 'x'}}},
+        'usage_rows': [{'year': 2025, 'envelope_type': 'Standard', 'count': 2}, {'year': 2025}],
+    })
+
+    assert errors == [
+        {'field': "envelope_data_by_year['2025'].envelope_counts['Large']", 'error': 'must be a whole number'},
+        {'field': 'usage_rows[1].envelope_type', 'error': 'is required'},
+        {'field': 'usage_rows[1].count', 'error': 'is required'},
+    ]
+    assert data['usage_rows'][0] == {'year': '2025', 'envelope_type': 'Standard', 'count': 2}
+
+
+def test_required_rejects_empty_collections():
+    data, errors = app.VALIDATORS['print_orders']({'customer_orders': {}, 'order_data': {}})
+
+    assert [error['field'] for error in errors] == ['customer_orders', 'order_data']
+
+
+def test_route_answers_400_with_the_error_list(client):
+    response = client.post('/print-single-front', json={'variety_name': 'Sungold', 'quantity': 'many'})
+
+    assert response.status_code == 400
+    body = response.get_json()
+    assert body['success'] is False
+    assert body['errors'] == [
+        {'field': 'sku_suffix', 'error': 'is required'},
+        {'field': 'quantity', 'error': 'must be a whole number'},
+    ]
+    assert body['error'] == 'Invalid request: sku_suffix is required; quantity must be a whole number'
+
+
+def test_route_prints_a_valid_label_on_the_fake_backend(client):
+    response = client.post('/print-single-front', json={**FRONT_LABEL, 'quantity': '2'})
+
+    assert response.status_code == 200
+    assert response.get_json()['success'] is True